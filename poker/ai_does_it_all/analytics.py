@@ -0,0 +1,291 @@
+# Columnar hand analytics for Texas Hold'em
+#
+# AnalyticsRecorder is a TexasHoldEmGame event subscriber that buffers every action as
+# columns and writes them out in Parquet partitions:
+#
+#   <root>/events/part-NNNNNN.parquet   one row per action (blinds included)
+#   <root>/hands/part-NNNNNN.parquet    one row per hand and seat: position, net chips,
+#                                       showdown and win flags
+#   <root>/summary/part-NNNNNN.parquet  per-partition counters grouped by player and position
+#
+# Each flush only adds new files, and the statistics are computed from the small summary
+# partitions, so appending hands never rescans the event data already written.
+import os
+from collections import namedtuple
+
+import numpy as np
+from atomic_write import write_atomic
+
+# Action and street codes are shared with the binary hand histories in poker/
+from game_events import ActionTaken, HandStarted, Showdown
+from hand_history import ACTION_CODES, STREET_CODES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Seats per hand used to build dense (hand, seat) keys
+MAX_SEATS = 16
+
+CALL = ACTION_CODES["call"]
+RAISE = ACTION_CODES["raise"]
+BET = ACTION_CODES["bet"]
+
+SUMMARY_COUNTERS = ["hands", "vpip", "pfr", "aggressive", "calls", "showdowns", "showdown_wins", "net", "net_sq"]
+
+PlayerStats = namedtuple(
+    "PlayerStats", ["hands", "vpip", "pfr", "aggression_factor", "showdown_win_rate", "ev_per_hand"]
+)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Hand analytics needs pyarrow (pip install pyarrow).")
+
+
+def _partition_path(root, kind, number):
+    return os.path.join(root, kind, f"part-{number:06d}.parquet")
+
+
+def _write_partition(table, path):
+    """Write a table so readers never see a partial partition."""
+    write_atomic(path, lambda tmp_path: pq.write_table(table, tmp_path))
+
+
+def summarize(events, hands):
+    """Aggregate one partition's columns into per-player, per-position counters.
+
+    Args:
+        events (dict): NumPy columns hand, seat, street, action and amount, one entry per action.
+        hands (dict): NumPy columns hand, seat, player, position, net, showdown and won, one
+                      entry per hand and seat.
+
+    Returns:
+        dict: Columns player, position and the SUMMARY_COUNTERS, one entry per group.
+    """
+    # Per-(hand, seat) flags from the events, scattered through dense keys
+    size = (int(hands["hand"].max()) + 1) * MAX_SEATS if len(hands["hand"]) else 0
+    event_keys = events["hand"].astype(np.int64) * MAX_SEATS + events["seat"]
+    street, action, amount = events["street"], events["action"], events["amount"]
+
+    preflop = street == 0
+    raised = (action == RAISE) | (action == BET)
+    voluntary = preflop & (raised | ((action == CALL) & (amount > 0)))
+    aggressive = ~preflop & raised
+    calls = ~preflop & (action == CALL) & (amount > 0)
+
+    hand_keys = hands["hand"].astype(np.int64) * MAX_SEATS + hands["seat"]
+    per_seat = {
+        "vpip": np.bincount(event_keys[voluntary], minlength=size)[hand_keys] > 0,
+        "pfr": np.bincount(event_keys[preflop & raised], minlength=size)[hand_keys] > 0,
+        "aggressive": np.bincount(event_keys[aggressive], minlength=size)[hand_keys],
+        "calls": np.bincount(event_keys[calls], minlength=size)[hand_keys],
+    }
+
+    # Group the (hand, seat) rows by player and position
+    players, player_ids = np.unique(hands["player"], return_inverse=True)
+    group_keys, groups = np.unique(player_ids * MAX_SEATS + hands["position"], return_inverse=True)
+    net = hands["net"].astype(np.float64)
+    counters = {
+        "hands": np.ones(len(net)),
+        "vpip": per_seat["vpip"],
+        "pfr": per_seat["pfr"],
+        "aggressive": per_seat["aggressive"],
+        "calls": per_seat["calls"],
+        "showdowns": hands["showdown"],
+        "showdown_wins": hands["showdown"] & hands["won"],
+        "net": net,
+        "net_sq": net * net,
+    }
+    summary = {
+        "player": players[group_keys // MAX_SEATS],
+        "position": (group_keys % MAX_SEATS).astype(np.int8),
+    }
+    for name in SUMMARY_COUNTERS:
+        totals = np.bincount(groups, weights=counters[name], minlength=len(group_keys))
+        summary[name] = totals if name in ("net", "net_sq") else totals.astype(np.int64)
+    return summary
+
+
+class AnalyticsRecorder:
+    """Captures TexasHoldEmGame action events and writes them as Parquet partitions.
+
+    Subscribe it with game.subscribe(recorder). Events are kept in column lists and written as a
+    new partition every `partition_hands` hands and on flush() or close(). Recording into a
+    directory that already has partitions continues after the last one.
+
+    Args:
+        root (str): Dataset directory.
+        partition_hands (int): Hands buffered per partition.
+    """
+
+    def __init__(self, root, partition_hands=100000):
+        _require_pyarrow()
+        self.root = root
+        self.partition_hands = partition_hands
+        summary_dir = os.path.join(root, "summary")
+        existing = os.listdir(summary_dir) if os.path.isdir(summary_dir) else []
+        self.partition = sum(1 for name in existing if name.endswith(".parquet"))
+        self._clear()
+        self._players = ()
+        self._seats = {}
+        self._dealer = 0
+        self._starting_chips = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _clear(self):
+        self.hands_buffered = 0
+        self._events = {"hand": [], "seat": [], "street": [], "action": [], "amount": []}
+        self._hands = {"hand": [], "seat": [], "player": [], "position": [], "net": [], "showdown": [], "won": []}
+
+    # TexasHoldEmGame events
+
+    def __call__(self, event):
+        if isinstance(event, ActionTaken):
+            self.on_action(event)
+        elif isinstance(event, HandStarted):
+            self.on_hand_start(event)
+        elif isinstance(event, Showdown):
+            self.on_hand_end(event)
+
+    def on_hand_start(self, event):
+        self._players = event.players
+        self._seats = {player: seat for seat, player in enumerate(event.players)}
+        self._dealer = self._seats[event.dealer]
+        self._starting_chips = [event.chips[player] for player in event.players]
+
+    def on_action(self, event):
+        events = self._events
+        events["hand"].append(self.hands_buffered)
+        events["seat"].append(self._seats[event.player])
+        events["street"].append(STREET_CODES.get(event.stage.label, 0))
+        events["action"].append(ACTION_CODES[event.action])
+        events["amount"].append(event.amount)
+
+    def on_hand_end(self, event):
+        hands = self._hands
+        num_seats = len(self._players)
+        showdown = len(event.hands) > 1
+        winners = set(event.winners)
+        for seat, player in enumerate(self._players):
+            hands["hand"].append(self.hands_buffered)
+            hands["seat"].append(seat)
+            hands["player"].append(player)
+            hands["position"].append((seat - self._dealer) % num_seats)
+            hands["net"].append(event.chips[player] - self._starting_chips[seat])
+            hands["showdown"].append(showdown and player in event.hands)
+            hands["won"].append(player in winners)
+        self.hands_buffered += 1
+        if self.hands_buffered >= self.partition_hands:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered hands as a new partition."""
+        if not self.hands_buffered:
+            return
+        events = {
+            "hand": np.array(self._events["hand"], dtype=np.int64),
+            "seat": np.array(self._events["seat"], dtype=np.int8),
+            "street": np.array(self._events["street"], dtype=np.int8),
+            "action": np.array(self._events["action"], dtype=np.int8),
+            "amount": np.array(self._events["amount"], dtype=np.int32),
+        }
+        hands = {
+            "hand": np.array(self._hands["hand"], dtype=np.int64),
+            "seat": np.array(self._hands["seat"], dtype=np.int8),
+            "player": np.array(self._hands["player"], dtype=object),
+            "position": np.array(self._hands["position"], dtype=np.int8),
+            "net": np.array(self._hands["net"], dtype=np.int32),
+            "showdown": np.array(self._hands["showdown"], dtype=bool),
+            "won": np.array(self._hands["won"], dtype=bool),
+        }
+        summary = summarize(events, hands)
+
+        # Hand ids are unique across partitions: partition number in the high bits
+        offset = self.partition << 32
+        events["hand"] += offset
+        hands["hand"] += offset
+        _write_partition(pa.table(events), _partition_path(self.root, "events", self.partition))
+        _write_partition(pa.table(hands), _partition_path(self.root, "hands", self.partition))
+        # The summary goes last: a partition counts once its summary exists
+        _write_partition(pa.table(summary), _partition_path(self.root, "summary", self.partition))
+
+        self.partition += 1
+        self._clear()
+
+    def close(self):
+        """Write any buffered hands."""
+        self.flush()
+
+
+def read_summary(root):
+    """Concatenate the summary partitions into NumPy columns."""
+    _require_pyarrow()
+    summary_dir = os.path.join(root, "summary")
+    if not os.path.isdir(summary_dir) or not any(name.endswith(".parquet") for name in os.listdir(summary_dir)):
+        empty = {"player": np.array([], dtype=object), "position": np.array([], dtype=np.int8)}
+        empty.update((name, np.array([])) for name in SUMMARY_COUNTERS)
+        return empty
+    table = pq.read_table(summary_dir)
+    return {name: table.column(name).to_numpy(zero_copy_only=False) for name in table.column_names}
+
+
+def _group_totals(summary, keys):
+    """Sum the summary counters over `keys`, returning (unique keys, {counter: totals})."""
+    unique, groups = np.unique(keys, return_inverse=True)
+    totals = {
+        name: np.bincount(groups, weights=summary[name], minlength=len(unique)) for name in SUMMARY_COUNTERS
+    }
+    return unique, totals
+
+
+def player_stats(root):
+    """VPIP, PFR, aggression factor, showdown win rate and EV per hand for every player.
+
+    Returns:
+        dict: Player name -> PlayerStats. The aggression factor is post-flop bets and raises
+              per call (inf when a player never called); rates are 0.0 with no samples.
+    """
+    summary = read_summary(root)
+    players, totals = _group_totals(summary, summary["player"])
+    stats = {}
+    for i, player in enumerate(players):
+        hands = totals["hands"][i]
+        calls = totals["calls"][i]
+        showdowns = totals["showdowns"][i]
+        if calls:
+            aggression = float(totals["aggressive"][i] / calls)
+        else:
+            aggression = float("inf") if totals["aggressive"][i] else 0.0
+        stats[player] = PlayerStats(
+            hands=int(hands),
+            vpip=float(totals["vpip"][i] / hands),
+            pfr=float(totals["pfr"][i] / hands),
+            aggression_factor=aggression,
+            showdown_win_rate=float(totals["showdown_wins"][i] / showdowns) if showdowns else 0.0,
+            ev_per_hand=float(totals["net"][i] / hands),
+        )
+    return stats
+
+
+def position_ev(root):
+    """Mean net chips per hand by player and position (seats after the button, 0 = button).
+
+    Returns:
+        dict: (player, position) -> (hands, mean net chips per hand).
+    """
+    summary = read_summary(root)
+    _, player_ids = np.unique(summary["player"], return_inverse=True)
+    players = np.unique(summary["player"])
+    keys, totals = _group_totals(summary, player_ids * MAX_SEATS + summary["position"])
+    return {
+        (players[key // MAX_SEATS], int(key % MAX_SEATS)): (int(hands), float(net / hands))
+        for key, hands, net in zip(keys.tolist(), totals["hands"], totals["net"])
+    }
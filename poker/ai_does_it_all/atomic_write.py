@@ -0,0 +1,33 @@
+# Atomic file writes for generated data: evaluator tables, the card atlas, CFR checkpoints
+# and analytics partitions
+import os
+
+
+def write_atomic(path, write):
+    """Write `path` by calling write(tmp_path) and renaming the result over it.
+
+    Readers never see a partial file. The temporary file sits next to `path`, hidden and with
+    the same extension, for writers that pick the format from it (np.savez, pygame).
+    """
+    directory, name = os.path.split(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    stem, extension = os.path.splitext(name)
+    tmp_path = os.path.join(directory, f".{stem}.{os.getpid()}.tmp{extension}")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_cache(path, write, errors=OSError):
+    """write_atomic() for a cache that can be rebuilt: returns False instead of raising `errors`."""
+    try:
+        write_atomic(path, write)
+    except errors:
+        # A read-only checkout still works, it just rebuilds the cache on each start
+        return False
+    return True
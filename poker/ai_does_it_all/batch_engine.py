@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Lockstep Texas Hold'em engine that plays thousands of tables at once.
+
+Every table's chips, bets, cards and hand state live in NumPy arrays indexed by
+(table, seat). All tables move through the blinds, the betting passes of each street
+and the showdown together, and policies decide for one seat across all tables with a
+single vectorized call. The rules follow TexasHoldEmGame exactly, including its
+betting-pass order and raise arithmetic, so decks from `seeded_decks` reproduce the
+object engine's hands chip for chip.
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+import poker_path  # noqa: F401  (shared poker/ modules)
+from game_logic import RAISE_SIZE, TexasHoldEmGame
+from hand_evaluator import HandEvaluator
+from hand_tables import CATEGORY_SHIFT, ONE_PAIR, TWO_PAIR
+from cards import ArrayDeck
+from preflop import MAX_OPPONENTS, PAIR_CLASSES, PREFLOP_EQUITY
+from simulator import MAX_BETTING_PASSES, STAGES, SeatResult, SimulationReport
+
+FOLD, CHECK, CALL, RAISE = 0, 1, 2, 3
+ACTIONS = ("fold", "check", "call", "raise")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+# The object engine deals hole cards from the front of a 13-card deck and the board from 8-12
+MAX_SEATS = 4
+STREET_BOARD_CARDS = (0, 3, 4, 5)
+
+
+def seeded_decks(seeds):
+    """(N, 13) decks dealt exactly as TexasHoldEmGame.start_new_hand(seed=seed) deals them."""
+    deck = ArrayDeck()
+    decks = np.empty((len(seeds), 13), dtype=np.int64)
+    for i, seed in enumerate(seeds):
+        deck.seed(int(seed))
+        decks[i] = deck.deal(13)
+    return decks
+
+
+def random_decks(rng, count):
+    """(count, 13) decks of distinct random cards from a NumPy Generator."""
+    return np.argsort(rng.random((count, 52)), axis=1)[:, :13]
+
+
+class BatchEngine:
+    """Plays one hand at every table per play_hand() call, with arrays for all table state.
+
+    State visible to policies (T tables, S seats):
+        chips, bets (T, S) int64: stacks and chips put in on the current street.
+        in_hand (T, S) bool: seats that have not folded.
+        hole (T, S, 2) int: hole cards; board (T, 5) int: the hand's full board, of which
+        the first `board_count` cards are dealt.
+        pot, current_bet, dealer (T,) int64.
+        hand_values() gives every seat's made-hand value, evaluated once per street.
+
+    Args:
+        num_tables (int): Tables played in lockstep.
+        policies (list): One policy(engine, seat, tables) per seat, in seat order, returning an
+                         array of action codes (FOLD, CHECK, CALL, RAISE) for the table indices.
+        num_seats (int): Seats per table, like TexasHoldEmGame.players (at most MAX_SEATS).
+        starting_chips (int): Initial stack of every seat.
+        blinds (tuple): Small and big blind.
+    """
+
+    def __init__(self, num_tables, policies, num_seats=3, starting_chips=1000, blinds=(10, 20)):
+        if not 2 <= num_seats <= MAX_SEATS:
+            raise ValueError(f"The engine deals 2 to {MAX_SEATS} seats, not {num_seats}.")
+        if len(policies) != num_seats:
+            raise ValueError("Need one policy per seat.")
+        self.num_tables = num_tables
+        self.num_seats = num_seats
+        self.policies = list(policies)
+        self.starting_chips = starting_chips
+        self.small_blind, self.big_blind = blinds
+
+        shape = (num_tables, num_seats)
+        self.chips = np.full(shape, starting_chips, dtype=np.int64)
+        self.bets = np.zeros(shape, dtype=np.int64)
+        self.in_hand = np.zeros(shape, dtype=bool)
+        self.hole = np.zeros((num_tables, num_seats, 2), dtype=np.int64)
+        self.board = np.zeros((num_tables, 5), dtype=np.int64)
+        self.board_count = 0
+        self._values = None
+        self.pot = np.zeros(num_tables, dtype=np.int64)
+        self.current_bet = np.zeros(num_tables, dtype=np.int64)
+        self.dealer = np.zeros(num_tables, dtype=np.int64)
+        self.hands_played = 0
+
+    def hand_values(self):
+        """(T, S) evaluator values of each seat's hole cards and the dealt board, once per street."""
+        if self._values is None:
+            hole = self.hole.reshape(-1, 2)
+            board = np.repeat(self.board[:, : self.board_count], self.num_seats, axis=0)
+            self._values = HandEvaluator.evaluate_batch(hole, board).reshape(self.num_tables, self.num_seats)
+        return self._values
+
+    def reset_chips(self):
+        """Put every seat back to the starting stack."""
+        self.chips[:] = self.starting_chips
+
+    def _start_hand(self, decks):
+        tables = np.arange(self.num_tables)
+        self.dealer = (self.dealer + 1) % self.num_seats
+        self.hole = decks[:, : 2 * self.num_seats].reshape(self.num_tables, self.num_seats, 2)
+        self.board = decks[:, 8:13]
+        self.board_count = 0
+        self.in_hand[:] = True
+        self.bets[:] = 0
+        small = (self.dealer + 1) % self.num_seats
+        big = (self.dealer + 2) % self.num_seats
+        self.chips[tables, small] -= self.small_blind
+        self.chips[tables, big] -= self.big_blind
+        self.bets[tables, small] = self.small_blind
+        self.bets[tables, big] = self.big_blind
+        self.pot[:] = self.small_blind + self.big_blind
+        self.current_bet[:] = self.big_blind
+
+    def _act(self, seat, tables, actions):
+        """Apply action codes for `seat` at `tables`, with TexasHoldEmGame's arithmetic."""
+        chips = self.chips[tables, seat]
+        bets = self.bets[tables, seat]
+        current_bet = self.current_bet[tables]
+
+        calling = actions == CALL
+        call_amount = np.minimum(chips, current_bet - bets)
+        # A raise goes to the current bet + RAISE_SIZE, capped at the player's remaining chips
+        raising = actions == RAISE
+        raise_to = np.minimum(chips, current_bet + RAISE_SIZE)
+        paid = np.where(calling, call_amount, 0) + np.where(raising, raise_to - bets, 0)
+
+        self.chips[tables, seat] = chips - paid
+        self.bets[tables, seat] = bets + paid
+        self.pot[tables] += paid
+        self.current_bet[tables] = np.where(raising, raise_to, current_bet)
+        self.in_hand[tables, seat] &= actions != FOLD
+
+    def _bets_matched(self, tables):
+        """End-of-pass test: every player in the hand with chips left has the same bet."""
+        active = self.in_hand[tables] & (self.chips[tables] > 0)
+        bets = self.bets[tables]
+        high = np.where(active, bets, np.iinfo(np.int64).min).max(axis=1)
+        low = np.where(active, bets, np.iinfo(np.int64).max).min(axis=1)
+        return ~active.any(axis=1) | (high == low)
+
+    def _betting_round(self, tables):
+        """Run betting passes at `tables` until each one's bets are matched."""
+        open_tables = tables
+        for _ in range(MAX_BETTING_PASSES):
+            for seat in range(self.num_seats):
+                acting = open_tables[self.in_hand[open_tables, seat] & (self.chips[open_tables, seat] > 0)]
+                if len(acting):
+                    actions = np.asarray(self.policies[seat](self, seat, acting))
+                    self._act(seat, acting, actions)
+            open_tables = open_tables[~self._bets_matched(open_tables)]
+            if not len(open_tables):
+                break
+
+    def _award_uncontested(self, tables):
+        """Give the pot to the last player at tables where at most one is left; return the rest."""
+        players_left = self.in_hand[tables].sum(axis=1)
+        won = tables[players_left == 1]
+        winners = self.in_hand[won].argmax(axis=1)
+        self.chips[won, winners] += self.pot[won]
+        return tables[players_left > 1]
+
+    def _showdown(self, tables):
+        """Split the pot between the best hands, odd chips to winners nearest the dealer's left."""
+        num_seats = self.num_seats
+        values = np.where(self.in_hand[tables], self.hand_values()[tables], -1)
+        winners = values == values.max(axis=1, keepdims=True)
+
+        share, odd_chips = np.divmod(self.pot[tables], winners.sum(axis=1))
+        # Seat order starting left of the dealer; each winner's place among the winners
+        order = (np.arange(num_seats) - self.dealer[tables, None] - 1) % num_seats
+        place = (winners[:, None, :] & (order[:, None, :] < order[:, :, None])).sum(axis=2)
+        odd = winners & (place < odd_chips[:, None])
+        self.chips[tables] += winners * share[:, None] + odd
+
+    def play_hand(self, decks, stage_seconds=None):
+        """Deal `decks` ((T, 13) card ints) and play one hand at every table.
+
+        Args:
+            decks: One 13-card deck per table, e.g. from seeded_decks or random_decks.
+            stage_seconds (dict): Optional STAGES -> seconds, added to as the hand is played.
+
+        Returns:
+            np.ndarray: (T, S) chips won or lost by each seat in this hand.
+        """
+        clock = time.perf_counter
+        start = clock()
+        chips_before = self.chips.copy()
+        self._start_hand(np.asarray(decks, dtype=np.int64))
+        elapsed = {"deal": clock() - start}
+
+        live = np.arange(self.num_tables)
+        for street, stage in enumerate(STAGES[1:5]):
+            start = clock()
+            self.board_count = STREET_BOARD_CARDS[street]
+            self._values = None
+            if street:
+                self.current_bet[live] = 0
+                self.bets[live] = 0
+            self._betting_round(live)
+            live = self._award_uncontested(live)
+            elapsed[stage] = clock() - start
+        start = clock()
+        self._showdown(live)
+        elapsed["showdown"] = clock() - start
+
+        self.hands_played += 1
+        if stage_seconds is not None:
+            for stage, seconds in elapsed.items():
+                stage_seconds[stage] += seconds
+        return self.chips - chips_before
+
+    def run(self, num_hands, seed=None):
+        """Play at least `num_hands` random hands, every stack reset before each hand.
+
+        Returns:
+            SimulationReport: Chip EV per seat, named like TexasHoldEmGame's players.
+        """
+        rng = np.random.default_rng(seed)
+        rounds = math.ceil(num_hands / self.num_tables)
+        stage_seconds = dict.fromkeys(STAGES, 0.0)
+        totals = np.zeros(self.num_seats)
+        squares = np.zeros(self.num_seats)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            self.reset_chips()
+            net = self.play_hand(random_decks(rng, self.num_tables), stage_seconds)
+            totals += net.sum(axis=0)
+            squares += (net.astype(np.float64) ** 2).sum(axis=0)
+        elapsed = time.perf_counter() - start
+
+        hands = rounds * self.num_tables
+        names = TexasHoldEmGame(messages_enabled=False).players
+        names = names + [f"Seat{seat}" for seat in range(len(names), self.num_seats)]
+        seat_results = {}
+        for seat in range(self.num_seats):
+            mean = totals[seat] / hands
+            variance = max(0.0, squares[seat] / hands - mean * mean)
+            half_width = 1.96 * math.sqrt(variance / hands)
+            seat_results[names[seat]] = SeatResult(mean, mean - half_width, mean + half_width)
+        return SimulationReport(hands, elapsed, seat_results, stage_seconds)
+
+
+def batch_always_call(engine, seat, tables):
+    """Vectorized always_call."""
+    return np.full(len(tables), CALL)
+
+
+def batch_always_raise(engine, seat, tables):
+    """Vectorized always_raise."""
+    return np.full(len(tables), RAISE)
+
+
+def make_batch_threshold_policy(fold_below=0.3, raise_above=0.6):
+    """Vectorized make_threshold_policy: the same strengths and thresholds for a seat at many tables."""
+    if PREFLOP_EQUITY is None:
+        raise RuntimeError("Preflop equity table is missing; run build_preflop_table.py to generate it.")
+    pair_classes = np.maximum(np.array(PAIR_CLASSES), 0)
+    preflop = np.array(PREFLOP_EQUITY, dtype=np.float64).reshape(-1, MAX_OPPONENTS)
+    # Post-flop strength by made-hand category
+    postflop = np.full(9, 0.9)
+    postflop[[0, ONE_PAIR, TWO_PAIR]] = [0.2, 0.5, 0.7]
+
+    def policy(engine, seat, tables):
+        if engine.board_count == 0:
+            hole = engine.hole[tables, seat]
+            opponents = np.clip(engine.in_hand[tables].sum(axis=1) - 1, 1, MAX_OPPONENTS)
+            strength = preflop[pair_classes[hole[:, 0], hole[:, 1]], opponents - 1]
+        else:
+            strength = postflop[engine.hand_values()[tables, seat] >> CATEGORY_SHIFT]
+
+        facing_bet = engine.current_bet[tables] > engine.bets[tables, seat]
+        actions = np.where(strength > raise_above, RAISE, CALL)
+        return np.where(facing_bet & (strength < fold_below), FOLD, actions)
+
+    return policy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hands", type=int, default=1000000)
+    parser.add_argument("--tables", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    policies = [
+        make_batch_threshold_policy(),
+        batch_always_call,
+        make_batch_threshold_policy(fold_below=0.4, raise_above=0.75),
+    ]
+    report = BatchEngine(args.tables, policies).run(args.hands, seed=args.seed)
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,25 @@ import random
 
 
 class Bot:
-    def __init__(self, name, style="balanced"):
+    def __init__(self, name, style="balanced", strategy=None):
         self.name = name
-        self.style = style  # balanced, aggressive, conservative
+        self.style = style  # balanced, aggressive, conservative, cfr
         self.hand = []
+        # The "cfr" style plays a trained strategy table (data/cfr_strategy.npz unless given)
+        self.policy = None
+        if style == "cfr":
+            from cfr import CFRPolicy
+
+            self.policy = CFRPolicy(strategy)
 
     def decide_action(self, valid_actions, current_bet=0, pot_size=0, community_cards=None):
         """Decide bot's action based on current game state."""
         if not community_cards:
             community_cards = []
 
+        if self.style == "cfr":
+            return self.policy.choose(self.hand, community_cards, current_bet, valid_actions)
+
         # Simple decision making based on style
         if self.style == "aggressive":
             return "raise" if "raise" in valid_actions else "call"
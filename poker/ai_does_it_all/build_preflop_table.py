@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Generate data/preflop_equity.bin, the equity of every starting-hand class
+against 1-9 random opponents. Classes are simulated in parallel processes.
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import poker_path  # noqa: F401  (shared poker/ modules)
+from hand_evaluator import HandEvaluator
+from preflop import HAND_CLASSES, MAX_OPPONENTS, TABLE_PATH, representative_cards, write_table
+
+
+def simulate_class(class_index, samples, seed):
+    """Estimate one class's equity against 1..MAX_OPPONENTS opponents with batched evaluation."""
+    rng = np.random.default_rng(seed + class_index)
+    hole = representative_cards(HAND_CLASSES[class_index])
+    remaining = np.array([card for card in range(52) if card not in hole], dtype=np.intp)
+    hero_hole = np.tile(hole, (samples, 1))
+
+    equities = []
+    for num_opponents in range(1, MAX_OPPONENTS + 1):
+        # Each row is an independent random ordering of the unseen cards
+        order = np.argsort(rng.random((samples, len(remaining))), axis=1)[:, : 5 + 2 * num_opponents]
+        drawn = remaining[order]
+        board = drawn[:, :5]
+        hero = HandEvaluator.evaluate_batch(hero_hole, board)
+        opponents = np.stack(
+            [HandEvaluator.evaluate_batch(drawn[:, 5 + 2 * i : 7 + 2 * i], board) for i in range(num_opponents)],
+            axis=1,
+        )
+        best = opponents.max(axis=1)
+        tied = (opponents == hero[:, None]).sum(axis=1)
+        share = np.where(hero > best, 1.0, np.where(hero == best, 1.0 / (tied + 1), 0.0))
+        equities.append(float(share.mean()))
+    return equities
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=20000, help="run-outs per class and opponent count")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=169)
+    parser.add_argument("--output", default=TABLE_PATH)
+    args = parser.parse_args()
+
+    start = time.time()
+    indices = range(len(HAND_CLASSES))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        rows = list(
+            executor.map(simulate_class, indices, [args.samples] * len(indices), [args.seed] * len(indices))
+        )
+
+    write_table([equity for row in rows for equity in row], args.output)
+    print(f"Wrote {args.output} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Counterfactual regret minimization for a fixed-raise Texas Hold'em abstraction.
+
+The abstract game is heads-up with the engine's betting structure: blinds of 10/20, every
+raise is to the current bet + RAISE_SIZE and each street allows at most MAX_RAISES raises. Cards
+are abstracted into NUM_BUCKETS strength buckets per street, and an information set is
+(street, raises so far on the street, facing a bet, bucket), so the trained strategy can
+be looked up from any TexasHoldEmGame state.
+
+Training is chance-sampled CFR vectorized over a batch of random deals: the betting tree
+is walked once per batch with NumPy arrays holding each deal's reach probabilities.
+"""
+
+import argparse
+import os
+import random
+
+import numpy as np
+import poker_path  # noqa: F401  (shared poker/ modules)
+from atomic_write import write_atomic
+from game_logic import RAISE_SIZE
+from hand_evaluator import HandEvaluator
+from hand_tables import CARD_INTS, CATEGORY_SHIFT
+from preflop import MAX_OPPONENTS, PAIR_CLASSES, PREFLOP_EQUITY
+from sharding import round_sizes, run_shards, shard_pool, shard_seed
+
+# Abstract betting structure
+SMALL_BLIND = 10
+BIG_BLIND = 20
+MAX_RAISES = 3
+NUM_STREETS = 4
+
+FOLD, CALL, RAISE = 0, 1, 2
+NUM_ACTIONS = 3
+
+NUM_BUCKETS = 8
+NUM_SITUATIONS = NUM_STREETS * (MAX_RAISES + 1) * 2
+NUM_INFOSETS = NUM_SITUATIONS * NUM_BUCKETS
+
+CHECKPOINT_VERSION = 1
+STRATEGY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cfr_strategy.npz")
+
+# Betting tree node kinds
+DECISION, FOLDED, SHOWDOWN = 0, 1, 2
+
+
+def situation_id(street, raises, facing_bet):
+    """Index of a betting situation: street, raises on the street (capped) and whether a bet is faced."""
+    return (street * (MAX_RAISES + 1) + min(raises, MAX_RAISES)) * 2 + int(facing_bet)
+
+
+def infoset_id(street, raises, facing_bet, bucket):
+    """Compact information-set index into the regret and strategy arrays."""
+    return situation_id(street, raises, facing_bet) * NUM_BUCKETS + bucket
+
+
+def _situation_legal_actions():
+    """(NUM_SITUATIONS, NUM_ACTIONS) mask: fold only facing a bet, raise only under the cap."""
+    legal = np.zeros((NUM_SITUATIONS, NUM_ACTIONS), dtype=bool)
+    for street in range(NUM_STREETS):
+        for raises in range(MAX_RAISES + 1):
+            for facing_bet in (False, True):
+                situation = situation_id(street, raises, facing_bet)
+                legal[situation] = [facing_bet, True, raises < MAX_RAISES]
+    return legal
+
+
+SITUATION_LEGAL = _situation_legal_actions()
+INFOSET_LEGAL = np.repeat(SITUATION_LEGAL, NUM_BUCKETS, axis=0)
+
+
+class BettingTree:
+    """The abstract game's betting tree, stored as flat node arrays.
+
+    Player 0 posts the small blind and acts first pre-flop; player 1 acts first after the
+    flop. Contributions are each player's total chips in the pot at a terminal node.
+    """
+
+    def __init__(self):
+        self.kind = []
+        self.player = []
+        self.street = []
+        self.situation = []
+        self.children = []
+        self.contributions = []
+        self.folder = []
+        self._build(0, 0, [SMALL_BLIND, BIG_BLIND], [0, 0], 0, [False, False])
+
+        self.kind = np.array(self.kind, dtype=np.int8)
+        self.player = np.array(self.player, dtype=np.int8)
+        self.street = np.array(self.street, dtype=np.int8)
+        self.situation = np.array(self.situation, dtype=np.int16)
+        self.children = np.array(self.children, dtype=np.int32)
+        self.contributions = np.array(self.contributions, dtype=np.int64)
+        self.folder = np.array(self.folder, dtype=np.int8)
+
+        # Decision nodes grouped by depth for the level-at-a-time CFR passes
+        depth = np.zeros(len(self.kind), dtype=np.int32)
+        for node in range(len(self.kind)):
+            for child in self.children[node]:
+                if child >= 0:
+                    depth[child] = depth[node] + 1
+        decisions = np.flatnonzero(self.kind == DECISION)
+        self.levels = [decisions[depth[decisions] == d] for d in range(depth[decisions].max() + 1)]
+
+        self.fold_nodes = np.flatnonzero(self.kind == FOLDED)
+        folded = self.contributions[self.fold_nodes]
+        self.fold_utility = np.where(
+            self.folder[self.fold_nodes] == 0, -folded[:, 0], folded[:, 1]
+        ).astype(np.float64)
+        self.showdown_nodes = np.flatnonzero(self.kind == SHOWDOWN)
+        self.showdown_stake = self.contributions[self.showdown_nodes, 0].astype(np.float64)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def _add(self, kind, player=-1, street=-1, situation=-1, contributions=(0, 0), folder=-1):
+        self.kind.append(kind)
+        self.player.append(player)
+        self.street.append(street)
+        self.situation.append(situation)
+        self.children.append([-1] * NUM_ACTIONS)
+        self.contributions.append(list(contributions))
+        self.folder.append(folder)
+        return len(self.kind) - 1
+
+    def _build(self, street, player, bets, totals, raises, acted):
+        """Add the decision node for `player` and everything below it; return its index."""
+        opponent = 1 - player
+        facing_bet = bets[player] < bets[opponent]
+        node = self._add(DECISION, player, street, situation_id(street, raises, facing_bet))
+
+        if facing_bet:
+            self.children[node][FOLD] = self._add(
+                FOLDED, contributions=(totals[0] + bets[0], totals[1] + bets[1]), folder=player
+            )
+
+        # Call (or check): the street closes once both players have acted with equal bets
+        call_bets = list(bets)
+        call_bets[player] = bets[opponent]
+        call_acted = list(acted)
+        call_acted[player] = True
+        if call_acted[opponent]:
+            self.children[node][CALL] = self._close_street(street, call_bets, totals)
+        else:
+            self.children[node][CALL] = self._build(street, opponent, call_bets, totals, raises, call_acted)
+
+        if raises < MAX_RAISES:
+            raise_bets = list(bets)
+            raise_bets[player] = bets[opponent] + RAISE_SIZE
+            raise_acted = list(acted)
+            raise_acted[player] = True
+            self.children[node][RAISE] = self._build(street, opponent, raise_bets, totals, raises + 1, raise_acted)
+        return node
+
+    def _close_street(self, street, bets, totals):
+        totals = [totals[0] + bets[0], totals[1] + bets[1]]
+        if street == NUM_STREETS - 1:
+            return self._add(SHOWDOWN, contributions=totals)
+        return self._build(street + 1, 1, [0, 0], totals, 0, [False, False])
+
+
+_betting_tree = None
+
+
+def betting_tree():
+    """Return the shared BettingTree, building it on first use."""
+    global _betting_tree
+    if _betting_tree is None:
+        _betting_tree = BettingTree()
+    return _betting_tree
+
+
+def _build_preflop_buckets():
+    """(52, 52) array of pre-flop buckets: heads-up equity quantiles over all 1326 combos."""
+    class_equity = np.array(PREFLOP_EQUITY[::MAX_OPPONENTS], dtype=np.float64)
+    pair_classes = np.array(PAIR_CLASSES)
+    combos = pair_classes[np.triu_indices(52, 1)]
+    edges = np.quantile(class_equity[combos], np.arange(1, NUM_BUCKETS) / NUM_BUCKETS)
+    buckets = np.searchsorted(edges, class_equity, side="right")
+    table = buckets[np.maximum(pair_classes, 0)].astype(np.int8)
+    np.fill_diagonal(table, -1)
+    return table
+
+
+PREFLOP_BUCKETS = _build_preflop_buckets() if PREFLOP_EQUITY is not None else None
+
+
+def postflop_buckets(hand_values, board_values):
+    """Bucket post-flop hands by made-hand category, 0 when the hole cards don't improve on the board.
+
+    Buckets run 1 (one pair) to 7 (full house or better) for hands whose category beats
+    the board's own.
+    """
+    category = hand_values >> CATEGORY_SHIFT
+    board_category = board_values >> CATEGORY_SHIFT
+    return np.where(category > board_category, np.minimum(category, NUM_BUCKETS - 1), 0)
+
+
+def sample_deals(rng, count):
+    """Deal `count` heads-up hands.
+
+    Returns:
+        tuple: (buckets, results) where buckets is a (2, NUM_STREETS, count) int array and
+               results is +1/0/-1 for player 0 winning, tying or losing the showdown.
+    """
+    cards = np.argsort(rng.random((count, 52)), axis=1)[:, :9]
+    holes = (cards[:, 0:2], cards[:, 2:4])
+    board = cards[:, 4:9]
+    no_hole = np.empty((count, 0), dtype=cards.dtype)
+
+    buckets = np.empty((2, NUM_STREETS, count), dtype=np.intp)
+    river_values = []
+    for player, hole in enumerate(holes):
+        buckets[player, 0] = PREFLOP_BUCKETS[hole[:, 0], hole[:, 1]]
+    for street, board_size in enumerate((3, 4, 5), 1):
+        board_values = HandEvaluator.evaluate_batch(no_hole, board[:, :board_size])
+        for player, hole in enumerate(holes):
+            values = HandEvaluator.evaluate_batch(hole, board[:, :board_size])
+            buckets[player, street] = postflop_buckets(values, board_values)
+            if board_size == 5:
+                river_values.append(values)
+    results = np.sign(river_values[0] - river_values[1])
+    return buckets, results
+
+
+def regret_matching(regrets, legal):
+    """Strategy proportional to positive regret, uniform over legal actions when none is positive."""
+    positive = np.where(legal, np.maximum(regrets, 0.0), 0.0)
+    total = positive.sum(axis=-1, keepdims=True)
+    uniform = legal / legal.sum(axis=-1, keepdims=True)
+    return np.where(total > 0, positive / np.where(total > 0, total, 1.0), uniform)
+
+
+def _cfr_iteration(tree, buckets, results, regrets, strategy_sum):
+    """One chance-sampled CFR iteration over a batch of deals, one tree level at a time.
+
+    The forward pass computes every decision node's strategy and both players' reach for
+    each deal; the backward pass computes utilities and accumulates regret (weighted by the
+    opponent's reach) and strategy (weighted by the player's own reach) per infoset.
+    """
+    num_deals = len(results)
+    reach = np.zeros((2, len(tree), num_deals))
+    reach[:, 0] = 1.0
+    current_strategy = regret_matching(regrets, INFOSET_LEGAL)
+    strategies = []
+    for nodes in tree.levels:
+        players = tree.player[nodes]
+        situations = tree.situation[nodes]
+        infosets = situations[:, None] * NUM_BUCKETS + buckets[players, tree.street[nodes]]
+        legal = SITUATION_LEGAL[situations][:, None, :]
+        strategy = current_strategy[infosets]
+        strategies.append((infosets, legal, strategy))
+
+        rows = np.arange(len(nodes))
+        for action in range(NUM_ACTIONS):
+            children = tree.children[nodes, action]
+            valid = children >= 0
+            child_reach = reach[:, nodes[valid]]
+            child_reach[players[valid], rows[: valid.sum()]] *= strategy[valid, :, action]
+            reach[:, children[valid]] = child_reach
+
+    utility = np.zeros((len(tree), num_deals))
+    utility[tree.fold_nodes] = tree.fold_utility[:, None]
+    utility[tree.showdown_nodes] = tree.showdown_stake[:, None] * results[None, :]
+    for nodes, (infosets, legal, strategy) in zip(reversed(tree.levels), reversed(strategies)):
+        players = tree.player[nodes]
+        children = tree.children[nodes]
+        action_utility = np.where(children[:, None, :] >= 0, utility[children].transpose(0, 2, 1), 0.0)
+        node_utility = (strategy * action_utility).sum(axis=-1)
+        utility[nodes] = node_utility
+
+        # Regrets are from the acting player's point of view
+        sign = np.where(players == 0, 1.0, -1.0)[:, None, None]
+        opponent_reach = reach[1 - players, nodes][:, :, None]
+        own_reach = reach[players, nodes][:, :, None]
+        instant_regret = np.where(legal, sign * (action_utility - node_utility[:, :, None]) * opponent_reach, 0.0)
+        flat = infosets.ravel()
+        for action in range(NUM_ACTIONS):
+            regrets[:, action] += np.bincount(
+                flat, weights=instant_regret[:, :, action].ravel(), minlength=NUM_INFOSETS
+            )
+            strategy_sum[:, action] += np.bincount(
+                flat, weights=(own_reach[:, :, 0] * strategy[:, :, action]).ravel(), minlength=NUM_INFOSETS
+            )
+    return utility[0]
+
+
+def _train_shard(regrets, strategy_sum, batches, batch_size, seed):
+    """Run `batches` CFR iterations from the given arrays and return the accumulated deltas."""
+    tree = betting_tree()
+    rng = np.random.default_rng(seed)
+    regrets = regrets.copy()
+    start_regrets = regrets.copy()
+    strategy_delta = np.zeros_like(strategy_sum)
+    for _ in range(batches):
+        buckets, results = sample_deals(rng, batch_size)
+        _cfr_iteration(tree, buckets, results, regrets, strategy_delta)
+    return regrets - start_regrets, strategy_delta
+
+
+class CFRTrainer:
+    """Trains the abstract game's strategy with regret and strategy-sum arrays per infoset.
+
+    Args:
+        batch_size (int): Deals per CFR iteration.
+        seed (int): Base seed for the worker shards (see sharding.shard_seed).
+    """
+
+    def __init__(self, batch_size=512, seed=None):
+        self.batch_size = batch_size
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.regrets = np.zeros((NUM_INFOSETS, NUM_ACTIONS))
+        self.strategy_sum = np.zeros((NUM_INFOSETS, NUM_ACTIONS))
+        self.iterations = 0
+        self.shard_index = 0
+
+    def train(
+        self,
+        iterations,
+        workers=1,
+        merge_every=10,
+        checkpoint_path=None,
+        checkpoint_every=100,
+        executor=None,
+    ):
+        """Run `iterations` CFR iterations.
+
+        Each round gives every worker `merge_every` iterations starting from the current
+        arrays, then adds all workers' regret and strategy deltas back in.
+
+        Args:
+            iterations (int): Total iterations (batches of deals) to run.
+            workers (int): Number of processes to train in (1 runs in-process).
+            merge_every (int): Iterations each worker runs between merges.
+            checkpoint_path (str): Where to save checkpoints, if anywhere.
+            checkpoint_every (int): Iterations between checkpoints.
+            executor: Optional existing executor to reuse instead of starting a process pool.
+        """
+        last_checkpoint = self.iterations
+        remaining = iterations
+        with shard_pool(workers, executor) as pool:
+            while remaining > 0:
+                sizes = round_sizes(remaining, merge_every, workers)
+                args = [
+                    (self.regrets, self.strategy_sum, size, self.batch_size, shard_seed(self.seed, self.shard_index + i))
+                    for i, size in enumerate(sizes)
+                ]
+                self.shard_index += len(sizes)
+                deltas = run_shards(_train_shard, args, pool)
+
+                for regret_delta, strategy_delta in deltas:
+                    self.regrets += regret_delta
+                    self.strategy_sum += strategy_delta
+                self.iterations += sum(sizes)
+                remaining -= sum(sizes)
+
+                if checkpoint_path and self.iterations - last_checkpoint >= checkpoint_every:
+                    self.save_checkpoint(checkpoint_path)
+                    last_checkpoint = self.iterations
+
+        if checkpoint_path:
+            self.save_checkpoint(checkpoint_path)
+
+    def average_strategy(self):
+        """The average strategy, (NUM_INFOSETS, NUM_ACTIONS), which is what CFR converges on."""
+        return regret_matching(self.strategy_sum, INFOSET_LEGAL)
+
+    def save_checkpoint(self, path):
+        """Write the trainer's arrays and counters to `path` (an .npz file) atomically."""
+        write_atomic(
+            path,
+            lambda tmp_path: np.savez(
+                tmp_path,
+                version=CHECKPOINT_VERSION,
+                shape=np.array([NUM_INFOSETS, NUM_ACTIONS, NUM_BUCKETS, MAX_RAISES]),
+                regrets=self.regrets,
+                strategy_sum=self.strategy_sum,
+                counters=np.array([self.iterations, self.shard_index, self.seed, self.batch_size], dtype=np.int64),
+            ),
+        )
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        """Resume a trainer from a checkpoint written by save_checkpoint."""
+        with np.load(path) as data:
+            _check_abstraction(data)
+            iterations, shard_index, seed, batch_size = (int(value) for value in data["counters"])
+            trainer = cls(batch_size=batch_size, seed=seed)
+            trainer.regrets = data["regrets"].copy()
+            trainer.strategy_sum = data["strategy_sum"].copy()
+        trainer.iterations = iterations
+        trainer.shard_index = shard_index
+        return trainer
+
+    def save_strategy(self, path=STRATEGY_PATH):
+        """Write the average strategy table that CFRPolicy and the "cfr" Bot style load, atomically."""
+        strategy = self.average_strategy().astype(np.float32)
+        write_atomic(
+            path,
+            lambda tmp_path: np.savez_compressed(
+                tmp_path,
+                version=CHECKPOINT_VERSION,
+                shape=np.array([NUM_INFOSETS, NUM_ACTIONS, NUM_BUCKETS, MAX_RAISES]),
+                strategy=strategy,
+                iterations=self.iterations,
+            ),
+        )
+
+
+def _check_abstraction(data):
+    if int(data["version"]) != CHECKPOINT_VERSION or list(data["shape"]) != [
+        NUM_INFOSETS,
+        NUM_ACTIONS,
+        NUM_BUCKETS,
+        MAX_RAISES,
+    ]:
+        raise ValueError("File was written for a different CFR abstraction.")
+
+
+def load_strategy(path=STRATEGY_PATH):
+    """Load a strategy table, or return None if it has not been generated."""
+    try:
+        with np.load(path) as data:
+            _check_abstraction(data)
+            return data["strategy"].astype(np.float64)
+    except OSError:
+        return None
+
+
+def hand_bucket(hole_cards, board):
+    """Abstraction bucket for one hand in any card format CARD_INTS accepts."""
+    hole = [CARD_INTS[card] for card in hole_cards]
+    if not board:
+        return int(PREFLOP_BUCKETS[hole[0], hole[1]])
+    board = [CARD_INTS[card] for card in board]
+    value = HandEvaluator.evaluate(hole + board)
+    board_value = HandEvaluator.evaluate(board)
+    return int(postflop_buckets(np.int64(value), np.int64(board_value)))
+
+
+class CFRPolicy:
+    """Plays a trained strategy table in the real game.
+
+    Usable directly as a TexasHoldEmGame bot policy (policy(game, player)) and by the
+    "cfr" Bot style.
+
+    Args:
+        strategy: (NUM_INFOSETS, NUM_ACTIONS) array; loaded from STRATEGY_PATH when None.
+        rng: Object with a random() method used to sample actions (default: the random module).
+    """
+
+    def __init__(self, strategy=None, rng=None):
+        if strategy is None:
+            strategy = load_strategy()
+            if strategy is None:
+                raise RuntimeError("CFR strategy table is missing; run cfr.py to train one.")
+        self.strategy = strategy
+        self._random = (rng or random).random
+
+    def action_probabilities(self, hole_cards, board, current_bet, facing_bet):
+        """Fold, call and raise probabilities for a hand facing `current_bet` on this street."""
+        street = max(0, len(board) - 2)
+        if street == 0:
+            raises = (current_bet - BIG_BLIND) // RAISE_SIZE
+        else:
+            raises = current_bet // RAISE_SIZE
+        infoset = infoset_id(street, max(0, raises), facing_bet, hand_bucket(hole_cards, board))
+        return self.strategy[infoset]
+
+    def choose(self, hole_cards, board, current_bet, valid_actions):
+        """Sample an action from `valid_actions` ("fold", "check", "call", "raise")."""
+        facing_bet = "call" in valid_actions and "check" not in valid_actions
+        fold, call, _ = self.action_probabilities(hole_cards, board, current_bet, facing_bet)
+        draw = self._random()
+        if facing_bet and draw < fold:
+            return "fold"
+        if draw < fold + call or "raise" not in valid_actions:
+            return "call" if facing_bet else "check"
+        return "raise"
+
+    def __call__(self, game, player):
+        facing_bet = game.current_bet > game.player_bets.get(player, 0)
+        valid_actions = ["fold", "call", "raise"] if facing_bet else ["check", "raise"]
+        return self.choose(game.hands[player], game.community_cards, game.current_bet, valid_actions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--merge-every", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file to resume from and save to")
+    parser.add_argument("--output", default=STRATEGY_PATH)
+    args = parser.parse_args()
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        trainer = CFRTrainer.load_checkpoint(args.checkpoint)
+        print(f"Resuming from {trainer.iterations} iterations")
+    else:
+        trainer = CFRTrainer(batch_size=args.batch_size, seed=args.seed)
+    trainer.train(args.iterations, workers=args.workers, merge_every=args.merge_every, checkpoint_path=args.checkpoint)
+    trainer.save_strategy(args.output)
+    print(f"Wrote {args.output} after {trainer.iterations} iterations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Test setup: make the shared poker/ modules importable
+import poker_path  # noqa: F401
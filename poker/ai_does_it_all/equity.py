@@ -0,0 +1,264 @@
+# Monte Carlo equity estimation for Texas Hold'em
+import itertools
+import math
+import random
+from collections import namedtuple
+
+import numpy as np
+from hand_evaluator import HandEvaluator
+from hand_tables import CARD_INTS, CARD_PRIMES, CARD_RANK_BITS
+from cards import ArrayDeck
+from sharding import round_sizes, run_shards, shard_pool, shard_seed
+
+EquityResult = namedtuple("EquityResult", ["win", "tie", "lose", "equity", "samples", "stderr"])
+
+# z-score for a two-sided 95% confidence interval
+CONFIDENCE_Z = 1.96
+
+
+def to_card_ints(cards):
+    """Accept cards as strings ("AS", "10S"), integers or Cards and return a list of Cards."""
+    return [CARD_INTS[card] for card in cards]
+
+
+def _simulate_shard(hole_cards, board, dead_cards, num_opponents, samples, seed):
+    """Play out `samples` random run-outs and tally the hero's results.
+
+    Returns:
+        tuple: (wins, ties, losses, equity_sum, equity_sum_of_squares)
+    """
+    deck = ArrayDeck(seed=seed, dead_cards=hole_cards + board + dead_cards)
+    evaluate = HandEvaluator.evaluate
+    board_needed = 5 - len(board)
+    draw_count = board_needed + 2 * num_opponents
+
+    wins = ties = losses = 0
+    equity_sum = equity_sq_sum = 0.0
+    for _ in range(samples):
+        deck.rewind()
+        drawn = deck.deal(draw_count)
+        full_board = board + drawn[:board_needed]
+        hero_value = evaluate(hole_cards + full_board)
+
+        best_opponent = 0
+        tied = 0
+        for i in range(board_needed, draw_count, 2):
+            value = evaluate(drawn[i : i + 2] + full_board)
+            if value > best_opponent:
+                best_opponent = value
+                tied = 1 if value == hero_value else 0
+            elif value == best_opponent and value == hero_value:
+                tied += 1
+
+        if hero_value > best_opponent:
+            wins += 1
+            share = 1.0
+        elif hero_value == best_opponent:
+            ties += 1
+            share = 1.0 / (tied + 1)
+        else:
+            losses += 1
+            share = 0.0
+        equity_sum += share
+        equity_sq_sum += share * share
+
+    return wins, ties, losses, equity_sum, equity_sq_sum
+
+
+def estimate_equity(
+    hole_cards,
+    board=(),
+    dead_cards=(),
+    num_opponents=1,
+    max_samples=100000,
+    ci_half_width=0.005,
+    shard_size=2000,
+    workers=1,
+    seed=None,
+    executor=None,
+):
+    """Estimate the hero's win/tie/lose probabilities by sampling run-outs.
+
+    Samples are drawn in seeded shards of `shard_size` (see sharding.shard_seed).
+    Sampling stops once the 95% confidence interval on equity is narrower than
+    +/- `ci_half_width` or `max_samples` have been drawn.
+
+    Args:
+        hole_cards (list): The hero's two hole cards, as strings or integers.
+        board (list): Zero to five community cards.
+        dead_cards (list): Cards known to be out of play (folded, burned, exposed).
+        num_opponents (int): Number of opponents holding random hands.
+        max_samples (int): Upper bound on the number of run-outs to sample.
+        ci_half_width (float): Target half-width of the equity confidence interval.
+        shard_size (int): Number of samples per shard.
+        workers (int): Number of processes to fan shards out to (1 runs in-process).
+        seed (int): Base seed; drawn from the global `random` module when None.
+        executor: Optional existing executor to reuse instead of starting a process pool.
+
+    Returns:
+        EquityResult: win, tie and lose frequencies, equity (ties split), samples and stderr.
+    """
+    hole_cards = to_card_ints(hole_cards)
+    board = to_card_ints(board)
+    dead_cards = to_card_ints(dead_cards)
+    if len(hole_cards) != 2:
+        raise ValueError("Equity requires exactly two hole cards.")
+    if len(board) > 5:
+        raise ValueError("The board has at most five cards.")
+    if len(set(hole_cards + board + dead_cards)) != len(hole_cards) + len(board) + len(dead_cards):
+        raise ValueError("Duplicate cards among hole cards, board and dead cards.")
+    if 52 - len(hole_cards) - len(board) - len(dead_cards) < 5 - len(board) + 2 * num_opponents:
+        raise ValueError("Not enough cards left in the deck for that many opponents.")
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    wins = ties = losses = 0
+    equity_sum = equity_sq_sum = 0.0
+    samples = 0
+    stderr = float("inf")
+    shard_index = 0
+
+    with shard_pool(workers, executor) as pool:
+        while samples < max_samples:
+            # One round runs a shard per worker, then checks the stopping rule
+            sizes = round_sizes(max_samples - samples, shard_size, workers)
+            args = [
+                (hole_cards, board, dead_cards, num_opponents, size, shard_seed(seed, shard_index + i))
+                for i, size in enumerate(sizes)
+            ]
+            shard_index += len(sizes)
+            results = run_shards(_simulate_shard, args, pool)
+
+            for shard_wins, shard_ties, shard_losses, shard_sum, shard_sq_sum in results:
+                wins += shard_wins
+                ties += shard_ties
+                losses += shard_losses
+                equity_sum += shard_sum
+                equity_sq_sum += shard_sq_sum
+            samples += sum(sizes)
+
+            mean = equity_sum / samples
+            variance = max(0.0, equity_sq_sum / samples - mean * mean)
+            stderr = math.sqrt(variance / samples)
+            if samples > 1 and CONFIDENCE_Z * stderr <= ci_half_width:
+                break
+
+    return EquityResult(
+        win=wins / samples,
+        tie=ties / samples,
+        lose=losses / samples,
+        equity=equity_sum / samples,
+        samples=samples,
+        stderr=stderr,
+    )
+
+
+def _suit_symmetries(cards):
+    """Return the suit permutations that map a set of cards onto itself."""
+    card_set = set(cards)
+    return [
+        perm
+        for perm in itertools.permutations(range(4))
+        if {(card & ~3) | perm[card & 3] for card in card_set} == card_set
+    ]
+
+
+def _canonical_runouts(remaining, count, symmetries):
+    """Group the `count`-card run-outs from `remaining` into suit-isomorphic classes.
+
+    Returns:
+        dict: canonical run-out tuple -> number of run-outs in its class.
+    """
+    classes = {}
+    for runout in itertools.combinations(remaining, count):
+        canonical = min(tuple(sorted((card & ~3) | perm[card & 3] for card in runout)) for perm in symmetries)
+        classes[canonical] = classes.get(canonical, 0) + 1
+    return classes
+
+
+def exact_equity(hole_cards, board, dead_cards=()):
+    """Compute heads-up equity exactly by enumerating every run-out and opponent holding.
+
+    Run-outs that are identical up to a relabelling of suits the known cards do not
+    distinguish are evaluated once and weighted by the size of their class. All opponent
+    holdings for a run-out are scored together with the array tables.
+
+    Args:
+        hole_cards (list): The hero's two hole cards, as strings or integers.
+        board (list): Three to five community cards.
+        dead_cards (list): Cards known to be out of play.
+
+    Returns:
+        EquityResult: exact win, tie and lose probabilities; samples is the number of
+                      (run-out, opponent holding) combinations covered and stderr is 0.
+    """
+    hole_cards = to_card_ints(hole_cards)
+    board = to_card_ints(board)
+    dead_cards = to_card_ints(dead_cards)
+    if len(hole_cards) != 2:
+        raise ValueError("Equity requires exactly two hole cards.")
+    if not 3 <= len(board) <= 5:
+        raise ValueError("Exact equity needs a flop, turn or river; use estimate_equity pre-flop.")
+    known = hole_cards + board + dead_cards
+    if len(set(known)) != len(known):
+        raise ValueError("Duplicate cards among hole cards, board and dead cards.")
+
+    tables = HandEvaluator.array_tables()
+    remaining = [card for card in range(52) if card not in set(known)]
+
+    # Every opponent holding from the unseen cards, filtered per run-out below
+    pairs = np.array(list(itertools.combinations(remaining, 2)), dtype=np.intp)
+    first, second = pairs[:, 0], pairs[:, 1]
+    pair_primes = tables["card_primes"][first] * tables["card_primes"][second]
+    first_suits, second_suits = first & 3, second & 3
+    first_bits = tables["card_rank_bits"][first]
+    second_bits = tables["card_rank_bits"][second]
+
+    classes = _canonical_runouts(remaining, 5 - len(board), _suit_symmetries(known))
+
+    wins = ties = losses = 0
+    for runout, weight in classes.items():
+        full_board = board + list(runout)
+        hero_value = HandEvaluator.evaluate(hole_cards + full_board)
+
+        valid = np.ones(len(pairs), dtype=bool)
+        for card in runout:
+            valid &= (first != card) & (second != card)
+
+        board_product = 1
+        suit_masks = [0, 0, 0, 0]
+        suit_counts = [0, 0, 0, 0]
+        for card in full_board:
+            board_product *= CARD_PRIMES[card]
+            suit_masks[card & 3] |= CARD_RANK_BITS[card]
+            suit_counts[card & 3] += 1
+
+        keys = board_product * pair_primes[valid]
+        values = tables["multiset_values"][np.searchsorted(tables["multiset_keys"], keys)]
+
+        # A flush needs at least three board cards of the suit
+        for suit in range(4):
+            if suit_counts[suit] >= 3:
+                masks = (
+                    suit_masks[suit]
+                    | np.where(first_suits[valid] == suit, first_bits[valid], 0)
+                    | np.where(second_suits[valid] == suit, second_bits[valid], 0)
+                )
+                flush = tables["flush_values"][masks]
+                values = np.where(flush > 0, flush, values)
+
+        beaten = int(np.count_nonzero(values < hero_value))
+        tied = int(np.count_nonzero(values == hero_value))
+        wins += weight * beaten
+        ties += weight * tied
+        losses += weight * (len(values) - beaten - tied)
+
+    total = wins + ties + losses
+    return EquityResult(
+        win=wins / total,
+        tie=ties / total,
+        lose=losses / total,
+        equity=(wins + ties / 2) / total,
+        samples=total,
+        stderr=0.0,
+    )
@@ -1,17 +1,78 @@
 # Core game logic for Texas Hold 'Em
 import random
+from collections import namedtuple
+
 from hand_evaluator import HandEvaluator
+from hand_tables import CARD_INTS
+from cards import CARD_STRINGS, ArrayDeck
+from hand_mask import HandMask
+from equity import estimate_equity, exact_equity
+from preflop import preflop_equity
+from game_events import (
+    EVENT_TYPES,
+    STAGES_BY_LABEL,
+    TRANSITIONS,
+    ActionTaken,
+    HandStarted,
+    Showdown,
+    Stage,
+    StreetDealt,
+)
+
+# Immutable copy of everything a hand's play changes, from TexasHoldEmGame.snapshot()
+GameSnapshot = namedtuple(
+    "GameSnapshot",
+    [
+        "players",
+        "deck",
+        "hands",
+        "chips",
+        "player_bets",
+        "hand_masks",
+        "community_cards",
+        "board_mask",
+        "stage",
+        "pot",
+        "current_bet",
+        "betting_round_complete",
+        "hand_complete",
+        "last_winner",
+        "last_winners",
+        "dealer_position",
+        "hand_seed",
+        "message",
+    ],
+)
+
+# Every raise is to the current bet plus this many chips
+RAISE_SIZE = 20
+
+# Status message when each street is dealt
+STREET_MESSAGES = {
+    Stage.FLOP: "Flop cards dealt. Place your bets!",
+    Stage.TURN: "Turn card dealt. Place your bets!",
+    Stage.RIVER: "River card dealt. Final betting round!",
+}
 
 
 class TexasHoldEmGame:
-    def __init__(self):
+    def __init__(self, user_action_source=None, bot_policies=None, messages_enabled=True):
         # Game setup
         self.players = ["User", "Bot1", "Bot2"]
         self.deck = []
+        # Reusable deck drawing from the global random stream, so random.seed() still
+        # makes hands reproducible
+        self.card_deck = ArrayDeck(rng=random)
         self.hands = {}
         self.community_cards = []
         self.chips = {player: 1000 for player in self.players}
-        self.current_stage = None
+
+        # Incremental per-player hand state: a HandMask of hole + board cards, updated
+        # as streets are dealt, and bot strengths memoized by card set within a hand
+        self.hand_masks = {}
+        self.board_mask = 0
+        self.strength_cache = {}
+        self.stage = None  # Stage of the current hand, None before the first one
         self.pot = 0
         self.current_bet = 0
         self.player_bets = {player: 0 for player in self.players}
@@ -21,17 +82,79 @@ class TexasHoldEmGame:
         self.betting_round_complete = False
         self.hand_complete = False
         self.last_winner = None
+        self.last_winners = []
         self.dealer_position = 0
 
-        # Game messages
+        # Monte Carlo samples per bot decision after the flop
+        self.bot_equity_samples = 300
+
+        # Pluggable decision makers: user_action_source(game) replaces input() for the
+        # "User" seat and bot_policies maps a bot name to a policy(game, player)
+        self.user_action_source = user_action_source
+        self.bot_policies = bot_policies or {}
+
+        # Optional range string per bot (e.g. "TT+, AKs, KQo") that the bot puts its
+        # opponent on when reading heads-up post-flop spots
+        self.opponent_ranges = {}
+
+        self.hand_seed = None
+
+        # Event subscribers (e.g. a HandHistoryWriter or a UI redraw): (callback, event types)
+        # pairs added by subscribe()
+        self.subscribers = []
+
+        # Game messages (disabled for headless simulation to keep formatting off the hot path)
+        self.messages_enabled = messages_enabled
         self.message = "Welcome to Texas Hold'Em!"
 
+    def _announce(self, template, *args):
+        """Set the status message shown by the UIs, formatting it only if messages are enabled."""
+        if self.messages_enabled:
+            self.message = template.format(*args) if args else template
+
     def start_game(self):
         """Initialize a new game by starting a new hand."""
         self.start_new_hand()
 
-    def start_new_hand(self):
-        """Start a new hand of poker."""
+    @property
+    def current_stage(self):
+        """The stage's label ("pre-flop", "flop", "turn", "river" or "complete"), or None."""
+        return None if self.stage is None else self.stage.label
+
+    @current_stage.setter
+    def current_stage(self, label):
+        self.stage = None if label is None else STAGES_BY_LABEL[label]
+
+    def subscribe(self, callback, *event_types):
+        """Call callback(event) for each event of the given game_events types (all when none are given).
+
+        Returns:
+            callable: Call it to remove the subscription.
+        """
+        subscription = (callback, event_types or EVENT_TYPES)
+        self.subscribers.append(subscription)
+        return lambda: self.subscribers.remove(subscription)
+
+    def _emit(self, event):
+        """Send `event` to the subscribers of its type."""
+        for callback, event_types in self.subscribers:
+            if isinstance(event, event_types):
+                callback(event)
+
+    def _hand_over(self):
+        """Tell subscribers that the hand is over."""
+        if self.subscribers:
+            winners = tuple(self.last_winners) if self.hands else ()
+            hands = {player: tuple(cards) for player, cards in self.hands.items()}
+            self._emit(Showdown(winners, self.pot, hands, dict(self.chips)))
+
+    def start_new_hand(self, deck=None, seed=None):
+        """Start a new hand of poker.
+
+        Args:
+            deck (list): The 13 cards to deal instead of shuffling (used to replay a hand).
+            seed (int): Reseed the deck's RNG so this hand's deal is reproducible.
+        """
         # Reset game state flags
         self.hand_complete = False
         self.betting_round_complete = False
@@ -39,9 +162,18 @@ class TexasHoldEmGame:
         # Rotate dealer position to the next player
         self.dealer_position = (self.dealer_position + 1) % len(self.players)
 
-        # Initialize deck and shuffle
-        self.deck = [f"{r}{s}" for r in "23456789TJQKA" for s in "CDHS"]
-        random.shuffle(self.deck)
+        # Deal only the 13 cards a hand uses: hole cards from the front, board from positions 8-12
+        self.hand_seed = seed
+        if deck is not None:
+            self.deck = list(deck)
+        else:
+            if seed is not None:
+                # A private stream for this hand only; later hands stay on the global one
+                card_deck = ArrayDeck(seed=seed)
+            else:
+                card_deck = self.card_deck
+                card_deck.reset()
+            self.deck = [CARD_STRINGS[card] for card in card_deck.deal(13)]
 
         # Initialize all players with cards
         self.hands = {}
@@ -49,10 +181,18 @@ class TexasHoldEmGame:
             self.hands[player] = self.deck[i * 2 : i * 2 + 2]
 
         self.community_cards = []
-        self.current_stage = "pre-flop"
+        self.hand_masks = {player: HandMask(cards) for player, cards in self.hands.items()}
+        self.board_mask = 0
+        self.strength_cache.clear()
+        self.stage = Stage.PRE_FLOP
         self.pot = 0
         self.current_bet = self.blinds["big"]
         self.player_bets = {player: 0 for player in self.players}
+        if self.subscribers:
+            dealer = self.players[self.dealer_position]
+            hands = {player: tuple(cards) for player, cards in self.hands.items()}
+            blinds = (self.blinds["small"], self.blinds["big"])
+            self._emit(HandStarted(dealer, tuple(self.players), seed, blinds, dict(self.chips), hands))
 
         # Post blinds
         small_blind_pos = (self.dealer_position + 1) % len(self.players)
@@ -62,8 +202,13 @@ class TexasHoldEmGame:
         self.player_bets[self.players[small_blind_pos]] = self.blinds["small"]
         self.player_bets[self.players[big_blind_pos]] = self.blinds["big"]
         self.pot = self.blinds["small"] + self.blinds["big"]
+        if self.subscribers:
+            for position, blind in ((small_blind_pos, "small_blind"), (big_blind_pos, "big_blind")):
+                player = self.players[position]
+                amount = self.player_bets[player]
+                self._emit(ActionTaken(player, blind, amount, self.stage, amount))
 
-        self.message = "New hand started. Place your bets!"
+        self._announce("New hand started. Place your bets!")
 
     def process_game_state(self):
         """Main game state processor - returns true if UI should wait for user action."""
@@ -77,7 +222,7 @@ class TexasHoldEmGame:
             self.play_round()
 
             # After advancing, check if we need another betting round
-            if self.current_stage == "complete":
+            if self.stage == Stage.COMPLETE:
                 self.hand_complete = True
                 return False
             else:
@@ -88,6 +233,17 @@ class TexasHoldEmGame:
         # If hand is complete, nothing more to do
         return False
 
+    def play_hand(self):
+        """Play the current hand to the end, asking the user action source and the bots for bets.
+
+        UIs follow the hand through subscribe() rather than polling the game between rounds.
+        """
+        while not self.hand_complete:
+            if self.betting_round_complete:
+                self.play_round()
+            else:
+                self.collect_bets()
+
     def play_round(self):
         """Advance the game to the next stage."""
         # Check if only one player remains
@@ -97,13 +253,15 @@ class TexasHoldEmGame:
                 # Award the pot to the last remaining player
                 winner = active_players[0]
                 self.last_winner = winner
+                self.last_winners = [winner]
                 self.chips[winner] += self.pot
-                self.message = f"{winner} wins ${self.pot} by default (all others folded)"
+                self._announce("{} wins ${} by default (all others folded)", winner, self.pot)
             else:
-                self.message = "No active players remaining!"
+                self._announce("No active players remaining!")
 
             self.hand_complete = True
-            self.current_stage = "complete"
+            self.stage = Stage.COMPLETE
+            self._hand_over()
             return True
 
         if self.betting_round_complete:
@@ -116,59 +274,82 @@ class TexasHoldEmGame:
             self.player_bets = {player: 0 for player in self.hands.keys()}
 
             # Set appropriate message for the new stage
-            if self.current_stage == "flop":
-                self.message = "Flop cards dealt. Place your bets!"
-            elif self.current_stage == "turn":
-                self.message = "Turn card dealt. Place your bets!"
-            elif self.current_stage == "river":
-                self.message = "River card dealt. Final betting round!"
-            elif self.current_stage == "complete":
+            if self.stage == Stage.COMPLETE:
                 self._determine_winner()
                 self.hand_complete = True
-                self.message = f"Hand complete! {self.last_winner} wins ${self.pot}"
+                if len(self.last_winners) > 1:
+                    self._announce("Hand complete! {} split ${}", self.last_winner, self.pot)
+                else:
+                    self._announce("Hand complete! {} wins ${}", self.last_winner, self.pot)
+                self._hand_over()
                 return True
+            self._announce(STREET_MESSAGES[self.stage])
 
         # Return False if hand is not complete
         return self.hand_complete
 
     def _advance_stage(self):
-        """Advance to the next game stage."""
-        stages = ["pre-flop", "flop", "turn", "river", "complete"]
-        current_index = stages.index(self.current_stage)
-        self.current_stage = stages[current_index + 1]
-
-        if self.current_stage == "flop":
-            self.community_cards.extend(self.deck[8:11])
-        elif self.current_stage == "turn":
-            self.community_cards.append(self.deck[11])
-        elif self.current_stage == "river":
-            self.community_cards.append(self.deck[12])
+        """Advance to the next game stage in the transition table, dealing its board cards."""
+        self.stage, board_cards = TRANSITIONS[self.stage]
+        if board_cards is None:
+            return
+
+        new_cards = self.deck[board_cards]
+        self.community_cards.extend(new_cards)
+        if self.subscribers:
+            self._emit(StreetDealt(self.stage, tuple(new_cards), tuple(self.community_cards)))
+        for card in new_cards:
+            self.board_mask |= 1 << CARD_INTS[card]
+        # Masks are replaced rather than updated in place, so snapshots can share them
+        for player in self.hands:
+            hand_mask = self.hand_masks[player].copy()
+            for card in new_cards:
+                hand_mask.add(card)
+            self.hand_masks[player] = hand_mask
+
+    def _hand_mask(self, player):
+        """Return the player's HandMask, rebuilding it if the cards were changed directly."""
+        cards = self.hands[player] + self.community_cards
+        card_mask = 0
+        for card in cards:
+            card_mask |= 1 << CARD_INTS[card]
+        hand_mask = self.hand_masks.get(player)
+        if hand_mask is None or hand_mask.card_mask != card_mask:
+            hand_mask = HandMask(cards)
+            self.hand_masks[player] = hand_mask
+            self.board_mask = HandMask(self.community_cards).card_mask
+        return hand_mask
 
     def _determine_winner(self):
-        """Determine the winner of the current hand."""
+        """Determine the winner(s) of the current hand and award the pot, splitting ties."""
         active_players = list(self.hands.keys())
 
         # If only one player left, they win by default
         if len(active_players) == 1:
             winner = active_players[0]
             self.last_winner = winner
+            self.last_winners = [winner]
             self.chips[winner] += self.pot
             return winner
 
-        best_hand = {"rank": -1, "high_card_values": []}
-        winner = None
-
-        for player, hand in self.hands.items():
-            result = HandEvaluator.evaluate_best_hand(hand, self.community_cards)
-            if result["rank"] > best_hand["rank"] or (
-                result["rank"] == best_hand["rank"] and result["high_card_values"] > best_hand["high_card_values"]
-            ):
-                best_hand = result
-                winner = player
-
-        self.last_winner = winner
-        self.chips[winner] += self.pot
-        return winner
+        # One integer key per hand; a single sort ranks the table
+        keys = {player: self._hand_mask(player).value() for player in active_players}
+        ranking = HandEvaluator.rank_showdown(keys)
+        winners = ranking[0]
+
+        # Odd chips go to the winners closest to the dealer's left
+        num_players = len(self.players)
+        seat_order = {
+            self.players[(self.dealer_position + 1 + i) % num_players]: i for i in range(num_players)
+        }
+        winners.sort(key=seat_order.__getitem__)
+        share, odd_chips = divmod(self.pot, len(winners))
+        for i, player in enumerate(winners):
+            self.chips[player] += share + (1 if i < odd_chips else 0)
+
+        self.last_winners = winners
+        self.last_winner = " & ".join(winners)
+        return self.last_winner
 
     def determine_winner(self):
         """Public interface for determining the winner (calls _determine_winner)"""
@@ -208,38 +389,127 @@ class TexasHoldEmGame:
             # If all active players are all-in or have matched the bet, complete the round
             if (not active_bets) or (all(bet == max(active_bets.values()) for bet in active_bets.values())):
                 self.betting_round_complete = True
-                self.message = f"Betting round complete. Click to continue."
+                self._announce("Betting round complete. Click to continue.")
 
     def _process_action(self, player, action):
         """Process a player's betting action."""
+        chips_before = self.chips[player]
+        self._apply_action(player, action)
+        if self.subscribers:
+            amount = chips_before - self.chips[player]
+            self._emit(ActionTaken(player, action, amount, self.stage, self.player_bets.get(player, 0)))
+
+    def _apply_action(self, player, action):
+        """Apply a betting action to the chips, bets and pot."""
         if action == "fold":
             # Make sure the player is actually removed from hands
             if player in self.hands:
                 del self.hands[player]
-                self.message = f"{player} folds."
+                self._announce("{} folds.", player)
         elif action == "check":
             # Check is essentially doing nothing - player's bet stays the same
-            self.message = f"{player} checks."
+            self._announce("{} checks.", player)
         elif action == "call":
             # Calculate how much more the player needs to add to match the current bet
             call_amount = min(self.chips[player], self.current_bet - self.player_bets[player])
             self.chips[player] -= call_amount
             self.player_bets[player] += call_amount
             self.pot += call_amount
-            self.message = f"{player} calls ${call_amount}."
+            self._announce("{} calls ${}.", player, call_amount)
         elif action == "raise":
-            # Calculate the raise amount (current bet + 20 or all remaining chips)
-            raise_amount = min(self.chips[player], self.current_bet + 20)
+            # Calculate the raise amount (current bet + RAISE_SIZE or all remaining chips)
+            raise_amount = min(self.chips[player], self.current_bet + RAISE_SIZE)
             # Deduct chips already bet in this round
             additional_amount = raise_amount - self.player_bets[player]
             self.chips[player] -= additional_amount
             self.pot += additional_amount
             self.current_bet = self.player_bets[player] + additional_amount
             self.player_bets[player] = self.current_bet
-            self.message = f"{player} raises to ${self.current_bet}."
+            self._announce("{} raises to ${}.", player, self.current_bet)
+
+    def apply_action(self, player, action):
+        """Apply a betting action without emitting events, for search.
+
+        Returns:
+            tuple: An undo token; pass it to undo_action to revert the action.
+        """
+        token = (
+            player,
+            self.chips[player],
+            self.player_bets.get(player),
+            self.pot,
+            self.current_bet,
+            self.hands.get(player),
+            self.message,
+        )
+        self._apply_action(player, action)
+        return token
+
+    def undo_action(self, token):
+        """Revert the action that returned `token` (actions must be undone in reverse order)."""
+        player, chips, bet, pot, current_bet, hand, message = token
+        self.chips[player] = chips
+        if bet is None:
+            self.player_bets.pop(player, None)
+        else:
+            self.player_bets[player] = bet
+        self.pot = pot
+        self.current_bet = current_bet
+        self.message = message
+        if hand is not None and player not in self.hands:
+            # Put the folded player back in seat order, which collect_bets iterates in
+            hands = self.hands
+            self.hands = {p: hand if p == player else hands[p] for p in self.players if p in hands or p == player}
+
+    def snapshot(self):
+        """Capture the game state as an immutable GameSnapshot for restore()."""
+        return GameSnapshot(
+            tuple(self.players),
+            tuple(self.deck),
+            tuple((player, tuple(cards)) for player, cards in self.hands.items()),
+            tuple(self.chips.items()),
+            tuple(self.player_bets.items()),
+            tuple(self.hand_masks.items()),
+            tuple(self.community_cards),
+            self.board_mask,
+            self.stage,
+            self.pot,
+            self.current_bet,
+            self.betting_round_complete,
+            self.hand_complete,
+            self.last_winner,
+            tuple(self.last_winners),
+            self.dealer_position,
+            self.hand_seed,
+            self.message,
+        )
+
+    def restore(self, snapshot):
+        """Return the game to the state captured by snapshot()."""
+        self.players = list(snapshot.players)
+        self.deck = list(snapshot.deck)
+        self.hands = {player: list(cards) for player, cards in snapshot.hands}
+        self.chips = dict(snapshot.chips)
+        self.player_bets = dict(snapshot.player_bets)
+        self.hand_masks = dict(snapshot.hand_masks)
+        self.community_cards = list(snapshot.community_cards)
+        self.board_mask = snapshot.board_mask
+        self.stage = snapshot.stage
+        self.pot = snapshot.pot
+        self.current_bet = snapshot.current_bet
+        self.betting_round_complete = snapshot.betting_round_complete
+        self.hand_complete = snapshot.hand_complete
+        self.last_winner = snapshot.last_winner
+        self.last_winners = list(snapshot.last_winners)
+        self.dealer_position = snapshot.dealer_position
+        self.hand_seed = snapshot.hand_seed
+        self.message = snapshot.message
 
     def get_user_action(self):
         """Get action from user input - to be overridden by UI."""
+        if self.user_action_source is not None:
+            return self.user_action_source(self)
+
         valid_actions = ["fold", "call", "check", "raise"]
         while True:
             action = input(f"Your action ({', '.join(valid_actions)}): ").lower()
@@ -250,6 +520,10 @@ class TexasHoldEmGame:
         """Simple bot logic for demo."""
         from random import random
 
+        policy = self.bot_policies.get(bot)
+        if policy is not None:
+            return policy(self, bot)
+
         hand_strength = self._evaluate_bot_hand_strength(bot)
 
         # Adjust probabilities based on hand strength (0-1 scale)
@@ -267,27 +541,42 @@ class TexasHoldEmGame:
             return "call"
 
     def _evaluate_bot_hand_strength(self, bot):
-        """Simple hand strength evaluation for bots - returns value from 0-1."""
-        # If no community cards yet, just evaluate hole cards
+        """Estimate a bot's equity in the current hand - returns value from 0-1.
+
+        Results are memoized per hole cards, board and opponent count, so repeated
+        decisions within a betting round are a dict lookup.
+        """
+        key = (self._hand_mask(bot).card_mask, self.board_mask, len(self.hands))
+        strength = self.strength_cache.get(key)
+        if strength is None:
+            strength = self._compute_bot_hand_strength(bot)
+            self.strength_cache[key] = strength
+        return strength
+
+    def _compute_bot_hand_strength(self, bot):
+        """Compute a bot's equity from scratch."""
+        # Before the flop, look up the precomputed equity of the starting-hand class
         if len(self.community_cards) == 0:
-            # Check for pairs in hole cards
-            if self.hands[bot][0][0] == self.hands[bot][1][0]:
-                return 0.8  # High value for a pocket pair
-
-            # Check for high cards
-            high_cards = "AKQJT"
-            if self.hands[bot][0][0] in high_cards and self.hands[bot][1][0] in high_cards:
-                return 0.7  # High value for two high cards
-            elif self.hands[bot][0][0] in high_cards or self.hands[bot][1][0] in high_cards:
-                return 0.5  # Medium value for one high card
-
-            return 0.3  # Low value for no high cards or pairs
-
-        # With community cards, use the hand evaluator
-        result = HandEvaluator.evaluate_best_hand(self.hands[bot], self.community_cards)
-
-        # Scale the rank to 0-1
-        return min(1.0, result["rank"] / 8.0)
+            return preflop_equity(self.hands[bot], len(self.hands) - 1)
+
+        # Heads-up against an assumed range, read the bot's row of the range equity matrix
+        opponent_range = self.opponent_ranges.get(bot)
+        if opponent_range is not None and len(self.hands) == 2:
+            return HandEvaluator.equity_vs_range(self.hands[bot], opponent_range, self.community_cards)
+
+        # Heads-up on the turn or river the remaining run-outs are cheap to enumerate exactly
+        if len(self.hands) == 2 and len(self.community_cards) >= 4:
+            return exact_equity(self.hands[bot], self.community_cards).equity
+
+        # Otherwise estimate equity against the remaining opponents
+        result = estimate_equity(
+            self.hands[bot],
+            self.community_cards,
+            num_opponents=max(1, len(self.hands) - 1),
+            max_samples=self.bot_equity_samples,
+            shard_size=self.bot_equity_samples,
+        )
+        return result.equity
 
     def get_valid_actions(self):
         """Return the list of valid actions for the current user."""
@@ -0,0 +1,97 @@
+# Background game engine for the Texas Hold'em UIs
+import queue
+import threading
+from collections import namedtuple
+
+from game_logic import TexasHoldEmGame
+
+# Game state published by the worker: an immutable GameSnapshot, whether the worker is still
+# processing a command, and the exception that ended the command, if any
+GameUpdate = namedtuple("GameUpdate", ["snapshot", "busy", "error"])
+
+
+class GameWorker:
+    """Steps a TexasHoldEmGame on a background thread so bot decisions never block a UI.
+
+    Commands are "start", "continue" or a betting action ("fold", "check", "call", "raise")
+    for the "User" seat. The worker subscribes to the game's events and publishes a
+    GameUpdate to `updates` on each one (hand start, action, street dealt, showdown) while it
+    runs a command, and a final one with busy=False when the command is done, so a UI can
+    redraw from the snapshots as the hand unfolds.
+
+    Bot policies run on the worker thread; CPU-heavy ones can use other cores through
+    their own process pools (e.g. MCTSPolicy(workers=4)).
+
+    Args:
+        game (TexasHoldEmGame): The game to run; the worker owns it once started.
+    """
+
+    def __init__(self, game=None):
+        self.game = game or TexasHoldEmGame()
+        self.game.subscribe(self._on_event)
+        self.commands = queue.Queue()
+        self.updates = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="game-worker", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, command):
+        """Queue a command for the worker."""
+        self.commands.put(command)
+
+    def stop(self, timeout=None):
+        """Finish the queued commands and end the worker thread."""
+        self.commands.put(None)
+        self._thread.join(timeout)
+
+    def _publish(self, busy=True, error=None):
+        self.updates.put(GameUpdate(self.game.snapshot(), busy, error))
+
+    def _run(self):
+        while True:
+            command = self.commands.get()
+            if command is None:
+                break
+            try:
+                self._execute(command)
+            except Exception as exc:
+                self._publish(busy=False, error=exc)
+            else:
+                self._publish(busy=False)
+
+    def _execute(self, command):
+        """Apply one command to the game."""
+        game = self.game
+        if command == "start":
+            game.start_game()
+            return
+
+        if command == "continue":
+            # Continue to next stage if betting is complete
+            if game.betting_round_complete:
+                game.play_round()
+            # Start new hand if the hand is complete
+            elif game.hand_complete:
+                game.start_new_hand()
+            return
+
+        # For betting actions, including folds, override game's get_user_action and collect
+        # bets, so the user's action goes through the engine and is published like the bots'
+        original_get_user_action = game.get_user_action
+        game.get_user_action = lambda: command
+
+        # Collect bets for this round
+        try:
+            game.collect_bets()
+        finally:
+            # Restore original function
+            game.get_user_action = original_get_user_action
+
+        # If betting is complete and we're not at the end, advance game
+        if game.betting_round_complete and not game.hand_complete:
+            game.play_round()
+
+    def _on_event(self, event):
+        """Publish the state after every game event."""
+        self._publish()
@@ -1,6 +1,8 @@
 # GUI for Texas Hold 'Em (Text-based CLI interface)
 from game_logic import TexasHoldEmGame
 import os
+import shutil
+import sys
 
 CARD_SUITS = {"C": "♣", "D": "♦", "H": "♥", "S": "♠"}  # Clubs  # Diamonds  # Hearts  # Spades
 
@@ -21,11 +23,71 @@ CARD_RANKS = {
 }
 
 
+# Rows the action prompt, the user's input and its echo take up below the table
+PROMPT_ROWS = 10
+
+
 def clear_screen():
     """Clear the terminal screen."""
     os.system("cls" if os.name == "nt" else "clear")
 
 
+class TerminalRenderer:
+    """Draws frames of text lines, rewriting only the lines that changed since the last frame.
+
+    Lines are placed with cursor-addressing escape codes and each frame is written with a
+    single buffered flush. Anything printed below the frame (prompts, input) is cleared by
+    the next frame. Row addressing only works while nothing has scrolled, so when the
+    frame plus the rows reserved below it do not fit the terminal, every frame is redrawn
+    in full instead.
+
+    Args:
+        stream: Text stream to draw to (default: sys.stdout).
+        fast_forward (bool): Skip frames rendered as intermediate, drawing only the frames
+                             the user needs to see (e.g. while bots play out a hand).
+        reserved_rows (int): Rows printed below the frame between two frames.
+        rows (int): Terminal height; None measures the terminal for every frame.
+    """
+
+    def __init__(self, stream=None, fast_forward=False, reserved_rows=PROMPT_ROWS, rows=None):
+        self.stream = stream or sys.stdout
+        self.fast_forward = fast_forward
+        self.reserved_rows = reserved_rows
+        self.rows = rows
+        self.previous = None
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+
+    def render(self, lines, intermediate=False):
+        """Draw a frame; returns False if it was skipped in fast-forward mode."""
+        if self.fast_forward and intermediate:
+            self.frames_skipped += 1
+            return False
+
+        rows = self.rows or shutil.get_terminal_size().lines
+        if self.previous is None or len(lines) + self.reserved_rows > rows:
+            # First frame, or one the prompt below would scroll: clear the screen and draw every line
+            parts = ["\033[H\033[2J"]
+            parts.extend(f"{line}\n" for line in lines)
+        else:
+            parts = []
+            for row, line in enumerate(lines):
+                if row >= len(self.previous) or self.previous[row] != line:
+                    parts.append(f"\033[{row + 1};1H{line}\033[K")
+            # Park the cursor below the frame, clearing shorter frames' leftovers and old prompts
+            parts.append(f"\033[{len(lines) + 1};1H\033[J")
+
+        self.stream.write("".join(parts))
+        self.stream.flush()
+        self.previous = list(lines)
+        self.frames_drawn += 1
+        return True
+
+    def invalidate(self):
+        """Redraw the next frame in full."""
+        self.previous = None
+
+
 def format_card(card):
     """Format a card with colored suits."""
     if not card:
@@ -49,39 +111,39 @@ def format_cards(cards):
     return " ".join(format_card(card) for card in cards)
 
 
-def display_table(game):
-    """Display the poker table with players, community cards, and pot."""
+def table_lines(game):
+    """Return the poker table with players, community cards, pot and message as lines of text."""
     width = 60
-    clear_screen()
+    lines = []
 
-    print("\n" + "=" * width)
-    print("TEXAS HOLD'EM".center(width))
-    print("=" * width)
+    lines += ["", "=" * width]
+    lines.append("TEXAS HOLD'EM".center(width))
+    lines.append("=" * width)
 
     # Display community cards
-    print("\n" + "-" * width)
+    lines += ["", "-" * width]
     if game.current_stage == "pre-flop":
-        print(f"{'Community Cards: [Waiting for flop]':^{width}}")
+        lines.append(f"{'Community Cards: [Waiting for flop]':^{width}}")
     else:
-        print(f"{'Community Cards:':^{width}}")
+        lines.append(f"{'Community Cards:':^{width}}")
         if game.community_cards:  # Make sure we have community cards to display
             cards_display = format_cards(game.community_cards)
-            print(f"{cards_display:^{width}}")
+            lines.append(f"{cards_display:^{width}}")
         else:
-            print(f"{'No community cards yet':^{width}}")
-    print("-" * width)
+            lines.append(f"{'No community cards yet':^{width}}")
+    lines.append("-" * width)
 
     # Display pot and stage information
-    print("\n" + "-" * width)
-    print(f"{'Current Pot:':<15}${game.pot}")
-    print(f"{'Stage:':<15}{game.current_stage.upper()}")
-    print(f"{'Dealer:':<15}{game.players[game.dealer_position]}")
-    print("-" * width)
+    lines += ["", "-" * width]
+    lines.append(f"{'Current Pot:':<15}${game.pot}")
+    lines.append(f"{'Stage:':<15}{game.current_stage.upper()}")
+    lines.append(f"{'Dealer:':<15}{game.players[game.dealer_position]}")
+    lines.append("-" * width)
 
     # Display all players and their chip stacks
-    print("\n" + "-" * width)
-    print(f"{'PLAYERS':^{width}}")
-    print("-" * width)
+    lines += ["", "-" * width]
+    lines.append(f"{'PLAYERS':^{width}}")
+    lines.append("-" * width)
 
     for player in game.players:
         if player == "User":
@@ -95,17 +157,36 @@ def display_table(game):
             active = "Folded"
 
         chips = f"${game.chips[player]}"
-        print(f"{status:<15}{active:<15}{chips}")
+        lines.append(f"{status:<15}{active:<15}{chips}")
 
     # Display user's hand
-    print("\n" + "-" * width)
+    lines += ["", "-" * width]
     if "User" in game.hands:
-        print(f"{'Your Hand:':^{width}}")
+        lines.append(f"{'Your Hand:':^{width}}")
         user_hand_display = format_cards(game.hands["User"])
-        print(f"{user_hand_display:^{width}}")
+        lines.append(f"{user_hand_display:^{width}}")
     else:
-        print(f"{'You folded this hand':^{width}}")
-    print("-" * width)
+        lines.append(f"{'You folded this hand':^{width}}")
+    lines.append("-" * width)
+
+    if game.message:
+        lines += ["", game.message]
+    return lines
+
+
+def display_table(game, renderer=None, intermediate=False):
+    """Display the poker table, redrawing only the lines that changed since the last frame."""
+    (renderer or _default_renderer()).render(table_lines(game), intermediate)
+
+
+_renderer = None
+
+
+def _default_renderer():
+    global _renderer
+    if _renderer is None:
+        _renderer = TerminalRenderer()
+    return _renderer
 
 
 def display_action_prompt(game):
@@ -140,60 +221,31 @@ def get_user_input(game):
     return action
 
 
-def handle_user_turn(game):
-    """Handle the user's turn in the game."""
-    if "User" not in game.hands:
-        # User has folded
-        return "continue"
-
-    # Get valid user action
-    action = get_user_input(game)
+def start_game(fast_forward=False):
+    """Text-based CLI interface for the poker game.
 
-    # If the action is 'continue', just return it
-    if action == "continue":
-        return action
+    The engine plays each hand, asking for the user's actions through get_user_input, and
+    the table is redrawn from the game's events as the hand unfolds.
 
-    # Otherwise, it's a betting action
-    # Override the get_user_action method temporarily
-    original_get_user_action = game.get_user_action
-    game.get_user_action = lambda: action
+    Args:
+        fast_forward (bool): Once the user has folded, skip drawing the bots' remaining
+                             streets and show the hand's result straight away.
+    """
+    game = TexasHoldEmGame(user_action_source=get_user_input)
+    renderer = TerminalRenderer(fast_forward=fast_forward)
 
-    # Process the betting round
-    game.collect_bets()
+    def redraw(event):
+        # Streets played by bots alone are intermediate frames
+        bots_only = "User" not in game.hands and not game.hand_complete
+        display_table(game, renderer, intermediate=bots_only)
 
-    # Restore the original method
-    game.get_user_action = original_get_user_action
-
-    return action
-
-
-def start_game():
-    """Text-based CLI interface for the poker game."""
-    game = TexasHoldEmGame()
+    game.subscribe(redraw)
     game.start_game()
-
-    playing = True
-    while playing:
-        # Display current game state
-        display_table(game)
-
-        if game.message:
-            print(f"\n{game.message}")
-
-        # If hand is complete, ask to play again
-        if game.hand_complete:
-            play_again = input("\nPlay another hand? (y/n): ")
-            if play_again.lower() != "y":
-                playing = False
-            else:
-                game.start_new_hand()
-            continue
-
-        # Handle user's turn
-        user_action = handle_user_turn(game)
-
-        # If user chose 'continue' and betting is complete, advance the game
-        if user_action == "continue" and game.betting_round_complete:
-            game.play_round()
+    while True:
+        game.play_hand()
+        play_again = input("\nPlay another hand? (y/n): ")
+        if play_again.lower() != "y":
+            break
+        game.start_new_hand()
 
     print("\nThanks for playing Texas Hold'em Poker!")
@@ -1,7 +1,11 @@
 import pygame
 import sys
 import os
+import hashlib
+import queue
+from atomic_write import save_cache
 from game_logic import TexasHoldEmGame
+from game_worker import GameWorker
 
 # Initialize pygame
 pygame.init()
@@ -21,98 +25,162 @@ DARK_GREEN = (0, 80, 0)
 CARD_WIDTH = 80
 CARD_HEIGHT = 120
 
+# Card images: optional <rank><suit>.png files and back.png in ASSETS_DIR, packed with
+# placeholders for any missing ones into one pre-scaled atlas cached in ATLAS_DIR
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "cards")
+ATLAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+ATLAS_VERSION = 1
+RANKS = "23456789TJQKA"
+SUITS = "CDHS"  # Clubs, Diamonds, Hearts, Spades; one atlas row each, the card back below
+
 # Button dimensions
 BUTTON_WIDTH = 120
 BUTTON_HEIGHT = 40
 
+# Screen regions redrawn when the game state shown in them changes (each covers its
+# panel and the cards drawn over it)
+TABLE_RECT = pygame.Rect(SCREEN_WIDTH // 4, SCREEN_HEIGHT // 4, SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+MESSAGE_RECT = pygame.Rect(0, SCREEN_HEIGHT - 100, SCREEN_WIDTH, 30)
+BUTTONS_RECT = pygame.Rect(0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, BUTTON_HEIGHT)
+SEAT_RECTS = {
+    "User": pygame.Rect(SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT - 180, 400, 150),
+    "Bot1": pygame.Rect(50, 50, 200, 160),
+    "Bot2": pygame.Rect(SCREEN_WIDTH - 250, 50, 200, 160),
+}
+
+# Rendered text surfaces kept before the cache is cleared
+TEXT_CACHE_SIZE = 512
+
+# Events after which the window contents must be redrawn in full
+EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+
+
+def card_atlas_path(assets_dir, cache_dir):
+    """Return the atlas cache file for the card images in `assets_dir`.
+
+    The file name hashes the images' names, sizes and modification times, the card size
+    and ATLAS_VERSION, so any change to them selects a new atlas without reading the
+    images on every launch.
+    """
+    digest = hashlib.sha256(f"{ATLAS_VERSION}:{CARD_WIDTH}x{CARD_HEIGHT}".encode())
+    for name in [rank + suit for suit in SUITS for rank in RANKS] + ["back"]:
+        try:
+            stat = os.stat(os.path.join(assets_dir, f"{name}.png"))
+        except FileNotFoundError:
+            continue
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}:".encode())
+    return os.path.join(cache_dir, f"card_atlas-{digest.hexdigest()[:16]}.png")
+
 
 class PygameGUI:
-    def __init__(self):
+    def __init__(self, bot_policies=None):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Texas Hold'em Poker")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 20)
         self.big_font = pygame.font.SysFont("Arial", 36)
+        # The engine and bots run on a worker thread; self.game is a view of the state it
+        # last published, restored from its snapshots
+        self.worker = GameWorker(TexasHoldEmGame(bot_policies=bot_policies))
         self.game = TexasHoldEmGame()
+        self.busy = False
 
         # Load card images
-        self.card_images = self._load_card_images()
-        self.card_back = pygame.image.load(os.path.join("assets", "cards", "back.png")).convert_alpha()
-        self.card_back = pygame.transform.scale(self.card_back, (CARD_WIDTH, CARD_HEIGHT))
+        self.card_images, self.card_back = self._load_card_atlas()
 
         # UI state
         self.selected_action = None
 
-    def _load_card_images(self):
-        """Load card images or create colored rectangles if images aren't available"""
-        # Check if assets folder exists
-        if not os.path.exists("assets/cards"):
-            os.makedirs("assets/cards", exist_ok=True)
+        # Retained-mode rendering: text surfaces by (font, text, color), and the game state
+        # each region was last drawn with, so only regions whose state changed are redrawn
+        self.text_cache = {}
+        self.region_keys = {}
+        self.needs_full_redraw = True
+
+    def render_text(self, font, text, color):
+        """Return the surface for `text`, rendering it only the first time it is drawn."""
+        key = (id(font), text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) >= TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = self.text_cache[key] = font.render(text, True, color)
+        return surface
+
+    def _load_card_atlas(self):
+        """Return the card images and the card back as subsurfaces of the cached atlas"""
+        path = card_atlas_path(ASSETS_DIR, ATLAS_DIR)
+        try:
+            atlas = pygame.image.load(path).convert_alpha()
+        except (pygame.error, FileNotFoundError):
+            atlas = self._build_card_atlas()
+            save_cache(path, lambda tmp_path: pygame.image.save(atlas, tmp_path), errors=(OSError, pygame.error))
 
         cards = {}
-        suits = ["C", "D", "H", "S"]  # Clubs, Diamonds, Hearts, Spades
-        ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "T", "J", "Q", "K", "A"]
-
-        # Try to load from file, or create colored rectangles
-        for suit in suits:
-            for rank in ranks:
-                card_key = rank + suit
+        for row, suit in enumerate(SUITS):
+            for col, rank in enumerate(RANKS):
+                cards[rank + suit] = atlas.subsurface((col * CARD_WIDTH, row * CARD_HEIGHT, CARD_WIDTH, CARD_HEIGHT))
+        back = atlas.subsurface((0, len(SUITS) * CARD_HEIGHT, CARD_WIDTH, CARD_HEIGHT))
+        return cards, back
+
+    def _build_card_atlas(self):
+        """Draw every card image, scaled to the card size, into one atlas surface"""
+        atlas = pygame.Surface((len(RANKS) * CARD_WIDTH, (len(SUITS) + 1) * CARD_HEIGHT), pygame.SRCALPHA)
+        cells = [(rank + suit, col, row) for row, suit in enumerate(SUITS) for col, rank in enumerate(RANKS)]
+        cells.append(("back", 0, len(SUITS)))
+
+        for card_key, col, row in cells:
+            img = None
+            img_path = os.path.join(ASSETS_DIR, f"{card_key}.png")
+            if os.path.exists(img_path):
                 try:
-                    img_path = os.path.join("assets", "cards", f"{card_key}.png")
-                    if os.path.exists(img_path):
-                        img = pygame.image.load(img_path).convert_alpha()
-                    else:
-                        # Create a rectangle with text as a placeholder
-                        img = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
-                        img.fill(WHITE)
-                        pygame.draw.rect(img, BLACK, (0, 0, CARD_WIDTH, CARD_HEIGHT), 2)
-
-                        # Add suit color and symbol
-                        suit_color = RED if suit in ["D", "H"] else BLACK
-                        suit_symbol = {"C": "♣", "D": "♦", "H": "♥", "S": "♠"}[suit]
-
-                        # Add rank text
-                        rank_text = rank
-                        if rank == "T":
-                            rank_text = "10"
-
-                        text_surf = self.font.render(f"{rank_text}{suit_symbol}", True, suit_color)
-                        img.blit(text_surf, (10, 10))
-
-                    # Scale to desired size
-                    img = pygame.transform.scale(img, (CARD_WIDTH, CARD_HEIGHT))
-                    cards[card_key] = img
-                except:
-                    # Fallback if loading/creating fails
-                    img = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
-                    img.fill(WHITE)
-                    cards[card_key] = img
-
-        # Create a card back
+                    img = pygame.image.load(img_path).convert_alpha()
+                except pygame.error:
+                    pass
+            if img is None:
+                img = self._draw_card_back() if card_key == "back" else self._draw_placeholder_card(card_key)
+
+            # Scale to desired size; RGBA_MAX onto the empty atlas copies the pixels, alpha included
+            img = pygame.transform.scale(img, (CARD_WIDTH, CARD_HEIGHT))
+            atlas.blit(img, (col * CARD_WIDTH, row * CARD_HEIGHT), special_flags=pygame.BLEND_RGBA_MAX)
+        return atlas
+
+    def _draw_placeholder_card(self, card_key):
+        """Create a rectangle with the rank and suit as text for a card without an image"""
+        rank, suit = card_key
+        img = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
+        img.fill(WHITE)
+        pygame.draw.rect(img, BLACK, (0, 0, CARD_WIDTH, CARD_HEIGHT), 2)
+
+        # Add suit color and symbol
+        suit_color = RED if suit in ["D", "H"] else BLACK
+        suit_symbol = {"C": "♣", "D": "♦", "H": "♥", "S": "♠"}[suit]
+
+        # Add rank text
+        rank_text = "10" if rank == "T" else rank
+        text_surf = self.font.render(f"{rank_text}{suit_symbol}", True, suit_color)
+        img.blit(text_surf, (10, 10))
+        return img
+
+    def _draw_card_back(self):
+        """Create the default card back"""
         back = pygame.Surface((CARD_WIDTH, CARD_HEIGHT))
         back.fill(BLUE)
         pygame.draw.rect(back, WHITE, (5, 5, CARD_WIDTH - 10, CARD_HEIGHT - 10), 2)
         pygame.draw.rect(back, WHITE, (10, 10, CARD_WIDTH - 20, CARD_HEIGHT - 20), 1)
-
-        # Save the card back for re-use
-        pygame.image.save(back, os.path.join("assets", "cards", "back.png"))
-
-        return cards
+        return back
 
     def draw_button(self, text, x, y, width, height, inactive_color, active_color, action=None):
-        """Draw a clickable button"""
+        """Draw a button, highlighted while the mouse is over it (clicks are handled as events)"""
         mouse = pygame.mouse.get_pos()
-        click = pygame.mouse.get_pressed()
 
         # Check if mouse is over button
         if x < mouse[0] < x + width and y < mouse[1] < y + height:
             pygame.draw.rect(self.screen, active_color, (x, y, width, height))
-            if click[0] == 1 and action is not None:
-                self.selected_action = action
         else:
             pygame.draw.rect(self.screen, inactive_color, (x, y, width, height))
 
-        text_surf = self.font.render(text, True, BLACK)
+        text_surf = self.render_text(self.font, text, BLACK)
         text_rect = text_surf.get_rect()
         text_rect.center = ((x + (width / 2)), (y + (height / 2)))
         self.screen.blit(text_surf, text_rect)
@@ -136,7 +204,7 @@ class PygameGUI:
         """Draw player information (chips, status, etc.)"""
         # Draw User area (bottom)
         pygame.draw.rect(self.screen, BLUE, (SCREEN_WIDTH // 2 - 200, SCREEN_HEIGHT - 180, 400, 120))
-        text = self.font.render(f"YOU - ${self.game.chips['User']}", True, WHITE)
+        text = self.render_text(self.font, f"YOU - ${self.game.chips['User']}", WHITE)
         self.screen.blit(text, (SCREEN_WIDTH // 2 - 180, SCREEN_HEIGHT - 170))
 
         # Draw cards if user hasn't folded
@@ -144,12 +212,12 @@ class PygameGUI:
             for i, card in enumerate(self.game.hands["User"]):
                 self.draw_card(card, SCREEN_WIDTH // 2 - 90 + i * (CARD_WIDTH + 10), SCREEN_HEIGHT - 150)
         else:
-            text = self.font.render("FOLDED", True, RED)
+            text = self.render_text(self.font, "FOLDED", RED)
             self.screen.blit(text, (SCREEN_WIDTH // 2 - 40, SCREEN_HEIGHT - 110))
 
         # Draw Bot1 area (upper left)
         pygame.draw.rect(self.screen, RED, (50, 50, 200, 120))
-        text = self.font.render(f"BOT1 - ${self.game.chips['Bot1']}", True, WHITE)
+        text = self.render_text(self.font, f"BOT1 - ${self.game.chips['Bot1']}", WHITE)
         self.screen.blit(text, (60, 60))
 
         # Draw Bot1's cards (face down unless showdown)
@@ -163,12 +231,12 @@ class PygameGUI:
                 for i in range(2):
                     self.draw_card(None, 70 + i * (CARD_WIDTH + 10), 90)
         else:
-            text = self.font.render("FOLDED", True, RED)
+            text = self.render_text(self.font, "FOLDED", RED)
             self.screen.blit(text, (130, 110))
 
         # Draw Bot2 area (upper right)
         pygame.draw.rect(self.screen, RED, (SCREEN_WIDTH - 250, 50, 200, 120))
-        text = self.font.render(f"BOT2 - ${self.game.chips['Bot2']}", True, WHITE)
+        text = self.render_text(self.font, f"BOT2 - ${self.game.chips['Bot2']}", WHITE)
         self.screen.blit(text, (SCREEN_WIDTH - 240, 60))
 
         # Draw Bot2's cards (face down unless showdown)
@@ -182,7 +250,7 @@ class PygameGUI:
                 for i in range(2):
                     self.draw_card(None, SCREEN_WIDTH - 230 + i * (CARD_WIDTH + 10), 90)
         else:
-            text = self.font.render("FOLDED", True, RED)
+            text = self.render_text(self.font, "FOLDED", RED)
             self.screen.blit(text, (SCREEN_WIDTH - 170, 110))
 
     def draw_game_info(self):
@@ -198,26 +266,27 @@ class PygameGUI:
         )
 
         # Draw pot
-        text = self.big_font.render(f"POT: ${self.game.pot}", True, GOLD)
+        text = self.render_text(self.big_font, f"POT: ${self.game.pot}", GOLD)
         self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 20))
 
         # Draw stage
-        text = self.font.render(f"Stage: {self.game.current_stage.upper()}", True, WHITE)
+        text = self.render_text(self.font, f"Stage: {self.game.current_stage.upper()}", WHITE)
         self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
 
         # Draw dealer button
         dealer = self.game.players[self.game.dealer_position]
-        text = self.font.render(f"Dealer: {dealer}", True, WHITE)
+        text = self.render_text(self.font, f"Dealer: {dealer}", WHITE)
         self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
 
         # Draw current message
         if self.game.message:
-            text = self.font.render(self.game.message, True, WHITE)
+            text = self.render_text(self.font, self.game.message, WHITE)
             self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT - 100))
 
-    def draw_action_buttons(self):
-        """Draw buttons for player actions"""
-        valid_actions = self.game.get_valid_actions()
+    def button_layout(self):
+        """Return (rect, action) for each action button"""
+        # No buttons while the worker is still playing the last action
+        valid_actions = [] if self.busy else self.game.get_valid_actions()
 
         # Position the action buttons at the bottom of the screen
         button_y = SCREEN_HEIGHT - 50
@@ -225,69 +294,111 @@ class PygameGUI:
         total_width = len(valid_actions) * BUTTON_WIDTH + (len(valid_actions) - 1) * spacing
         start_x = (SCREEN_WIDTH - total_width) // 2
 
-        for i, action in enumerate(valid_actions):
-            button_x = start_x + i * (BUTTON_WIDTH + spacing)
-            self.draw_button(
-                action.upper(), button_x, button_y, BUTTON_WIDTH, BUTTON_HEIGHT, GREEN, (0, 200, 0), action
-            )
+        return [
+            (pygame.Rect(start_x + i * (BUTTON_WIDTH + spacing), button_y, BUTTON_WIDTH, BUTTON_HEIGHT), action)
+            for i, action in enumerate(valid_actions)
+        ]
 
-    def update_display(self):
-        """Update the game display"""
-        # Clear screen
-        self.screen.fill(BLACK)
+    def action_at(self, pos):
+        """Return the action of the button at `pos`, or None"""
+        for rect, action in self.button_layout():
+            if rect.collidepoint(pos):
+                return action
+        return None
 
-        # Draw game elements
-        self.draw_game_info()
-        self.draw_community_cards()
-        self.draw_player_info()
-        self.draw_action_buttons()
+    def draw_action_buttons(self):
+        """Draw buttons for player actions"""
+        for rect, action in self.button_layout():
+            self.draw_button(action.upper(), rect.x, rect.y, rect.width, rect.height, GREEN, (0, 200, 0), action)
+
+    def region_states(self):
+        """Return (rect, state) for each screen region; a region is redrawn when its state changes"""
+        game = self.game
+        showdown = game.hand_complete and game.current_stage == "river"
+        regions = {
+            "table": (TABLE_RECT, (game.pot, game.current_stage, game.dealer_position, tuple(game.community_cards))),
+            "message": (MESSAGE_RECT, game.message),
+            "buttons": (
+                BUTTONS_RECT,
+                (tuple(action for _, action in self.button_layout()), self.action_at(pygame.mouse.get_pos())),
+            ),
+        }
+        for player, rect in SEAT_RECTS.items():
+            # Bots' cards are only drawn face up at showdown
+            face_up = player in game.hands and (player == "User" or showdown)
+            shown = tuple(game.hands[player]) if face_up else None
+            regions[player] = (rect, (game.chips[player], player in game.hands, shown))
+        return regions
 
-        # Update the display
-        pygame.display.flip()
+    def update_display(self):
+        """Redraw the regions whose game state changed and push only those rects to the display"""
+        dirty = []
+        for name, (rect, state) in self.region_states().items():
+            if name not in self.region_keys or self.region_keys[name] != state:
+                self.region_keys[name] = state
+                dirty.append(rect)
+        if self.needs_full_redraw:
+            self.needs_full_redraw = False
+            dirty = [self.screen.get_rect()]
+        if not dirty:
+            return dirty
+
+        # Regions overlap (cards hang over panels), so every layer is redrawn inside each dirty rect
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self.screen.fill(BLACK)
+            self.draw_game_info()
+            self.draw_community_cards()
+            self.draw_player_info()
+            self.draw_action_buttons()
+        self.screen.set_clip(None)
+
+        pygame.display.update(dirty)
+        return dirty
+
+    def apply_updates(self, wait=False):
+        """Show the latest state published by the game worker; with `wait`, block until it is idle"""
+        latest = None
+        while True:
+            try:
+                update = self.worker.updates.get(block=wait and (latest is None or latest.busy))
+            except queue.Empty:
+                break
+            if update.error is not None:
+                raise update.error
+            latest = update
+
+        if latest is None:
+            return False
+        self.game.restore(latest.snapshot)
+        self.busy = latest.busy
+        return True
 
     def handle_user_action(self, action):
-        """Process the user action"""
-        if action == "continue":
-            # Continue to next stage if betting is complete
-            if self.game.betting_round_complete:
-                self.game.play_round()
-            # Start new hand if the hand is complete
-            elif self.game.hand_complete:
-                self.game.start_new_hand()
-            return
-
-        # For betting actions, override game's get_user_action and collect bets
-        original_get_user_action = self.game.get_user_action
-        self.game.get_user_action = lambda: action
-
-        # If fold action, remove user from hands
-        if action == "fold":
-            if "User" in self.game.hands:
-                del self.game.hands["User"]
-
-        # Collect bets for this round
-        self.game.collect_bets()
-
-        # Restore original function
-        self.game.get_user_action = original_get_user_action
-
-        # If betting is complete and we're not at the end, advance game
-        if self.game.betting_round_complete and not self.game.hand_complete:
-            self.game.play_round()
+        """Send the user action to the game worker"""
+        self.busy = True
+        self.worker.submit(action)
 
     def play_game(self):
         """Main game loop"""
-        self.game.start_game()
+        self.worker.start()
+        self.worker.submit("start")
+        self.apply_updates(wait=True)
         running = True
 
         while running:
-            # Always update the display first
+            # Take the worker's latest state, then redraw whatever changed since the last frame
+            self.apply_updates()
             self.update_display()
 
             # Handle events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    self.selected_action = self.action_at(event.pos)
+                elif event.type in EXPOSE_EVENTS:
+                    self.needs_full_redraw = True
 
             # Process user action if selected
             if self.selected_action:
@@ -296,12 +407,14 @@ class PygameGUI:
 
                 if action == "quit":
                     running = False
-                else:
+                elif not self.busy:
                     self.handle_user_action(action)
 
             # Cap the frame rate
             self.clock.tick(30)
 
+        # The worker is a daemon thread, so a bot still thinking does not hold up quitting
+        self.worker.stop(timeout=1.0)
         pygame.quit()
 
 
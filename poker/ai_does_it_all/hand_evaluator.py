@@ -1,110 +1,160 @@
 # Hand evaluation logic for Texas Hold'em
+import numpy as np
+from hand_tables import (
+    CARD_INTS,
+    CARD_PRIMES,
+    CARD_RANK_BITS,
+    FLUSH_VALUES,
+    MULTISET_VALUES,
+    STRAIGHT_FLUSH,
+    build_array_tables,
+    decode_value,
+)
+
+HAND_DESCRIPTIONS = [
+    "High Card",
+    "One Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four of a Kind",
+    "Straight Flush",
+    "Royal Flush",
+]
+
+# NumPy copies of the tables, built on first use of evaluate_batch
+_array_tables = None
+
+# Number of high_card_values the legacy dict reports for each category
+LEGACY_VALUE_COUNTS = [5, 1, 2, 1, 1, 5, 2, 1, 1]
+
+
 class HandEvaluator:
     @staticmethod
-    def evaluate_best_hand(hole_cards, community_cards):
-        """Evaluate the best possible hand from hole cards and community cards."""
-        all_cards = hole_cards + community_cards
-        rank_values = {
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "T": 10,
-            "J": 11,
-            "Q": 12,
-            "K": 13,
-            "A": 14,
+    def evaluate(cards):
+        """Score a hand of 1-7 integer-encoded cards; higher values are better hands."""
+        product = 1
+        clubs = diamonds = hearts = spades = 0
+        for card in cards:
+            product *= CARD_PRIMES[card]
+            suit = card & 3
+            if suit == 0:
+                clubs |= CARD_RANK_BITS[card]
+            elif suit == 1:
+                diamonds |= CARD_RANK_BITS[card]
+            elif suit == 2:
+                hearts |= CARD_RANK_BITS[card]
+            else:
+                spades |= CARD_RANK_BITS[card]
+
+        # With seven or fewer cards a flush rules out quads and full houses,
+        # so a flush-table hit is always the best hand
+        flush = FLUSH_VALUES[clubs] or FLUSH_VALUES[diamonds] or FLUSH_VALUES[hearts] or FLUSH_VALUES[spades]
+        if flush:
+            return flush
+        return MULTISET_VALUES[product]
+
+    @staticmethod
+    def rank_showdown(keys):
+        """Group players into tiers of equal hand value, best tier first.
+
+        Args:
+            keys (dict): Player -> hand value from `evaluate` (or HandMask.value).
+
+        Returns:
+            list: Lists of players; every player in a tier ties, and the first tier wins.
+        """
+        ranked = sorted(keys.items(), key=lambda item: item[1], reverse=True)
+        tiers = []
+        previous = None
+        for player, key in ranked:
+            if key != previous:
+                tiers.append([])
+                previous = key
+            tiers[-1].append(player)
+        return tiers
+
+    @staticmethod
+    def evaluate_batch(hole_cards_array, board_array):
+        """Score many hands at once.
+
+        Args:
+            hole_cards_array: (N, 2) integer array of encoded hole cards.
+            board_array: (N, K) integer array of encoded board cards, K between 3 and 5.
+
+        Returns:
+            np.ndarray: (N,) int64 array of hand values comparable with `evaluate`.
+        """
+        tables = HandEvaluator.array_tables()
+        cards = np.concatenate([np.asarray(hole_cards_array), np.asarray(board_array)], axis=1).astype(np.intp)
+
+        products = np.prod(tables["card_primes"][cards], axis=1)
+        index = np.searchsorted(tables["multiset_keys"], products)
+        values = tables["multiset_values"][index]
+
+        # Each card sets a distinct rank bit within its suit, so summing bits per suit gives the suit mask
+        rank_bits = tables["card_rank_bits"][cards]
+        suits = cards & 3
+        flush = np.zeros(len(cards), dtype=np.int64)
+        for suit in range(4):
+            suit_masks = np.where(suits == suit, rank_bits, 0).sum(axis=1)
+            np.maximum(flush, tables["flush_values"][suit_masks], out=flush)
+
+        return np.where(flush > 0, flush, values)
+
+    @staticmethod
+    def array_tables():
+        """Return the NumPy evaluator tables, building them on first use."""
+        global _array_tables
+        if _array_tables is None:
+            _array_tables = build_array_tables(FLUSH_VALUES, MULTISET_VALUES)
+        return _array_tables
+
+    @staticmethod
+    def encode_cards(cards):
+        """Convert cards such as "AS", "10S" or integers to their integer encoding."""
+        return [CARD_INTS[card] for card in cards]
+
+    @staticmethod
+    def equity_vs_range(hole_cards, villain_range, board, dead_cards=()):
+        """Equity of two hole cards against a range on a flop, turn or river.
+
+        Args:
+            hole_cards (list): The hero's two hole cards.
+            villain_range: A range string such as "TT+, AKs, 76s-54s" or a weight vector
+                           over the 1326 combos.
+            board (list): Three to five community cards.
+            dead_cards (list): Cards known to be out of play.
+
+        Returns:
+            float: Equity with ties split, from the cached range-vs-range matrix.
+        """
+        import ranges  # ranges is built on this module
+
+        if isinstance(villain_range, str):
+            villain_range = ranges.parse_range(villain_range, board, dead_cards)
+        return ranges.hand_vs_range(hole_cards, villain_range, board, dead_cards)
+
+    @staticmethod
+    def describe(value):
+        """Build the legacy {"rank", "description", "high_card_values"} view of a hand value."""
+        category, kickers = decode_value(value)
+        rank = category
+        if category == STRAIGHT_FLUSH and kickers[0] == 14:
+            rank = 9  # Royal Flush
+        return {
+            "rank": rank,
+            "description": HAND_DESCRIPTIONS[rank],
+            "high_card_values": kickers[: LEGACY_VALUE_COUNTS[category]],
         }
 
-        # Extract ranks and suits
-        ranks = [card[0] for card in all_cards]
-        suits = [card[1] for card in all_cards]
-        rank_counts = {rank: ranks.count(rank) for rank in set(ranks)}
-
-        # Check for flush
-        flush_suit = next((suit for suit in set(suits) if suits.count(suit) >= 5), None)
-        flush_cards = [card for card in all_cards if card[1] == flush_suit] if flush_suit else []
-
-        # Check for straight
-        values = sorted([rank_values[r] for r in ranks])
-        straight_high = None
-        for i in range(len(values) - 4):
-            if values[i : i + 5] == list(range(values[i], values[i] + 5)):
-                straight_high = values[i + 4]
-
-        # Special case: Ace-low straight (A,2,3,4,5)
-        if set([14, 2, 3, 4, 5]).issubset(values):
-            straight_high = 5
-
-        # Check for straight flush (if we have a flush)
-        straight_flush_high = None
-        if flush_suit:
-            # Get sorted values of flush cards
-            flush_values = sorted([rank_values[card[0]] for card in flush_cards])
-            # Check for regular straights within the flush cards
-            for i in range(len(flush_values) - 4):
-                if flush_values[i : i + 5] == list(range(flush_values[i], flush_values[i] + 5)):
-                    straight_flush_high = flush_values[i + 4]
-            # Check for A-5 straight flush
-            if set([14, 2, 3, 4, 5]).issubset(flush_values):
-                straight_flush_high = 5
-
-        # Evaluate hand
-        # Royal Flush
-        if flush_suit and straight_flush_high == 14:
-            return {"rank": 9, "description": "Royal Flush", "high_card_values": [14]}
-
-        # Straight Flush
-        if straight_flush_high:
-            return {"rank": 8, "description": f"Straight Flush", "high_card_values": [straight_flush_high]}
-
-        # Four of a Kind
-        if 4 in rank_counts.values():
-            rank = next(r for r, count in rank_counts.items() if count == 4)
-            return {"rank": 7, "description": f"Four of a Kind", "high_card_values": [rank_values[rank]]}
-
-        # Full House
-        if 3 in rank_counts.values() and 2 in rank_counts.values():
-            three_rank = next(r for r, count in rank_counts.items() if count == 3)
-            two_rank = next(r for r, count in rank_counts.items() if count == 2)
-            return {
-                "rank": 6,
-                "description": f"Full House",
-                "high_card_values": [rank_values[three_rank], rank_values[two_rank]],
-            }
-
-        # Flush
-        if flush_suit:
-            flush_values = sorted([rank_values[card[0]] for card in flush_cards], reverse=True)
-            return {"rank": 5, "description": f"Flush", "high_card_values": flush_values[:5]}
-
-        # Straight
-        if straight_high:
-            return {"rank": 4, "description": f"Straight", "high_card_values": [straight_high]}
-
-        # Three of a Kind
-        if 3 in rank_counts.values():
-            rank = next(r for r, count in rank_counts.items() if count == 3)
-            return {"rank": 3, "description": f"Three of a Kind", "high_card_values": [rank_values[rank]]}
-
-        # Two Pair
-        pairs = [r for r, count in rank_counts.items() if count == 2]
-        if len(pairs) >= 2:
-            pair_values = sorted([rank_values[p] for p in pairs], reverse=True)
-            return {"rank": 2, "description": f"Two Pair", "high_card_values": pair_values[:2]}
-
-        # One Pair
-        if 2 in rank_counts.values():
-            rank = next(r for r, count in rank_counts.items() if count == 2)
-            return {"rank": 1, "description": f"One Pair", "high_card_values": [rank_values[rank]]}
-
-        # High Card
-        high_values = sorted([rank_values[r] for r in ranks], reverse=True)
-        return {"rank": 0, "description": f"High Card", "high_card_values": high_values[:5]}
+    @staticmethod
+    def evaluate_best_hand(hole_cards, community_cards):
+        """Evaluate the best possible hand from hole cards and community cards."""
+        value = HandEvaluator.evaluate([CARD_INTS[card] for card in hole_cards + community_cards])
+        return HandEvaluator.describe(value)
 
     @staticmethod
     def _rank_to_value(rank):
@@ -0,0 +1,104 @@
+# Bitmask hand representation for Texas Hold'em
+from hand_tables import (
+    CARD_INTS,
+    CARD_PRIMES,
+    CARD_RANK_BITS,
+    FLUSH_VALUES,
+    MULTISET_VALUES,
+    POPCOUNT_13,
+    straight_high,
+)
+
+
+class HandMask:
+    """A set of cards stored as four 13-bit suit masks (clubs, diamonds, hearts, spades).
+
+    Cards can be added and removed one at a time as the board grows, and the hand's
+    evaluator value is available at any point without re-reading the cards.
+    """
+
+    __slots__ = ("suit_masks", "card_mask", "product", "size")
+
+    def __init__(self, cards=()):
+        self.suit_masks = [0, 0, 0, 0]
+        self.card_mask = 0  # 52-bit mask of the cards held, usable as a cache key
+        self.product = 1  # Product of rank primes, the evaluator's rank-multiset key
+        self.size = 0
+        for card in cards:
+            self.add(card)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, card):
+        return bool(self.card_mask >> CARD_INTS[card] & 1)
+
+    def __eq__(self, other):
+        return isinstance(other, HandMask) and self.card_mask == other.card_mask
+
+    def __hash__(self):
+        return hash(self.card_mask)
+
+    def __repr__(self):
+        return f"HandMask({self.cards()})"
+
+    def copy(self):
+        """Return an independent copy of this hand."""
+        clone = HandMask.__new__(HandMask)
+        clone.suit_masks = self.suit_masks[:]
+        clone.card_mask = self.card_mask
+        clone.product = self.product
+        clone.size = self.size
+        return clone
+
+    def add(self, card):
+        """Add a card ("AS", "10S", int or Card)."""
+        card = CARD_INTS[card]
+        if self.card_mask >> card & 1:
+            raise ValueError(f"Card {card} is already in the hand.")
+        self.suit_masks[card & 3] |= CARD_RANK_BITS[card]
+        self.card_mask |= 1 << card
+        self.product *= CARD_PRIMES[card]
+        self.size += 1
+
+    def remove(self, card):
+        """Remove a card previously added."""
+        card = CARD_INTS[card]
+        if not self.card_mask >> card & 1:
+            raise ValueError(f"Card {card} is not in the hand.")
+        self.suit_masks[card & 3] &= ~CARD_RANK_BITS[card]
+        self.card_mask &= ~(1 << card)
+        self.product //= CARD_PRIMES[card]
+        self.size -= 1
+
+    def cards(self):
+        """List the cards held, lowest first."""
+        return [card for card in range(52) if self.card_mask >> card & 1]
+
+    @property
+    def rank_mask(self):
+        """13-bit mask of the ranks present in any suit."""
+        clubs, diamonds, hearts, spades = self.suit_masks
+        return clubs | diamonds | hearts | spades
+
+    def flush_suit(self):
+        """Return the suit index (0-3) holding five or more cards, or -1."""
+        for suit, mask in enumerate(self.suit_masks):
+            if POPCOUNT_13[mask] >= 5:
+                return suit
+        return -1
+
+    def straight_high(self):
+        """High card value (5-14) of the best straight in any suits, or 0."""
+        return straight_high(self.rank_mask)
+
+    def straight_flush_high(self):
+        """High card value (5-14) of the best straight flush, or 0."""
+        suit = self.flush_suit()
+        return straight_high(self.suit_masks[suit]) if suit >= 0 else 0
+
+    def value(self):
+        """Evaluator value of the best hand in this set (same scale as HandEvaluator.evaluate)."""
+        clubs, diamonds, hearts, spades = self.suit_masks
+        flush = FLUSH_VALUES[clubs] or FLUSH_VALUES[diamonds] or FLUSH_VALUES[hearts] or FLUSH_VALUES[spades]
+        return flush or MULTISET_VALUES.get(self.product, 0)
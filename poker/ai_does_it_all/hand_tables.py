@@ -0,0 +1,196 @@
+# Precomputed lookup tables for the Texas Hold'em hand evaluator
+import itertools
+import os
+import pickle
+
+import numpy as np
+from atomic_write import save_cache
+
+# The integer card encoding (rank_index * 4 + suit_index) is shared with the other
+# engines through poker/cards.py
+from cards import CARD_LOOKUP
+
+# One prime per rank: the product of a hand's primes identifies its rank multiset
+RANK_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+# Per-card constants indexed by the card integer
+CARD_PRIMES = [RANK_PRIMES[c >> 2] for c in range(52)]
+CARD_RANK_BITS = [1 << (c >> 2) for c in range(52)]
+
+# Number of cards in each 13-bit rank mask
+POPCOUNT_13 = [bin(mask).count("1") for mask in range(8192)]
+
+# Card string ("AS", "10S"), int or Card -> shared Card instance
+CARD_INTS = CARD_LOOKUP
+
+# Hand categories, encoded in the top bits of a hand value
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+CATEGORY_SHIFT = 20
+
+TABLE_VERSION = 1
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "hand_tables.pkl")
+
+
+def encode_value(category, kickers):
+    """Pack a category and up to five kicker values (2-14) into one comparable integer."""
+    value = category
+    for i in range(5):
+        value = (value << 4) | (kickers[i] if i < len(kickers) else 0)
+    return value
+
+
+def decode_value(value):
+    """Unpack a hand value into (category, kickers)."""
+    kickers = []
+    for shift in (16, 12, 8, 4, 0):
+        nibble = (value >> shift) & 0xF
+        if nibble:
+            kickers.append(nibble)
+    return value >> CATEGORY_SHIFT, kickers
+
+
+def straight_high(rank_mask):
+    """Return the high card value (5-14) of the best straight in a 13-bit rank mask, or 0."""
+    # Shift up one bit and copy the ace into bit 0 so the wheel (A-2-3-4-5) is a normal window
+    extended = (rank_mask << 1) | ((rank_mask >> 12) & 1)
+    # Bit i survives only if bits i..i+4 are all set, i.e. a straight with high value i + 5
+    runs = extended & (extended >> 1) & (extended >> 2) & (extended >> 3) & (extended >> 4)
+    return runs.bit_length() + 4 if runs else 0
+
+
+def _top_values(rank_mask, count):
+    """Return the `count` highest card values (2-14) present in a rank mask."""
+    values = []
+    for rank in range(12, -1, -1):
+        if rank_mask & (1 << rank):
+            values.append(rank + 2)
+            if len(values) == count:
+                break
+    return values
+
+
+def _flush_value(suit_mask):
+    """Value of the best flush or straight flush contained in a single-suit rank mask."""
+    high = straight_high(suit_mask)
+    if high:
+        return encode_value(STRAIGHT_FLUSH, [high])
+    return encode_value(FLUSH, _top_values(suit_mask, 5))
+
+
+def _multiset_value(ranks):
+    """Value of the best non-flush hand made from a multiset of rank indices."""
+    counts = [0] * 13
+    for rank in ranks:
+        counts[rank] += 1
+
+    # Rank values grouped by multiplicity, highest first
+    by_count = {4: [], 3: [], 2: [], 1: []}
+    for rank in range(12, -1, -1):
+        if counts[rank]:
+            by_count[counts[rank]].append(rank + 2)
+
+    quads, trips, pairs, singles = by_count[4], by_count[3], by_count[2], by_count[1]
+
+    if quads:
+        kicker = max(quads[1:] + trips + pairs + singles, default=0)
+        return encode_value(FOUR_OF_A_KIND, [quads[0]] + ([kicker] if kicker else []))
+
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return encode_value(FULL_HOUSE, [trips[0], pair])
+
+    rank_mask = 0
+    for rank in range(13):
+        if counts[rank]:
+            rank_mask |= 1 << rank
+    high = straight_high(rank_mask)
+    if high:
+        return encode_value(STRAIGHT, [high])
+
+    if trips:
+        return encode_value(THREE_OF_A_KIND, [trips[0]] + singles[:2])
+
+    if len(pairs) >= 2:
+        kicker = max(pairs[2:] + singles, default=0)
+        return encode_value(TWO_PAIR, pairs[:2] + ([kicker] if kicker else []))
+
+    if pairs:
+        return encode_value(ONE_PAIR, [pairs[0]] + singles[:3])
+
+    return encode_value(HIGH_CARD, singles[:5])
+
+
+def build_tables():
+    """Build the flush and rank-multiset tables from scratch.
+
+    Returns:
+        tuple: (flush_values, multiset_values) where flush_values is a list of 8192 values
+               indexed by a single-suit rank mask (0 for masks with fewer than five cards) and
+               multiset_values maps a prime product to the value of that rank multiset.
+    """
+    flush_values = [0] * 8192
+    for mask in range(8192):
+        if POPCOUNT_13[mask] >= 5:
+            flush_values[mask] = _flush_value(mask)
+
+    multiset_values = {}
+    for size in range(1, 8):
+        for ranks in itertools.combinations_with_replacement(range(13), size):
+            # A rank can appear at most four times in a real deck
+            if any(ranks[i] == ranks[i + 4] for i in range(size - 4)):
+                continue
+            product = 1
+            for rank in ranks:
+                product *= RANK_PRIMES[rank]
+            multiset_values[product] = _multiset_value(ranks)
+
+    return flush_values, multiset_values
+
+
+def load_tables(path=CACHE_PATH):
+    """Load the evaluator tables from the on-disk cache, building and saving them if needed."""
+    try:
+        with open(path, "rb") as f:
+            version, flush_values, multiset_values = pickle.load(f)
+        if version == TABLE_VERSION:
+            return flush_values, multiset_values
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    flush_values, multiset_values = build_tables()
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            pickle.dump((TABLE_VERSION, flush_values, multiset_values), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    save_cache(path, write)
+    return flush_values, multiset_values
+
+
+def build_array_tables(flush_values, multiset_values):
+    """Convert the evaluator tables to NumPy arrays for batched evaluation.
+
+    Returns:
+        dict: card_primes, card_rank_bits, flush_values, multiset_keys (sorted prime products)
+              and multiset_values (the value for each key, in the same order).
+    """
+    keys = np.array(sorted(multiset_values), dtype=np.int64)
+    return {
+        "card_primes": np.array(CARD_PRIMES, dtype=np.int64),
+        "card_rank_bits": np.array(CARD_RANK_BITS, dtype=np.int64),
+        "flush_values": np.array(flush_values, dtype=np.int64),
+        "multiset_keys": keys,
+        "multiset_values": np.array([multiset_values[k] for k in keys.tolist()], dtype=np.int64),
+    }
+
+
+FLUSH_VALUES, MULTISET_VALUES = load_tables()
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 import sys
+
+import poker_path  # noqa: F401  (shared poker/ modules)
+from game_events import ActionTaken, Showdown, StreetDealt
 from game_logic import TexasHoldEmGame
 
 
@@ -25,27 +28,23 @@ def display_game_state(game):
 
 def main():
     game = TexasHoldEmGame()
-    game.start_game()
-
-    while True:
-        display_game_state(game)
 
-        # Collect bets for the current stage
-        if not game.betting_round_complete:
-            game.collect_bets()
+    def on_event(event):
+        # A betting round opens once the big blind is posted and after each street is dealt
+        if isinstance(event, StreetDealt) or (isinstance(event, ActionTaken) and event.action == "big_blind"):
+            display_game_state(game)
+        elif isinstance(event, Showdown):
+            print(f"\nHand complete! {game.last_winner} wins ${event.pot}")
 
-        # Process the round and advance to the next stage if betting is complete
-        hand_complete = game.play_round()
-
-        # Show results if hand is complete
-        if hand_complete:
-            print(f"\nHand complete! {game.last_winner} wins ${game.pot}")
-
-            play_again = input("Play another hand? (y/n): ")
-            if play_again.lower() != "y":
-                break
+    game.subscribe(on_event)
+    game.start_game()
+    while True:
+        game.play_hand()
+        play_again = input("Play another hand? (y/n): ")
+        if play_again.lower() != "y":
+            break
 
-            game.start_new_hand()
+        game.start_new_hand()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Anytime Monte Carlo tree search for TexasHoldEmGame decisions.
+
+Every iteration restores a snapshot of the real game into a private scratch game, deals
+the opponents' hole cards and the rest of the board at random from the cards the bot
+cannot see, then plays the hand out: through the search tree while its betting lines are
+expanded (UCT selection), and with a cheap random rollout policy after that. The final
+chip counts are backed up as each seat's reward.
+
+The tree is keyed by betting actions only, so it is shared by all sampled deals. Search
+runs until the wall-clock budget expires; with several workers, each process grows its
+own tree from the same root (root parallelization) and the root visit counts are summed.
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import poker_path  # noqa: F401  (shared poker/ modules)
+from cards import CARD_STRINGS
+from game_events import Stage
+from game_logic import RAISE_SIZE, TexasHoldEmGame
+from hand_mask import HandMask
+from sharding import run_shards, shard_seed
+
+# Raises allowed per street inside the search (the engine itself has no cap)
+MAX_RAISES = 3
+
+# Rollout action weights when facing a bet and when checked to
+ROLLOUT_FACING_BET = {"fold": 1, "call": 4, "raise": 1}
+ROLLOUT_UNOPENED = {"check": 4, "raise": 1}
+
+SearchStats = namedtuple("SearchStats", ["iterations", "elapsed", "searches_per_second", "tree_size", "workers"])
+
+# Search result per root action: visit count and mean reward in chips
+ActionStats = namedtuple("ActionStats", ["visits", "mean"])
+
+
+class _Node:
+    __slots__ = ("visits", "value", "children", "untried", "seat")
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0  # Reward sum for the seat whose action leads to this node
+        self.children = {}
+        self.untried = None
+        self.seat = -1
+
+
+def _legal_actions(game, player, raises, max_raises):
+    """Actions searched for `player`; folding is never tried when checking is free."""
+    if game.current_bet > game.player_bets.get(player, 0):
+        actions = ["fold", "call"]
+    else:
+        actions = ["check"]
+    if raises < max_raises:
+        actions.append("raise")
+    return actions
+
+
+def _street_raises(game):
+    """Raises made so far on the current street, from the size of the bet."""
+    if game.stage == Stage.PRE_FLOP:
+        return max(0, (game.current_bet - game.blinds["big"]) // RAISE_SIZE)
+    return game.current_bet // RAISE_SIZE
+
+
+def _bets_matched(game):
+    """The engine's end-of-round test: every player with chips left has the same bet."""
+    bets = [game.player_bets.get(player, 0) for player in game.hands if game.chips[player] > 0]
+    return not bets or min(bets) == max(bets)
+
+
+def _weighted_choice(weights, actions, rng):
+    total = sum(weights[action] for action in actions)
+    draw = rng.random() * total
+    for action in actions:
+        draw -= weights[action]
+        if draw < 0:
+            return action
+    return actions[-1]
+
+
+def _determinize(game, player, unseen, rng):
+    """Replace every card `player` cannot see with a random unseen card."""
+    board = game.community_cards
+    opponents = [opponent for opponent in game.hands if opponent != player]
+    missing_board = 5 - len(board)
+    cards = rng.sample(unseen, 2 * len(opponents) + missing_board)
+    for i, opponent in enumerate(opponents):
+        hole = cards[2 * i : 2 * i + 2]
+        game.hands[opponent] = hole
+        game.hand_masks[opponent] = HandMask(hole + board)
+    if missing_board:
+        game.deck[13 - missing_board : 13] = cards[len(cards) - missing_board :]
+
+
+def _search_shard(snapshot, player, deadline, seed, exploration=1.0, max_raises=MAX_RAISES, max_iterations=None):
+    """Grow one search tree from `snapshot` until `deadline` (time.monotonic()).
+
+    Returns:
+        tuple: ({action: (visits, reward sum)} at the root, iterations, tree size).
+    """
+    rng = random.Random(seed)
+    game = TexasHoldEmGame(messages_enabled=False)
+    game.restore(snapshot)
+    seats = {name: seat for seat, name in enumerate(game.players)}
+    root_chips = [game.chips[name] for name in game.players]
+    known = set(game.hands[player]) | set(game.community_cards)
+    unseen = [card for card in CARD_STRINGS if card not in known]
+    root_order = list(game.hands)
+    root_index = root_order.index(player)
+    root_raises = _street_raises(game)
+    # Rewards span about the pot plus a street of capped raises from every player
+    scale = exploration * (game.pot + RAISE_SIZE * max_raises * len(game.hands))
+
+    root = _Node()
+    tree_size = 1
+    iterations = 0
+    clock = time.monotonic
+    while iterations == 0 or clock() < deadline:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        game.restore(snapshot)
+        _determinize(game, player, unseen, rng)
+
+        node = root
+        path = [root]
+        order, index, raises = root_order, root_index, root_raises
+        while True:
+            # Next player to act in this pass, skipping folded and all-in players
+            while index < len(order) and (order[index] not in game.hands or game.chips[order[index]] <= 0):
+                index += 1
+            if index == len(order):
+                if len(game.hands) > 1 and not _bets_matched(game):
+                    order, index = list(game.hands), 0
+                    continue
+                # Street over: deal the next one, or settle the hand
+                game.betting_round_complete = True
+                game.play_round()
+                if game.hand_complete:
+                    break
+                order, index, raises = list(game.hands), 0, 0
+                continue
+
+            actor = order[index]
+            index += 1
+            if node is None:
+                weights = ROLLOUT_FACING_BET if game.current_bet > game.player_bets.get(actor, 0) else ROLLOUT_UNOPENED
+                action = _weighted_choice(weights, _legal_actions(game, actor, raises, max_raises), rng)
+            else:
+                if node.untried is None:
+                    node.seat = seats[actor]
+                    node.untried = _legal_actions(game, actor, raises, max_raises)
+                if node.untried:
+                    # Expand one new betting line, then roll out from it
+                    action = node.untried.pop(rng.randrange(len(node.untried)))
+                    child = node.children[action] = _Node()
+                    tree_size += 1
+                    path.append(child)
+                    node = None
+                else:
+                    log_visits = math.log(node.visits)
+                    action, child = max(
+                        node.children.items(),
+                        key=lambda item: item[1].value / item[1].visits
+                        + scale * math.sqrt(log_visits / item[1].visits),
+                    )
+                    path.append(child)
+                    node = child
+            if action == "raise":
+                raises += 1
+            game.apply_action(actor, action)
+
+        rewards = [game.chips[name] - start for name, start in zip(game.players, root_chips)]
+        parent_seat = -1
+        for visited in path:
+            visited.visits += 1
+            if parent_seat >= 0:
+                visited.value += rewards[parent_seat]
+            parent_seat = visited.seat
+        iterations += 1
+
+    root_stats = {action: (child.visits, child.value) for action, child in root.children.items()}
+    return root_stats, iterations, tree_size
+
+
+class MCTSPolicy:
+    """Anytime MCTS bot policy, usable as a TexasHoldEmGame bot policy (policy(game, player)).
+
+    Args:
+        budget (float): Wall-clock seconds per decision; None searches max_iterations instead.
+        workers (int): Search processes; more than one grows independent trees in parallel
+                       and sums their root statistics.
+        exploration (float): UCT exploration constant, in units of the chips at stake at the root.
+        max_raises (int): Raises per street considered by the search.
+        seed (int): Base seed; each decision and worker tree is a shard (see sharding.shard_seed).
+        executor: Optional existing executor to reuse instead of starting a process pool.
+        max_iterations (int): Cap on iterations per worker; with no budget, searches are
+                              reproducible from the seed.
+    """
+
+    def __init__(
+        self,
+        budget=0.05,
+        workers=1,
+        exploration=1.0,
+        max_raises=MAX_RAISES,
+        seed=None,
+        executor=None,
+        max_iterations=None,
+    ):
+        if budget is None and max_iterations is None:
+            raise ValueError("MCTSPolicy needs a time budget or max_iterations.")
+        self.budget = budget
+        self.workers = workers
+        self.exploration = exploration
+        self.max_raises = max_raises
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.max_iterations = max_iterations
+        self.executor = executor
+        self._own_executor = None
+        self.decisions = 0
+        # Statistics of the most recent decision, for tuning the budget and worker count
+        self.last_stats = None
+        self.last_actions = {}
+
+    def close(self):
+        """Shut down the process pool started by this policy, if any."""
+        if self._own_executor is not None:
+            self._own_executor.shutdown()
+            self._own_executor = None
+
+    def _pool(self):
+        if self.executor is not None:
+            return self.executor
+        if self._own_executor is None:
+            self._own_executor = ProcessPoolExecutor(max_workers=self.workers - 1)
+        return self._own_executor
+
+    def search(self, game, player):
+        """Search `player`'s decision and return {action: ActionStats} for the root actions."""
+        start = time.monotonic()
+        deadline = math.inf if self.budget is None else start + self.budget
+        snapshot = game.snapshot()
+        params = (self.exploration, self.max_raises, self.max_iterations)
+        first_shard = self.decisions * self.workers
+        args = [
+            (snapshot, player, deadline, shard_seed(self.seed, first_shard + i), *params) for i in range(self.workers)
+        ]
+        self.decisions += 1
+        results = run_shards(_search_shard, args, self._pool() if self.workers > 1 else None)
+
+        visits, values = {}, {}
+        for root_stats, _, _ in results:
+            for action, (count, value) in root_stats.items():
+                visits[action] = visits.get(action, 0) + count
+                values[action] = values.get(action, 0.0) + value
+        elapsed = time.monotonic() - start
+        iterations = sum(result[1] for result in results)
+        self.last_stats = SearchStats(
+            iterations=iterations,
+            elapsed=elapsed,
+            searches_per_second=iterations / elapsed if elapsed > 0 else 0.0,
+            tree_size=sum(result[2] for result in results),
+            workers=self.workers,
+        )
+        self.last_actions = {action: ActionStats(visits[action], values[action] / visits[action]) for action in visits}
+        return self.last_actions
+
+    def __call__(self, game, player):
+        actions = self.search(game, player)
+        # The most visited action, ties broken by the better mean reward
+        return max(actions, key=lambda action: (actions[action].visits, actions[action].mean))
+
+
+def _game_after_deal(game):
+    """Deal a new hand and advance it to a random street, for benchmarking decisions."""
+    for player in game.players:
+        game.chips[player] = 1000
+    game.start_new_hand()
+    for _ in range(random.randrange(4)):
+        game.betting_round_complete = True
+        game.play_round()
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=0.05, help="Seconds per decision")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--decisions", type=int, default=20)
+    parser.add_argument("--exploration", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    policy = MCTSPolicy(budget=args.budget, workers=args.workers, exploration=args.exploration, seed=args.seed)
+    game = TexasHoldEmGame(messages_enabled=False)
+    try:
+        policy.search(_game_after_deal(game), "Bot1")  # Warm up the worker processes
+        totals = [0, 0.0, 0]
+        for _ in range(args.decisions):
+            actions = policy.search(_game_after_deal(game), "Bot1")
+            stats = policy.last_stats
+            totals[0] += stats.iterations
+            totals[1] += stats.elapsed
+            totals[2] += stats.tree_size
+            summary = ", ".join(f"{action} {result.visits}/{result.mean:+.1f}" for action, result in actions.items())
+            print(
+                f"{' '.join(game.hands['Bot1']):<6} {game.current_stage:<9}"
+                f"{stats.searches_per_second:9.0f} searches/s {stats.tree_size:6d} nodes  {summary}"
+            )
+    finally:
+        policy.close()
+    print(
+        f"{totals[0] / totals[1]:.0f} searches/s, {totals[0] / args.decisions:.0f} searches and "
+        f"{totals[2] / args.decisions:.0f} tree nodes per decision with {args.workers} worker(s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
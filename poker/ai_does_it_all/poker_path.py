@@ -0,0 +1,9 @@
+# Puts poker/ on sys.path so this folder can use the modules it shares with the other
+# engines (cards.py, hand_history.py). Scripts and conftest.py import it before anything
+# else; the library modules never touch sys.path themselves.
+import os
+import sys
+
+POKER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if POKER_DIR not in sys.path:
+    sys.path.append(POKER_DIR)
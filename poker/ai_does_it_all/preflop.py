@@ -0,0 +1,107 @@
+# Preflop equity lookup for the 169 canonical starting hands
+import os
+import struct
+from array import array
+
+from atomic_write import write_atomic
+from cards import RANKS
+from hand_tables import CARD_INTS
+
+TABLE_MAGIC = b"PFEQ"
+TABLE_VERSION = 1
+MAX_OPPONENTS = 9
+HEADER = struct.Struct("<4sHHH")
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_equity.bin")
+
+
+def _build_hand_classes():
+    """List the starting-hand classes ("AA", "AKs", "AKo", ...) from strongest ranks down."""
+    classes = []
+    for high in range(12, -1, -1):
+        classes.append(RANKS[high] * 2)
+        for low in range(high - 1, -1, -1):
+            classes.append(f"{RANKS[high]}{RANKS[low]}s")
+            classes.append(f"{RANKS[high]}{RANKS[low]}o")
+    return classes
+
+
+HAND_CLASSES = _build_hand_classes()
+HAND_CLASS_INDEX = {name: i for i, name in enumerate(HAND_CLASSES)}
+
+
+def _build_pair_classes():
+    """Map every ordered pair of integer cards to the index of its starting-hand class."""
+    table = [[-1] * 52 for _ in range(52)]
+    for a in range(52):
+        for b in range(52):
+            if a == b:
+                continue
+            high, low = max(a >> 2, b >> 2), min(a >> 2, b >> 2)
+            if high == low:
+                name = RANKS[high] * 2
+            else:
+                name = f"{RANKS[high]}{RANKS[low]}{'s' if (a & 3) == (b & 3) else 'o'}"
+            table[a][b] = HAND_CLASS_INDEX[name]
+    return table
+
+
+PAIR_CLASSES = _build_pair_classes()
+
+
+def hand_class(hole_cards):
+    """Return the class index (0-168) of two hole cards in any format CARD_INTS accepts."""
+    a, b = (CARD_INTS[card] for card in hole_cards)
+    return PAIR_CLASSES[a][b]
+
+
+def representative_cards(class_name):
+    """Return one concrete pair of integer cards belonging to a starting-hand class."""
+    high, low = RANKS.index(class_name[0]), RANKS.index(class_name[1])
+    if high == low:
+        return [high * 4, high * 4 + 1]
+    if class_name[2] == "s":
+        return [high * 4, low * 4]
+    return [high * 4, low * 4 + 1]
+
+
+def write_table(equities, path=TABLE_PATH):
+    """Write a 169 x MAX_OPPONENTS table of equities (row-major, float32) to disk."""
+    values = array("f", equities)
+    if len(values) != len(HAND_CLASSES) * MAX_OPPONENTS:
+        raise ValueError("Equity table has the wrong number of entries.")
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(TABLE_MAGIC, TABLE_VERSION, len(HAND_CLASSES), MAX_OPPONENTS))
+            f.write(values.tobytes())
+
+    write_atomic(path, write)
+
+
+def load_table(path=TABLE_PATH):
+    """Load the preflop equity table, or return None if it is missing, stale or truncated."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, num_classes, max_opponents = HEADER.unpack_from(data)
+    end = HEADER.size + 4 * num_classes * max_opponents
+    if magic != TABLE_MAGIC or version != TABLE_VERSION or len(data) < end:
+        return None
+    values = array("f")
+    values.frombytes(data[HEADER.size : end])
+    return values
+
+
+PREFLOP_EQUITY = load_table()
+
+
+def preflop_equity(hole_cards, num_opponents):
+    """Look up the all-in equity of two hole cards against 1-9 random opponents."""
+    if PREFLOP_EQUITY is None:
+        raise RuntimeError("Preflop equity table is missing; run build_preflop_table.py to generate it.")
+    num_opponents = min(max(num_opponents, 1), MAX_OPPONENTS)
+    return PREFLOP_EQUITY[hand_class(hole_cards) * MAX_OPPONENTS + num_opponents - 1]
@@ -0,0 +1,333 @@
+# Range-vs-range equity over the 1326 hole-card combos for Texas Hold'em
+import functools
+import itertools
+import re
+from collections import namedtuple
+from math import comb
+
+import numpy as np
+from hand_evaluator import HandEvaluator
+from cards import RANKS, SUITS
+from hand_tables import CARD_INTS
+
+NUM_COMBOS = 1326
+
+# Combo i is the pair COMBOS[i] = (low card, high card), in itertools.combinations order
+COMBOS = np.array(list(itertools.combinations(range(52), 2)), dtype=np.intp)
+COMBO_INDEX = np.full((52, 52), -1, dtype=np.intp)
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(NUM_COMBOS)
+
+# COMBO_CARDS[i, c] is True when combo i holds card c
+COMBO_CARDS = np.zeros((NUM_COMBOS, 52), dtype=bool)
+COMBO_CARDS[np.arange(NUM_COMBOS), COMBOS[:, 0]] = True
+COMBO_CARDS[np.arange(NUM_COMBOS), COMBOS[:, 1]] = True
+
+# Pairs of combos that share a card and so can never be dealt together
+CONFLICTS = (COMBO_CARDS.astype(np.uint8) @ COMBO_CARDS.T.astype(np.uint8)) > 0
+
+EquityMatrix = namedtuple("EquityMatrix", ["equity", "valid"])
+
+
+def combo_index(hole_cards):
+    """Index (0-1325) of two hole cards in any format CARD_INTS accepts."""
+    a, b = (CARD_INTS[card] for card in hole_cards)
+    return int(COMBO_INDEX[a, b])
+
+
+def blocked_combos(cards):
+    """Boolean vector of the combos holding any of `cards`."""
+    cards = [CARD_INTS[card] for card in cards]
+    if not cards:
+        return np.zeros(NUM_COMBOS, dtype=bool)
+    return COMBO_CARDS[:, cards].any(axis=1)
+
+
+def _runout_values(board, runouts):
+    """Hand values of every combo on every completed board.
+
+    Args:
+        board (list): The known board cards.
+        runouts (np.ndarray): (R, k) cards completing the board.
+
+    Returns:
+        np.ndarray: (R, NUM_COMBOS) int64 values comparable with HandEvaluator.evaluate.
+    """
+    tables = HandEvaluator.array_tables()
+    primes, rank_bits, flush_values = tables["card_primes"], tables["card_rank_bits"], tables["flush_values"]
+    full_boards = np.concatenate([np.tile(np.array(board, dtype=np.intp), (len(runouts), 1)), runouts], axis=1)
+
+    board_products = np.prod(primes[full_boards], axis=1)
+    combo_products = primes[COMBOS[:, 0]] * primes[COMBOS[:, 1]]
+    keys = board_products[:, None] * combo_products[None, :]
+    values = tables["multiset_values"][np.searchsorted(tables["multiset_keys"], keys)]
+
+    board_suits = full_boards & 3
+    combo_suits = COMBOS & 3
+    for suit in range(4):
+        suit_counts = (board_suits == suit).sum(axis=1)
+        # A flush needs at least three board cards of the suit
+        rows = np.flatnonzero(suit_counts >= 3)
+        if not len(rows):
+            continue
+        board_masks = np.where(board_suits[rows] == suit, rank_bits[full_boards[rows]], 0).sum(axis=1)
+        combo_masks = np.where(combo_suits == suit, rank_bits[COMBOS], 0).sum(axis=1)
+        flush = flush_values[board_masks[:, None] | combo_masks[None, :]]
+        values[rows] = np.where(flush > 0, flush, values[rows])
+    return values
+
+
+def _equity_matrix(board, dead_cards):
+    known = board + dead_cards
+    remaining = np.array([card for card in range(52) if card not in set(known)], dtype=np.intp)
+    runout_size = 5 - len(board)
+    runouts = np.array(list(itertools.combinations(remaining, runout_size)), dtype=np.intp)
+    runouts = runouts.reshape(comb(len(remaining), runout_size), runout_size)
+
+    live = ~blocked_combos(known)
+    valid = live[:, None] & live[None, :] & ~CONFLICTS
+
+    # Per run-out, combos are replaced by their dense rank; combos the run-out blocks get -1,
+    # so each entry of `score` sums sign(rank_i - rank_j) over all run-outs
+    values = _runout_values(board, runouts)
+    score = np.zeros((NUM_COMBOS, NUM_COMBOS), dtype=np.int16 if len(runouts) < 2**15 else np.int32)
+    diff = np.empty_like(score)
+    ranks = np.empty(NUM_COMBOS, dtype=score.dtype)
+    for runout, runout_values in zip(runouts, values):
+        _, dense = np.unique(runout_values, return_inverse=True)
+        ranks[:] = dense
+        ranks[~live | COMBO_CARDS[:, runout].any(axis=1)] = -1
+        np.subtract(ranks[:, None], ranks[None, :], out=diff)
+        np.sign(diff, out=diff)
+        score += diff
+
+    # For any two live, disjoint combos the number of run-outs blocking one, the other or
+    # both depends only on how many cards remain, so the sentinel's contribution is a constant.
+    # Per run-out: 2 for a win, 1 for a tie, 0 for a loss (sign + 1); blocked i vs live j
+    # scores 0, live i vs blocked j scores 2, both blocked scores 1.
+    n, k = len(remaining), runout_size
+    both_live = comb(n - 4, k)
+    one_blocked = comb(n - 2, k) - both_live
+    both_blocked = comb(n, k) - 2 * comb(n - 2, k) + both_live
+    points = score.astype(np.float32) + np.float32(len(runouts) - 2 * one_blocked - both_blocked)
+    equity = np.where(valid, points / np.float32(2 * both_live), np.float32(0.0))
+    return EquityMatrix(equity, valid)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_equity_matrix(board, dead_cards):
+    return _equity_matrix(list(board), list(dead_cards))
+
+
+def equity_matrix(board, dead_cards=()):
+    """Equity of every hole-card combo against every other on a flop, turn or river.
+
+    equity[i, j] is combo i's share of the pot against combo j (ties split) over all
+    run-outs; valid[i, j] is False when the two combos share a card or either is blocked
+    by the board or dead cards, and those entries of equity are 0. Matrices are cached for
+    the most recently used boards.
+
+    Args:
+        board (list): Three to five community cards.
+        dead_cards (list): Cards known to be out of play.
+
+    Returns:
+        EquityMatrix: (equity, valid), both (NUM_COMBOS, NUM_COMBOS); equity is float32.
+    """
+    board = tuple(sorted(CARD_INTS[card] for card in board))
+    dead_cards = tuple(sorted(CARD_INTS[card] for card in dead_cards))
+    if not 3 <= len(board) <= 5:
+        raise ValueError("The equity matrix needs a flop, turn or river.")
+    if len(set(board + dead_cards)) != len(board) + len(dead_cards):
+        raise ValueError("Duplicate cards among board and dead cards.")
+    return _cached_equity_matrix(board, dead_cards)
+
+
+def range_vs_range(hero_weights, villain_weights, board, dead_cards=()):
+    """Equity of one weighted range against another.
+
+    Each range is a length-NUM_COMBOS weight vector. Pairs of combos that cannot be dealt
+    together are excluded, so the result is weights' @ equity @ weights over valid pairs.
+
+    Returns:
+        float: The hero range's equity, or 0.0 if no pair of combos is possible.
+    """
+    matrix = equity_matrix(board, dead_cards)
+    hero = np.asarray(hero_weights, dtype=np.float32)
+    villain = np.asarray(villain_weights, dtype=np.float32)
+    total = hero @ matrix.valid.astype(np.float32) @ villain
+    if total <= 0:
+        return 0.0
+    return float(hero @ matrix.equity @ villain / total)
+
+
+def hand_vs_range(hole_cards, villain_weights, board, dead_cards=()):
+    """Equity of two hole cards against a weighted range: one row of the equity matrix.
+
+    Returns:
+        float: The hand's equity, or 0.0 if no combo of the range is possible.
+    """
+    matrix = equity_matrix(board, dead_cards)
+    i = combo_index(hole_cards)
+    villain = np.asarray(villain_weights, dtype=np.float32)
+    total = matrix.valid[i].astype(np.float32) @ villain
+    if total <= 0:
+        return 0.0
+    return float(matrix.equity[i] @ villain / total)
+
+
+# Range notation: comma-separated items, each optionally weighted as "item:weight"
+#   TT      one pair          TT+    TT through AA      TT-77  TT down to 77
+#   AKs     suited            AKo    offsuit            AK     both
+#   ATs+    AT-AK suited      A5s-A2s kicker range      76s-54s  connectors stepping together
+#   AsKs    one exact combo   random  every combo
+_RANK = "[2-9TJQKA]"
+_CLASS_TOKEN = re.compile(rf"({_RANK})({_RANK})([SO]?)(\+?)(?:-({_RANK})({_RANK})([SO]?))?")
+_COMBO_TOKEN = re.compile(rf"({_RANK})([CDHS])({_RANK})([CDHS])", re.IGNORECASE)
+
+
+def _class_combos(high, low, suitedness):
+    """Combo indices of a starting-hand class given rank indices and "s", "o" or ""."""
+    if high == low:
+        return [COMBO_INDEX[high * 4 + a, high * 4 + b] for a, b in itertools.combinations(range(4), 2)]
+    combos = []
+    for a in range(4):
+        for b in range(4):
+            if (a == b and suitedness != "o") or (a != b and suitedness != "s"):
+                combos.append(COMBO_INDEX[high * 4 + a, low * 4 + b])
+    return combos
+
+
+def _expand_token(token):
+    """List the combo indices an unweighted, normalized range item covers."""
+    if token == "random":
+        return list(range(NUM_COMBOS))
+    match = _COMBO_TOKEN.fullmatch(token)
+    if match:
+        first = CARD_INTS[match.group(1) + match.group(2).upper()]
+        second = CARD_INTS[match.group(3) + match.group(4).upper()]
+        if first == second:
+            raise ValueError(f"Invalid combo {token!r}.")
+        return [COMBO_INDEX[first, second]]
+
+    match = _CLASS_TOKEN.fullmatch(token.upper())
+    high, low, suitedness, plus, end_high, end_low, end_suitedness = match.groups()
+    high, low = RANKS.index(high), RANKS.index(low)
+    suitedness = suitedness.lower()
+    if plus:
+        if high == low:
+            shapes = [(rank, rank) for rank in range(high, 13)]
+        else:
+            shapes = [(high, kicker) for kicker in range(low, high)]
+    elif end_high:
+        end_high, end_low = RANKS.index(end_high), RANKS.index(end_low)
+        if high - low != end_high - end_low and high != end_high:
+            raise ValueError(f"Range {token!r} must keep either the top card or the gap fixed.")
+        if high == end_high:
+            shapes = [(high, kicker) for kicker in range(min(low, end_low), max(low, end_low) + 1)]
+        else:
+            shapes = [(top, top - (high - low)) for top in range(min(high, end_high), max(high, end_high) + 1)]
+    else:
+        shapes = [(high, low)]
+    combos = []
+    for shape_high, shape_low in shapes:
+        combos.extend(_class_combos(shape_high, shape_low, suitedness))
+    return combos
+
+
+def _normalize_token(token):
+    """Canonical spelling of one range item: ranks upper case, high rank first, s/o lower case."""
+    if token.lower() in ("random", "any"):
+        return "random"
+    match = _COMBO_TOKEN.fullmatch(token)
+    if match:
+        return f"{match.group(1).upper()}{match.group(2).lower()}{match.group(3).upper()}{match.group(4).lower()}"
+    match = _CLASS_TOKEN.fullmatch(token.upper())
+    if not match:
+        raise ValueError(f"Cannot parse range item {token!r}.")
+    high, low, suitedness, plus, end_high, end_low, end_suitedness = match.groups()
+    if high == low and suitedness:
+        raise ValueError(f"Pairs can't be suited or offsuit: {token!r}.")
+    if end_high and ((end_high == end_low) != (high == low) or end_suitedness != suitedness or plus):
+        raise ValueError(f"Mismatched range ends in {token!r}.")
+    if RANKS.index(low) > RANKS.index(high):
+        high, low = low, high
+    if end_high and RANKS.index(end_low) > RANKS.index(end_high):
+        end_high, end_low = end_low, end_high
+    # Write ranges from the top down: "77-TT" becomes "TT-77"
+    if end_high and (RANKS.index(end_high), RANKS.index(end_low)) > (RANKS.index(high), RANKS.index(low)):
+        high, low, end_high, end_low = end_high, end_low, high, low
+    normalized = f"{high}{low}{suitedness.lower()}{plus}"
+    if end_high:
+        normalized += f"-{end_high}{end_low}{end_suitedness.lower()}"
+    return normalized
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_range(text):
+    """Canonical form of a range string, the key expansions are cached under.
+
+    Whitespace is dropped, items are spelled canonically and weights are written as
+    plain numbers, with ":1" omitted.
+    """
+    items = []
+    for raw in text.replace(" ", "").split(","):
+        if not raw:
+            continue
+        token, _, weight = raw.partition(":")
+        weight = float(weight) if weight else 1.0
+        if not 0.0 <= weight <= 1.0:
+            raise ValueError(f"Range weights must be between 0 and 1: {raw!r}.")
+        token = _normalize_token(token)
+        items.append(token if weight == 1.0 else f"{token}:{weight:g}")
+    return ",".join(items)
+
+
+@functools.lru_cache(maxsize=1024)
+def _expand_range(normalized):
+    weights = np.zeros(NUM_COMBOS, dtype=np.float32)
+    for item in normalized.split(","):
+        if not item:
+            continue
+        token, _, weight = item.partition(":")
+        # Later items override earlier ones, so "TT+, AA:0.5" keeps half of the aces
+        weights[_expand_token(token)] = float(weight) if weight else 1.0
+    weights.flags.writeable = False
+    return weights
+
+
+@functools.lru_cache(maxsize=1024)
+def _blocked_range(normalized, blockers):
+    weights = _expand_range(normalized).copy()
+    weights[blocked_combos(blockers)] = 0.0
+    weights.flags.writeable = False
+    return weights
+
+
+def parse_range(text, board=(), dead_cards=()):
+    """Expand a range string into a weight per combo, with board and dead cards blocked.
+
+    Expansions are memoized by the normalized string and the blocking cards, so repeated
+    lookups of the same range return the same read-only array.
+
+    Args:
+        text (str): A range such as "TT+, AKs, KQo, 76s-54s, A5s:0.5".
+        board (list): Community cards; combos holding them get weight 0.
+        dead_cards (list): Other cards known to be out of play.
+
+    Returns:
+        np.ndarray: Read-only float32 vector of NUM_COMBOS weights in [0, 1].
+    """
+    normalized = normalize_range(text)
+    blockers = tuple(sorted(CARD_INTS[card] for card in itertools.chain(board, dead_cards)))
+    if not blockers:
+        return _expand_range(normalized)
+    return _blocked_range(normalized, blockers)
+
+
+def range_combos(weights):
+    """List the hole cards ("AS", "KS" strings) of every combo with positive weight."""
+    return [
+        (f"{RANKS[a >> 2]}{SUITS[a & 3]}", f"{RANKS[b >> 2]}{SUITS[b & 3]}")
+        for a, b in COMBOS[np.flatnonzero(np.asarray(weights) > 0)].tolist()
+    ]
@@ -7,6 +7,8 @@ Run this script to execute all tests.
 import unittest
 import sys
 
+import poker_path  # noqa: F401  (shared poker/ modules)
+
 
 def run_tests():
     """Run all tests for the Texas Hold'em game."""
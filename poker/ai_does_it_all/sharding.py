@@ -0,0 +1,49 @@
+# Seeded, sharded runs across processes for equity sampling, CFR training and MCTS
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+
+def shard_seed(seed, index):
+    """Seed for shard `index` of a run seeded with `seed`.
+
+    Every shard of a run gets its own seed from the run's base seed and the shard's
+    position in the run, so a seed and worker count always reproduce the same result.
+    """
+    return seed * 1000003 + index
+
+
+def round_sizes(remaining, shard_size, workers):
+    """Split the next round of work into up to one shard of at most `shard_size` per worker."""
+    sizes = []
+    while remaining > 0 and len(sizes) < max(1, workers):
+        size = min(shard_size, remaining)
+        sizes.append(size)
+        remaining -= size
+    return sizes
+
+
+@contextmanager
+def shard_pool(workers, executor=None):
+    """Yield `executor`, or a process pool for `workers` when it is None and workers > 1.
+
+    The calling process runs one shard of every round itself, so a pool started here has
+    workers - 1 processes, and it is shut down on exit. Yields None for in-process runs.
+    """
+    if executor is not None or workers <= 1:
+        yield executor
+        return
+    with ProcessPoolExecutor(max_workers=workers - 1) as pool:
+        yield pool
+
+
+def run_shards(function, shard_args, executor=None):
+    """Call function(*args) for each shard's args and return the results in shard order.
+
+    The first shard runs in this process while `executor`, if given, runs the rest.
+    """
+    if executor is None or len(shard_args) < 2:
+        return [function(*args) for args in shard_args]
+    futures = [executor.submit(function, *args) for args in shard_args[1:]]
+    results = [function(*shard_args[0])]
+    results.extend(future.result() for future in futures)
+    return results
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Headless self-play for TexasHoldEmGame.
+Plays many hands between pluggable policies with no I/O and reports throughput,
+chip EV per seat and time spent in each stage.
+"""
+
+import argparse
+import math
+import random
+import time
+from collections import namedtuple
+
+import poker_path  # noqa: F401  (shared poker/ modules)
+from game_logic import TexasHoldEmGame
+from hand_evaluator import HandEvaluator
+from hand_tables import CARD_INTS, CATEGORY_SHIFT, ONE_PAIR, TWO_PAIR
+from preflop import preflop_equity
+
+SeatResult = namedtuple("SeatResult", ["mean", "ci_low", "ci_high"])
+
+STAGES = ["deal", "pre-flop", "flop", "turn", "river", "showdown"]
+
+# Safety valve: betting passes allowed per street before the round is closed
+MAX_BETTING_PASSES = 50
+
+
+def always_call(game, player):
+    """Policy that calls (or checks) every bet."""
+    return "call"
+
+
+def always_raise(game, player):
+    """Policy that raises whenever it has chips."""
+    return "raise"
+
+
+def make_threshold_policy(fold_below=0.3, raise_above=0.6):
+    """Build a cheap policy: preflop table equity before the flop, made-hand category after.
+
+    The policy folds to a bet when its strength is under `fold_below`, raises when it is over
+    `raise_above` and calls otherwise. Post-flop strength is 0.2 for high card, 0.5 for a pair,
+    0.7 for two pair and 0.9 for anything better.
+    """
+    postflop_strength = {0: 0.2, ONE_PAIR: 0.5, TWO_PAIR: 0.7}
+
+    def policy(game, player):
+        hole = game.hands[player]
+        if not game.community_cards:
+            strength = preflop_equity(hole, len(game.hands) - 1)
+        else:
+            value = HandEvaluator.evaluate([CARD_INTS[card] for card in hole + game.community_cards])
+            strength = postflop_strength.get(value >> CATEGORY_SHIFT, 0.9)
+
+        facing_bet = game.current_bet > game.player_bets.get(player, 0)
+        if facing_bet and strength < fold_below:
+            return "fold"
+        if strength > raise_above:
+            return "raise"
+        return "call"
+
+    return policy
+
+
+class SimulationReport:
+    """Results of a self-play run."""
+
+    def __init__(self, hands, elapsed, seat_results, stage_seconds):
+        self.hands = hands
+        self.elapsed = elapsed
+        self.hands_per_second = hands / elapsed if elapsed > 0 else float("inf")
+        self.seat_results = seat_results
+        self.stage_seconds = stage_seconds
+
+    def summary(self):
+        """Format the report as a small text table."""
+        lines = [f"{self.hands} hands in {self.elapsed:.2f}s ({self.hands_per_second:,.0f} hands/s)"]
+        lines.append("Chip EV per hand (95% CI):")
+        for seat, result in self.seat_results.items():
+            lines.append(f"  {seat:<8}{result.mean:+9.2f}  [{result.ci_low:+.2f}, {result.ci_high:+.2f}]")
+        lines.append("Time per stage:")
+        for stage, seconds in self.stage_seconds.items():
+            share = seconds / self.elapsed if self.elapsed > 0 else 0.0
+            lines.append(f"  {stage:<10}{seconds:8.3f}s  {share:6.1%}")
+        return "\n".join(lines)
+
+
+class SelfPlaySimulator:
+    """Plays TexasHoldEmGame hands headlessly between pluggable policies.
+
+    Args:
+        policies (dict): Seat name -> policy(game, player) returning "fold", "check", "call"
+                         or "raise". Bots without a policy use the game's built-in logic and
+                         the "User" seat defaults to always_call.
+        starting_chips (int): Every seat's stack is reset to this at the start of each hand,
+                              so each hand is an independent sample of chip EV.
+        seed (int): Seed for the global `random` module the engine deals and decides with.
+    """
+
+    def __init__(self, policies=None, starting_chips=1000, seed=None):
+        policies = dict(policies or {})
+        user_policy = policies.pop("User", always_call)
+        self.game = TexasHoldEmGame(
+            user_action_source=lambda game: user_policy(game, "User"),
+            bot_policies=policies,
+            messages_enabled=False,
+        )
+        self.starting_chips = starting_chips
+        self.seed = seed
+
+    def play_hand(self, stage_seconds, seed=None):
+        """Play one hand to completion, adding time spent per stage to `stage_seconds`.
+
+        A `seed` deals the hand from TexasHoldEmGame.start_new_hand(seed=seed).
+        """
+        game = self.game
+        clock = time.perf_counter
+        start = clock()
+        for player in game.players:
+            game.chips[player] = self.starting_chips
+        game.start_new_hand(seed=seed)
+        stage_seconds["deal"] += clock() - start
+
+        passes = 0
+        while not game.hand_complete:
+            stage = game.current_stage
+            start = clock()
+            if not game.betting_round_complete:
+                game.collect_bets()
+                passes += 1
+                if passes >= MAX_BETTING_PASSES:
+                    game.betting_round_complete = True
+            else:
+                game.play_round()
+                passes = 0
+                if game.current_stage == "complete":
+                    stage = "showdown"
+            stage_seconds[stage] += clock() - start
+
+    def run(self, num_hands):
+        """Play `num_hands` hands and return a SimulationReport."""
+        if self.seed is not None:
+            random.seed(self.seed)
+
+        game = self.game
+        stage_seconds = dict.fromkeys(STAGES, 0.0)
+        totals = dict.fromkeys(game.players, 0.0)
+        squares = dict.fromkeys(game.players, 0.0)
+
+        start = time.perf_counter()
+        for _ in range(num_hands):
+            self.play_hand(stage_seconds)
+            for player in game.players:
+                net = game.chips[player] - self.starting_chips
+                totals[player] += net
+                squares[player] += net * net
+        elapsed = time.perf_counter() - start
+
+        seat_results = {}
+        for player in game.players:
+            mean = totals[player] / num_hands
+            variance = max(0.0, squares[player] / num_hands - mean * mean)
+            half_width = 1.96 * math.sqrt(variance / num_hands)
+            seat_results[player] = SeatResult(mean, mean - half_width, mean + half_width)
+
+        return SimulationReport(num_hands, elapsed, seat_results, stage_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    policies = {
+        "User": make_threshold_policy(),
+        "Bot1": always_call,
+        "Bot2": make_threshold_policy(fold_below=0.4, raise_above=0.75),
+    }
+    report = SelfPlaySimulator(policies, seed=args.seed).run(args.hands)
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
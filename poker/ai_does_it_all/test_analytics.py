@@ -0,0 +1,81 @@
+# Tests for columnar hand analytics
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from analytics import AnalyticsRecorder, player_stats, position_ev, summarize
+from hand_history import ACTION_CODES
+from simulator import SelfPlaySimulator, always_call, always_raise
+
+
+def run_recorded(root, num_hands, seed, partition_hands=40):
+    simulator = SelfPlaySimulator({"User": always_call, "Bot1": always_raise, "Bot2": always_call}, seed=seed)
+    with AnalyticsRecorder(root, partition_hands=partition_hands) as recorder:
+        simulator.game.subscribe(recorder)
+        report = simulator.run(num_hands)
+    return report
+
+
+def test_summarize_counts_voluntary_and_aggressive_actions():
+    code = ACTION_CODES
+    events = {
+        "hand": np.array([0, 0, 0, 0, 0, 0]),
+        "seat": np.array([0, 1, 0, 1, 0, 1]),
+        "street": np.array([0, 0, 0, 0, 1, 1]),
+        "action": np.array(
+            [code["small_blind"], code["big_blind"], code["raise"], code["call"], code["raise"], code["call"]]
+        ),
+        "amount": np.array([10, 20, 30, 20, 20, 20]),
+    }
+    hands = {
+        "hand": np.array([0, 0]),
+        "seat": np.array([0, 1]),
+        "player": np.array(["A", "B"], dtype=object),
+        "position": np.array([1, 2]),
+        "net": np.array([90, -90]),
+        "showdown": np.array([True, True]),
+        "won": np.array([True, False]),
+    }
+    summary = summarize(events, hands)
+    assert list(summary["player"]) == ["A", "B"]
+    assert list(summary["vpip"]) == [1, 1]
+    assert list(summary["pfr"]) == [1, 0]
+    assert list(summary["aggressive"]) == [1, 0]
+    assert list(summary["calls"]) == [0, 1]
+    assert list(summary["showdown_wins"]) == [1, 0]
+    assert list(summary["net"]) == [90.0, -90.0]
+
+
+def test_player_stats_match_simulation(tmp_path):
+    root = str(tmp_path / "dataset")
+    report = run_recorded(root, 100, seed=3)
+    assert len(os.listdir(os.path.join(root, "events"))) == 3
+
+    stats = player_stats(root)
+    assert set(stats) == {"User", "Bot1", "Bot2"}
+    for player, result in report.seat_results.items():
+        assert stats[player].hands == 100
+        assert stats[player].ev_per_hand == pytest.approx(result.mean)
+    assert stats["Bot1"].pfr == 1.0
+    assert stats["User"].pfr == 0.0
+    assert stats["User"].aggression_factor == 0.0
+    assert 0.0 <= stats["Bot2"].showdown_win_rate <= 1.0
+
+
+def test_position_ev_covers_every_seat(tmp_path):
+    root = str(tmp_path / "dataset")
+    run_recorded(root, 90, seed=4)
+    ev = position_ev(root)
+    assert {position for _, position in ev} == {0, 1, 2}
+    assert sum(hands for hands, _ in ev.values()) == 270
+
+
+def test_incremental_runs_append_partitions(tmp_path):
+    root = str(tmp_path / "dataset")
+    run_recorded(root, 50, seed=5, partition_hands=1000)
+    run_recorded(root, 30, seed=6, partition_hands=1000)
+    assert sorted(os.listdir(os.path.join(root, "summary"))) == ["part-000000.parquet", "part-000001.parquet"]
+    assert player_stats(root)["User"].hands == 80
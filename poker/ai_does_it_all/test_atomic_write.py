@@ -0,0 +1,38 @@
+# Tests for atomic writes of generated files
+import os
+
+import pytest
+from atomic_write import save_cache, write_atomic
+
+
+def write_text(text):
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            f.write(text)
+
+    return write
+
+
+def test_write_atomic_replaces_the_file(tmp_path):
+    path = str(tmp_path / "nested" / "table.bin")
+    write_atomic(path, write_text("one"))
+    write_atomic(path, write_text("two"))
+    with open(path) as f:
+        assert f.read() == "two"
+    assert os.listdir(os.path.dirname(path)) == ["table.bin"]
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / "table.bin")
+    write_atomic(path, write_text("old"))
+
+    def fail(tmp_path):
+        write_text("partial")(tmp_path)
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        write_atomic(path, fail)
+    assert not save_cache(path, fail)
+    with open(path) as f:
+        assert f.read() == "old"
+    assert os.listdir(str(tmp_path)) == ["table.bin"]
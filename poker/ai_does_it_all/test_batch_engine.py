@@ -0,0 +1,77 @@
+# Tests for the lockstep batch engine against the object engine
+import numpy as np
+import pytest
+from batch_engine import (
+    FOLD,
+    BatchEngine,
+    batch_always_call,
+    batch_always_raise,
+    make_batch_threshold_policy,
+    random_decks,
+    seeded_decks,
+)
+from simulator import STAGES, SelfPlaySimulator, always_call, always_raise, make_threshold_policy
+
+
+def object_engine_nets(policies, seeds):
+    """Chips won per hand and seat by SelfPlaySimulator playing the seeded hands in order."""
+    simulator = SelfPlaySimulator(dict(zip(["User", "Bot1", "Bot2"], policies)))
+    game = simulator.game
+    stage_seconds = dict.fromkeys(STAGES, 0.0)
+    nets = []
+    for seed in seeds:
+        simulator.play_hand(stage_seconds, seed=seed)
+        nets.append([game.chips[player] - simulator.starting_chips for player in game.players])
+    return np.array(nets)
+
+
+@pytest.mark.parametrize(
+    "scalar, batch",
+    [
+        (
+            [make_threshold_policy(), always_call, make_threshold_policy(0.4, 0.75)],
+            [make_batch_threshold_policy(), batch_always_call, make_batch_threshold_policy(0.4, 0.75)],
+        ),
+        (
+            [always_raise, make_threshold_policy(0.5, 0.55), always_call],
+            [batch_always_raise, make_batch_threshold_policy(0.5, 0.55), batch_always_call],
+        ),
+    ],
+)
+def test_matches_object_engine_on_the_same_seeds(scalar, batch):
+    tables, hands = 150, 3
+    seeds = np.arange(tables * hands).reshape(hands, tables) + 1000
+
+    engine = BatchEngine(tables, batch)
+    batch_nets = []
+    for hand in range(hands):
+        engine.reset_chips()
+        batch_nets.append(engine.play_hand(seeded_decks(seeds[hand])))
+
+    for table in range(tables):
+        expected = object_engine_nets(scalar, seeds[:, table].tolist())
+        assert np.array_equal(np.array([nets[table] for nets in batch_nets]), expected), table
+
+
+def test_chips_are_conserved_and_folds_end_hands_early():
+    engine = BatchEngine(500, [batch_always_raise, batch_always_call, lambda e, s, t: np.full(len(t), FOLD)])
+    net = engine.play_hand(random_decks(np.random.default_rng(1), 500))
+    assert (net.sum(axis=1) == 0).all()
+    # Bot2 folds at once, so it only ever loses a blind
+    assert set(net[:, 2].tolist()) <= {0, -10, -20}
+
+
+def test_run_reports_seat_ev():
+    engine = BatchEngine(200, [batch_always_call] * 3)
+    report = engine.run(1000, seed=3)
+    assert report.hands == 1000
+    assert set(report.seat_results) == {"User", "Bot1", "Bot2"}
+    assert abs(sum(result.mean for result in report.seat_results.values())) < 1e-9
+    assert report.stage_seconds["showdown"] > 0
+
+
+def test_rejects_unsupported_tables():
+    with pytest.raises(ValueError):
+        BatchEngine(10, [batch_always_call] * 5, num_seats=5)
+    with pytest.raises(ValueError):
+        BatchEngine(10, [batch_always_call] * 2)
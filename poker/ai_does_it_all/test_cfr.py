@@ -0,0 +1,127 @@
+# Tests for the CFR trainer and the "cfr" bot style
+import numpy as np
+import pytest
+from bot import Bot
+from cfr import (
+    BIG_BLIND,
+    INFOSET_LEGAL,
+    NUM_ACTIONS,
+    NUM_INFOSETS,
+    RAISE,
+    SHOWDOWN,
+    CFRPolicy,
+    CFRTrainer,
+    betting_tree,
+    hand_bucket,
+    infoset_id,
+    load_strategy,
+    _train_shard,
+    regret_matching,
+)
+from game_logic import TexasHoldEmGame
+from sharding import shard_seed
+
+
+def test_betting_tree_follows_fixed_raise_structure():
+    tree = betting_tree()
+    root = 0
+    # Small blind acts first facing 10 more, so every action is available
+    assert all(child >= 0 for child in tree.children[root])
+    # Limp, check: the cheapest showdown has both players in for the big blind
+    assert tree.contributions[tree.showdown_nodes].min() == BIG_BLIND
+    # Fold right away loses the small blind
+    assert tree.fold_utility.min() < 0 and -10 in tree.fold_utility
+    assert (tree.kind[tree.showdown_nodes] == SHOWDOWN).all()
+
+
+def test_regret_matching_respects_legal_actions():
+    regrets = np.array([[5.0, -1.0, 3.0], [-2.0, -1.0, -4.0]])
+    legal = np.array([[False, True, True], [True, True, False]])
+    strategy = regret_matching(regrets, legal)
+    assert strategy[0].tolist() == [0.0, 0.0, 1.0]
+    assert strategy[1].tolist() == [0.5, 0.5, 0.0]
+
+
+def test_training_is_reproducible_and_shapes_are_compact():
+    first = CFRTrainer(batch_size=64, seed=3)
+    first.train(4, merge_every=2)
+    second = CFRTrainer(batch_size=64, seed=3)
+    second.train(4, merge_every=2)
+    assert first.regrets.shape == (NUM_INFOSETS, NUM_ACTIONS)
+    assert np.array_equal(first.regrets, second.regrets)
+    assert first.iterations == 4
+
+    strategy = first.average_strategy()
+    assert np.allclose(strategy.sum(axis=1), 1.0)
+    assert not strategy[~INFOSET_LEGAL].any()
+
+
+def test_parallel_training_merges_worker_deltas():
+    trainer = CFRTrainer(batch_size=32, seed=5)
+    trainer.train(2, workers=2, merge_every=1)
+    assert trainer.iterations == 2
+
+    # Both workers started from empty arrays; the merge is the sum of their deltas
+    zeros = np.zeros((NUM_INFOSETS, NUM_ACTIONS))
+    deltas = [_train_shard(zeros, zeros, 1, 32, shard_seed(5, shard)) for shard in range(2)]
+    assert np.allclose(trainer.regrets, deltas[0][0] + deltas[1][0])
+    assert np.allclose(trainer.strategy_sum, deltas[0][1] + deltas[1][1])
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "cfr.npz")
+    trainer = CFRTrainer(batch_size=32, seed=7)
+    trainer.train(3, checkpoint_path=path, checkpoint_every=1)
+    resumed = CFRTrainer.load_checkpoint(path)
+    assert resumed.iterations == 3
+    assert np.array_equal(resumed.regrets, trainer.regrets)
+
+    # Resuming continues the seeded shard sequence
+    trainer.train(1)
+    resumed.train(1)
+    assert np.array_equal(resumed.strategy_sum, trainer.strategy_sum)
+
+    trainer.save_strategy(str(tmp_path / "strategy.npz"))
+    assert np.allclose(load_strategy(str(tmp_path / "strategy.npz")), trainer.average_strategy(), atol=1e-6)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["cfr.npz", "strategy.npz"]
+
+
+def test_hand_buckets():
+    assert hand_bucket(["AS", "AH"], []) == 7
+    assert hand_bucket(["7C", "2D"], []) == 0
+    # Hole cards that don't improve on a paired board play the board
+    assert hand_bucket(["7C", "2D"], ["KS", "KH", "9D"]) == 0
+    assert hand_bucket(["KC", "2D"], ["KS", "KH", "9D"]) == 3
+
+
+def test_policy_samples_from_the_table():
+    strategy = np.zeros((NUM_INFOSETS, NUM_ACTIONS))
+    strategy[:, RAISE] = 1.0
+    facing = infoset_id(0, 0, True, hand_bucket(["7C", "2D"], []))
+    strategy[facing] = [1.0, 0.0, 0.0]
+    policy = CFRPolicy(strategy)
+    assert policy.choose(["7C", "2D"], [], BIG_BLIND, ["fold", "call", "raise"]) == "fold"
+    assert policy.choose(["AS", "AH"], [], BIG_BLIND, ["fold", "call", "raise"]) == "raise"
+    assert policy.choose(["AS", "AH"], [], BIG_BLIND, ["fold", "call"]) == "call"
+    strategy[:] = [0.0, 1.0, 0.0]
+    assert policy.choose(["AS", "AH"], ["2C", "3C", "9D"], 0, ["check", "raise"]) == "check"
+
+
+def test_cfr_bot_style_and_game_policy():
+    if load_strategy() is None:
+        pytest.skip("No trained strategy table")
+    bot = Bot("Bot1", style="cfr")
+    bot.hand = ["AS", "AH"]
+    assert bot.decide_action(["fold", "call", "raise"], current_bet=BIG_BLIND) in ("call", "raise")
+
+    policy = CFRPolicy()
+    game = TexasHoldEmGame(bot_policies={"Bot1": policy, "Bot2": policy}, user_action_source=lambda game: "call")
+    game.start_new_hand()
+    for _ in range(20):
+        if game.hand_complete:
+            break
+        if game.betting_round_complete:
+            game.play_round()
+        else:
+            game.collect_bets()
+    assert sum(game.chips.values()) + (0 if game.hand_complete else game.pot) == 3000
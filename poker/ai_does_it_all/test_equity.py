@@ -0,0 +1,89 @@
+# Tests for Monte Carlo equity estimation
+import itertools
+
+import pytest
+from equity import _suit_symmetries, estimate_equity, exact_equity, to_card_ints
+from hand_evaluator import HandEvaluator
+
+
+def test_pocket_aces_heads_up():
+    result = estimate_equity(["AS", "AH"], num_opponents=1, max_samples=20000, ci_half_width=0.01, seed=1)
+    assert result.equity == pytest.approx(0.85, abs=0.02)
+    assert result.win + result.tie + result.lose == pytest.approx(1.0)
+
+
+def test_made_nuts_on_the_river():
+    result = estimate_equity(["AS", "KS"], ["QS", "JS", "TS", "2D", "3C"], num_opponents=3, seed=2)
+    assert result.win == 1.0
+    assert result.lose == 0.0
+
+
+def test_same_seed_is_reproducible():
+    first = estimate_equity(["9C", "8C"], ["7C", "2D", "KH"], num_opponents=2, max_samples=3000, seed=5)
+    second = estimate_equity(["9C", "8C"], ["7C", "2D", "KH"], num_opponents=2, max_samples=3000, seed=5)
+    assert first == second
+
+
+def test_stops_early_once_interval_is_tight():
+    result = estimate_equity(["AS", "AH"], num_opponents=1, max_samples=100000, ci_half_width=0.02, shard_size=500, seed=3)
+    assert result.samples < 100000
+    assert 1.96 * result.stderr <= 0.02
+
+
+def test_process_pool_fan_out():
+    result = estimate_equity(["KD", "KC"], num_opponents=1, max_samples=4000, shard_size=1000, workers=2, seed=4)
+    assert result.samples == 4000
+    assert result.equity == pytest.approx(0.82, abs=0.04)
+
+
+def test_dead_cards_are_excluded():
+    # With every other ace dead, the hero's pair of aces cannot improve to trips, and no
+    # run-out or opponent hand may use AC or AD
+    hole, board, dead = ["AS", "AH"], ["2C", "7D", "9H", "JS"], ["AC", "AD"]
+    expected = _brute_force_equity(hole, board, dead)
+    assert expected < _brute_force_equity(hole, board)
+    assert exact_equity(hole, board, dead).equity == pytest.approx(expected)
+    result = estimate_equity(hole, board, dead_cards=dead, max_samples=20000, ci_half_width=0.005, seed=6)
+    assert result.equity == pytest.approx(expected, abs=0.01)
+    with pytest.raises(ValueError):
+        estimate_equity(["AS", "AH"], dead_cards=["AS"])
+
+
+def _brute_force_equity(hole, board, dead=()):
+    hole, board, dead = to_card_ints(hole), to_card_ints(board), to_card_ints(dead)
+    remaining = [card for card in range(52) if card not in hole + board + dead]
+    score = total = 0
+    for runout in itertools.combinations(remaining, 5 - len(board)):
+        full_board = board + list(runout)
+        hero = HandEvaluator.evaluate(hole + full_board)
+        for opponent in itertools.combinations([c for c in remaining if c not in runout], 2):
+            villain = HandEvaluator.evaluate(list(opponent) + full_board)
+            score += 2 if hero > villain else 1 if hero == villain else 0
+            total += 2
+    return score / total
+
+
+@pytest.mark.parametrize(
+    "hole, board",
+    [
+        (["9C", "9D"], ["2H", "3H", "4H", "5S"]),
+        (["AS", "KD"], ["QS", "JS", "2C", "7H", "7D"]),
+    ],
+)
+def test_exact_equity_matches_brute_force(hole, board):
+    assert exact_equity(hole, board).equity == pytest.approx(_brute_force_equity(hole, board))
+
+
+def test_exact_equity_flop_uses_suit_symmetry():
+    # Clubs and diamonds are interchangeable here, halving the run-outs to evaluate
+    known = to_card_ints(["AS", "KS", "7H", "8H", "2H"])
+    assert len(_suit_symmetries(known)) == 2
+    result = exact_equity(["AS", "KS"], ["7H", "8H", "2H"])
+    assert result.samples == 1081 * 990
+    assert result.stderr == 0.0
+    assert result.equity == pytest.approx(estimate_equity(["AS", "KS"], ["7H", "8H", "2H"], seed=1).equity, abs=0.01)
+
+
+def test_exact_equity_requires_a_flop():
+    with pytest.raises(ValueError):
+        exact_equity(["AS", "KS"], [])
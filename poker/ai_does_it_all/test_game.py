@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import random
+
 import pytest
 from unittest.mock import patch, MagicMock
 from io import StringIO
@@ -226,6 +228,30 @@ def test_new_hand_setup(poker_game):
     assert game.pot == 30  # Small blind + Big blind
 
 
+def test_random_seed_reproduces_the_deal(poker_game):
+    game = poker_game
+    random.seed(5)
+    game.start_new_hand()
+    first = game.deck
+    for _ in range(3):
+        game.start_new_hand()
+    random.seed(5)
+    game.start_new_hand()
+    assert game.deck == first
+
+
+def test_seeded_hand_leaves_the_global_stream_in_charge(poker_game):
+    fresh = TexasHoldEmGame()
+    random.seed(7)
+    fresh.start_new_hand()
+
+    game = poker_game
+    game.start_new_hand(seed=42)
+    random.seed(7)
+    game.start_new_hand()
+    assert game.deck == fresh.deck
+
+
 def test_betting(poker_game):
     game = poker_game
     game.start_new_hand()
@@ -322,3 +348,120 @@ def test_bot_actions(mock_input, mock_bot_action, poker_game):
 
     # Make sure the bets were processed
     assert game.pot > 0
+
+
+def test_hand_masks_follow_the_board(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    assert all(len(game.hand_masks[player]) == 2 for player in game.players)
+
+    game.betting_round_complete = True
+    game.play_round()
+    for player in game.hands:
+        assert sorted(game.hand_masks[player].cards()) == sorted(
+            HandEvaluator.encode_cards(game.hands[player] + game.community_cards)
+        )
+
+
+def test_bot_strength_is_memoized_within_a_street(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    game.betting_round_complete = True
+    game.play_round()
+
+    with patch.object(game, "_compute_bot_hand_strength", return_value=0.5) as compute:
+        game._evaluate_bot_hand_strength("Bot1")
+        game._evaluate_bot_hand_strength("Bot1")
+        assert compute.call_count == 1
+
+        game.betting_round_complete = True
+        game.play_round()
+        game._evaluate_bot_hand_strength("Bot1")
+        assert compute.call_count == 2
+
+
+def test_tied_hands_split_the_pot(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    game.hands = {"User": ["2C", "3D"], "Bot1": ["2D", "3C"], "Bot2": ["4H", "5H"]}
+    game.community_cards = ["AS", "KS", "QS", "JS", "TS"]  # Royal flush on the board plays for everyone
+    chips_before = dict(game.chips)
+    game.pot = 301
+
+    game.determine_winner()
+
+    assert sorted(game.last_winners) == ["Bot1", "Bot2", "User"]
+    gains = sorted(game.chips[player] - chips_before[player] for player in game.players)
+    assert gains == [100, 100, 101]
+    assert sum(game.chips.values()) == sum(chips_before.values()) + 301
+
+
+def test_kicker_decides_the_showdown(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    game.hands = {"User": ["AS", "QD"], "Bot1": ["AH", "KC"]}
+    game.community_cards = ["AD", "7C", "5H", "3S", "2D"]
+    assert game.determine_winner() == "Bot1"
+    assert game.last_winners == ["Bot1"]
+
+
+def test_replaced_hole_cards_rebuild_the_hand_mask(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    game.hands = {"User": ["4C", "5C"], "Bot1": ["KH", "JC"]}
+    game.community_cards = ["KD", "9C", "7H", "3S", "2D"]
+    for player in game.hands:
+        game._hand_mask(player)
+
+    # Same number of cards, different hand: the cached mask must not be reused
+    game.hands["User"] = ["AS", "AH"]
+    assert game.determine_winner() == "User"
+
+
+def test_bot_reads_heads_up_spots_against_its_opponent_range(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    game.hands = {"User": ["9C", "9D"], "Bot1": ["QH", "QD"]}
+    game.community_cards = ["AS", "KD", "7C", "2H", "3S"]
+    game.hand_masks = {}
+
+    game.opponent_ranges["Bot1"] = "AA, KK"
+    assert game._compute_bot_hand_strength("Bot1") == 0.0
+    game.opponent_ranges["Bot1"] = "JJ-88"
+    assert game._compute_bot_hand_strength("Bot1") == 1.0
+
+
+def test_restore_returns_to_a_snapshot(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    snapshot = game.snapshot()
+    state = (dict(game.hands), dict(game.chips), game.pot, game.current_stage)
+
+    game._apply_action("User", "raise")
+    game.betting_round_complete = True
+    game.play_round()
+    assert game.community_cards
+
+    game.restore(snapshot)
+    assert (game.hands, game.chips, game.pot, game.current_stage) == state
+    assert game.community_cards == []
+    assert all(len(game.hand_masks[player]) == 2 for player in game.hands)
+    # A snapshot can be restored any number of times
+    game.betting_round_complete = True
+    game.play_round()
+    game.restore(snapshot)
+    assert game.community_cards == []
+
+
+def test_undo_action_reverts_in_reverse_order(poker_game):
+    game = poker_game
+    game.start_new_hand()
+    before = game.snapshot()
+
+    tokens = [game.apply_action("User", "raise"), game.apply_action("Bot1", "call"), game.apply_action("Bot2", "fold")]
+    assert "Bot2" not in game.hands
+    for token in reversed(tokens):
+        game.undo_action(token)
+
+    assert game.snapshot() == before
+    assert list(game.hands) == game.players
@@ -0,0 +1,120 @@
+# Tests for the hand state machine and the game events
+from game_events import STAGE_LABELS, TRANSITIONS, ActionTaken, HandStarted, Showdown, Stage, StreetDealt
+from game_logic import TexasHoldEmGame
+
+
+def check_or_call(game, player="User"):
+    return "call" if game.current_bet > game.player_bets[player] else "check"
+
+
+def calling_game():
+    """A game where every seat checks or calls."""
+    return TexasHoldEmGame(
+        user_action_source=check_or_call,
+        bot_policies={"Bot1": check_or_call, "Bot2": check_or_call},
+        messages_enabled=False,
+    )
+
+
+def play_to_showdown(game):
+    """Play the current hand with everyone checking or calling, without emitting actions."""
+    while not game.hand_complete:
+        for player in list(game.hands):
+            game.apply_action(player, check_or_call(game, player))
+        game.betting_round_complete = True
+        game.play_round()
+
+
+def test_transition_table_walks_every_stage_in_order():
+    stage, dealt = Stage.PRE_FLOP, []
+    while stage in TRANSITIONS:
+        next_stage, cards = TRANSITIONS[stage]
+        assert next_stage == stage + 1
+        if cards is not None:
+            dealt.extend(range(13)[cards])
+        stage = next_stage
+    assert stage == Stage.COMPLETE
+    # The board is the five deck cards after the six hole cards and two unused ones
+    assert dealt == [8, 9, 10, 11, 12]
+    assert [stage.label for stage in Stage] == list(STAGE_LABELS)
+
+
+def test_current_stage_label_tracks_the_enum():
+    game = TexasHoldEmGame(messages_enabled=False)
+    assert game.current_stage is None
+    game.start_new_hand(seed=1)
+    assert game.stage == Stage.PRE_FLOP and game.current_stage == "pre-flop"
+    game.current_stage = "turn"
+    assert game.stage == Stage.TURN
+
+
+def test_a_hand_emits_events_in_order():
+    game = calling_game()
+    events = []
+    game.subscribe(events.append)
+    game.start_new_hand(seed=7)
+    hands = {player: tuple(cards) for player, cards in game.hands.items()}
+    game.play_hand()
+
+    dealer = game.players[game.dealer_position]
+    chips = dict.fromkeys(game.players, 1000)
+    assert events[0] == HandStarted(dealer, tuple(game.players), 7, (10, 20), chips, hands)
+    blinds = events[1:3]
+    assert [(event.action, event.amount, event.total) for event in blinds] == [
+        ("small_blind", 10, 10),
+        ("big_blind", 20, 20),
+    ]
+    streets = [event for event in events if isinstance(event, StreetDealt)]
+    assert [event.stage for event in streets] == [Stage.FLOP, Stage.TURN, Stage.RIVER]
+    assert [len(event.cards) for event in streets] == [3, 1, 1]
+    assert streets[-1].board == tuple(game.community_cards)
+
+    showdown = events[-1]
+    assert isinstance(showdown, Showdown)
+    assert showdown.winners == tuple(game.last_winners)
+    assert showdown.pot == game.pot == 60
+    assert showdown.hands == hands
+    assert showdown.chips == game.chips
+    # Actions carry the street they were taken on and the bet they leave the player with
+    actions = [event for event in events if isinstance(event, ActionTaken)]
+    assert [event.stage for event in actions] == sorted(event.stage for event in actions)
+    assert all(event.total == 20 for event in actions if event.action == "call")
+
+
+def test_fold_out_ends_with_the_winner_alone():
+    game = TexasHoldEmGame(messages_enabled=False)
+    showdowns = []
+    game.subscribe(showdowns.append, Showdown)
+    game.start_new_hand(seed=3)
+    game.apply_action("User", "fold")
+    game.apply_action("Bot1", "fold")
+    game.play_round()
+    assert showdowns == [Showdown(("Bot2",), game.pot, {"Bot2": tuple(game.hands["Bot2"])}, game.chips)]
+
+
+def test_subscriptions_filter_by_type_and_can_be_removed():
+    game = TexasHoldEmGame(messages_enabled=False)
+    streets, everything = [], []
+    unsubscribe = game.subscribe(streets.append, StreetDealt)
+    game.subscribe(everything.append)
+    game.start_new_hand(seed=11)
+    play_to_showdown(game)
+    assert len(streets) == 3
+    assert all(isinstance(event, StreetDealt) for event in streets)
+
+    unsubscribe()
+    count = len(everything)
+    game.start_new_hand(seed=12)
+    play_to_showdown(game)
+    assert len(streets) == 3
+    assert len(everything) > count
+
+
+def test_subscribers_do_not_change_the_game():
+    quiet = TexasHoldEmGame(messages_enabled=False)
+    watched = TexasHoldEmGame(messages_enabled=False)
+    watched.subscribe(lambda event: None)
+    for game in (quiet, watched):
+        game.start_new_hand(seed=21)
+        play_to_showdown(game)
+    assert quiet.snapshot() == watched.snapshot()
@@ -0,0 +1,45 @@
+# Tests for recording and replaying TexasHoldEmGame hands
+from game_logic import TexasHoldEmGame
+from hand_history import HandHistoryReader, HandHistoryWriter, replay_texas_holdem
+from simulator import SelfPlaySimulator, always_call, always_raise, make_threshold_policy
+
+
+def record_hands(path, num_hands, seed):
+    policies = {"User": make_threshold_policy(), "Bot1": always_raise, "Bot2": always_call}
+    simulator = SelfPlaySimulator(policies, seed=seed)
+    with HandHistoryWriter(path) as writer:
+        simulator.game.subscribe(writer)
+        simulator.run(num_hands)
+    return simulator
+
+
+def test_every_hand_is_recorded(tmp_path):
+    path = str(tmp_path / "hands.bin")
+    record_hands(path, 50, seed=1)
+    with HandHistoryReader(path) as reader:
+        assert len(reader) == 50
+        hand = reader[0]
+    assert [seat.name for seat in hand.seats] == ["User", "Bot1", "Bot2"]
+    assert all(len(seat.hole_cards) == 2 for seat in hand.seats)
+    assert [action.action for action in hand.actions[:2]] == ["small_blind", "big_blind"]
+    assert sum(seat.ending_chips for seat in hand.seats) == sum(seat.starting_chips for seat in hand.seats)
+
+
+def test_replay_reproduces_recorded_stacks_and_board(tmp_path):
+    path = str(tmp_path / "hands.bin")
+    record_hands(path, 100, seed=2)
+    with HandHistoryReader(path) as reader:
+        for hand in reader:
+            game = replay_texas_holdem(hand, TexasHoldEmGame(messages_enabled=False))
+            assert game.hand_complete
+            assert [game.chips[seat.name] for seat in hand.seats] == [seat.ending_chips for seat in hand.seats]
+            assert game.community_cards == [game.deck[8 + i] for i in range(len(hand.board))]
+
+
+def test_seeded_hands_deal_the_same_cards():
+    game = TexasHoldEmGame(messages_enabled=False)
+    game.start_new_hand(seed=11)
+    first = list(game.deck)
+    game.start_new_hand(seed=11)
+    assert game.deck == first
+    assert game.hand_seed == 11
@@ -0,0 +1,83 @@
+# Tests for the background game worker
+import threading
+
+from game_events import ActionTaken, Stage
+from game_logic import TexasHoldEmGame
+from game_worker import GameWorker
+
+
+def drain(worker):
+    """Collect updates until the worker finishes its current command."""
+    updates = [worker.updates.get(timeout=10)]
+    while updates[-1].busy:
+        updates.append(worker.updates.get(timeout=10))
+    return updates
+
+
+def test_worker_publishes_each_step_of_a_command():
+    game = TexasHoldEmGame(bot_policies={"Bot1": lambda g, p: "call", "Bot2": lambda g, p: "call"})
+    worker = GameWorker(game)
+    worker.start()
+    worker.submit("start")
+    start = drain(worker)
+    worker.submit("call")
+    bets = drain(worker)
+    worker.stop(timeout=10)
+
+    assert start[-1].snapshot.stage == Stage.PRE_FLOP
+    # Updates arrive per action and board, then a final idle one with the end state
+    assert len(bets) >= 4
+    assert all(update.busy for update in bets[:-1])
+    assert bets[-1].snapshot == game.snapshot()
+    assert game.current_stage == "flop"
+
+
+def test_user_fold_is_published_as_an_action():
+    game = TexasHoldEmGame(bot_policies={"Bot1": lambda g, p: "call", "Bot2": lambda g, p: "call"})
+    actions = []
+    game.subscribe(actions.append, ActionTaken)
+    worker = GameWorker(game)
+    worker.start()
+    worker.submit("start")
+    drain(worker)
+    worker.submit("fold")
+    drain(worker)
+    worker.stop(timeout=10)
+
+    folds = [event for event in actions if event.player == "User" and event.action == "fold"]
+    assert len(folds) == 1 and folds[0].stage == Stage.PRE_FLOP
+    assert "User" not in game.hands
+
+
+def test_bot_decisions_run_off_the_calling_thread():
+    threads = set()
+
+    def policy(game, player):
+        threads.add(threading.get_ident())
+        return "call"
+
+    worker = GameWorker(TexasHoldEmGame(bot_policies={"Bot1": policy, "Bot2": policy}))
+    worker.start()
+    worker.submit("start")
+    worker.submit("call")
+    drain(worker)
+    drain(worker)
+    worker.stop(timeout=10)
+    assert threads and threading.get_ident() not in threads
+
+
+def test_errors_are_reported_and_the_worker_keeps_running():
+    def broken(game, player):
+        raise ValueError("bad policy")
+
+    worker = GameWorker(TexasHoldEmGame(bot_policies={"Bot1": broken, "Bot2": broken}))
+    worker.start()
+    worker.submit("start")
+    drain(worker)
+    worker.submit("call")
+    failed = drain(worker)[-1]
+    assert isinstance(failed.error, ValueError)
+
+    worker.submit("continue")
+    assert drain(worker)[-1].error is None
+    worker.stop(timeout=10)
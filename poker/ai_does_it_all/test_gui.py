@@ -0,0 +1,109 @@
+# Tests for the text CLI's diff-based terminal renderer
+import io
+import os
+import random
+from unittest.mock import patch
+
+import gui
+from game_logic import TexasHoldEmGame
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_first_frame_clears_and_later_frames_rewrite_changed_lines():
+    stream = CountingStream()
+    renderer = gui.TerminalRenderer(stream)
+    renderer.render(["pot 30", "stage PRE-FLOP", "Bot1 1000"])
+    assert stream.getvalue().startswith("\033[H\033[2J")
+
+    stream.seek(0)
+    stream.truncate()
+    renderer.render(["pot 50", "stage PRE-FLOP", "Bot1 980"])
+    output = stream.getvalue()
+    assert "\033[1;1Hpot 50\033[K" in output
+    assert "\033[3;1HBot1 980\033[K" in output
+    assert "PRE-FLOP" not in output
+    # One buffered write and flush per frame
+    assert (stream.writes, stream.flushes) == (2, 2)
+
+
+def test_shorter_frames_clear_below():
+    stream = io.StringIO()
+    renderer = gui.TerminalRenderer(stream)
+    renderer.render(["a", "b", "c"])
+    renderer.render(["a"])
+    assert stream.getvalue().endswith("\033[2;1H\033[J")
+
+
+def test_fast_forward_skips_intermediate_frames():
+    stream = io.StringIO()
+    renderer = gui.TerminalRenderer(stream, fast_forward=True)
+    renderer.render(["start"])
+    assert not renderer.render(["bots act"], intermediate=True)
+    assert renderer.render(["result"])
+    assert "bots act" not in stream.getvalue()
+    assert (renderer.frames_drawn, renderer.frames_skipped) == (2, 1)
+
+
+def test_table_lines_include_the_message():
+    game = TexasHoldEmGame()
+    game.start_new_hand()
+    lines = gui.table_lines(game)
+    assert lines[-1] == game.message
+    assert any("Current Pot:" in line and "$30" in line for line in lines)
+
+
+def test_folding_fast_forwards_to_the_result(capsys):
+    random.seed(4)
+    answers = iter(["fold", "n"])
+    with patch("builtins.input", lambda prompt="": next(answers)), patch.object(
+        gui.TerminalRenderer, "render", autospec=True, side_effect=gui.TerminalRenderer.render
+    ) as render:
+        gui.start_game(fast_forward=True)
+
+    renderers = {call.args[0] for call in render.call_args_list}
+    assert len(renderers) == 1
+    renderer = renderers.pop()
+    # Frames follow the game's events; after the fold only the result is drawn
+    intermediate = [call.args[2] for call in render.call_args_list]
+    folded_at = intermediate.index(True)
+    assert intermediate[folded_at:] == [True] * (len(intermediate) - folded_at - 1) + [False]
+    assert renderer.frames_skipped == len(intermediate) - folded_at - 1 > 0
+    assert renderer.frames_drawn == folded_at + 1
+    assert "Thanks for playing" in capsys.readouterr().out
+
+
+def test_frames_that_would_scroll_are_redrawn_in_full():
+    frame = [f"line {i}" for i in range(28)]
+    changed = frame[:-1] + ["last line changed"]
+
+    stream = io.StringIO()
+    renderer = gui.TerminalRenderer(stream, rows=30)
+    renderer.render(frame)
+    stream.seek(0)
+    stream.truncate()
+    renderer.render(changed)
+    assert stream.getvalue().startswith("\033[H\033[2J")
+    assert "line 0\n" in stream.getvalue()
+
+    # A tall enough terminal gets the diff; the default measures the terminal
+    stream = io.StringIO()
+    with patch("shutil.get_terminal_size", return_value=os.terminal_size((80, 50))):
+        renderer = gui.TerminalRenderer(stream)
+        renderer.render(frame)
+        stream.seek(0)
+        stream.truncate()
+        renderer.render(changed)
+    assert stream.getvalue() == "\033[28;1Hlast line changed\033[K\033[29;1H\033[J"
@@ -0,0 +1,129 @@
+# Tests for PygameGUI's retained-mode rendering, run on SDL's headless video driver
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+import gui_pygame  # noqa: E402
+
+
+@pytest.fixture
+def gui(tmp_path, monkeypatch):
+    monkeypatch.setattr(gui_pygame, "ATLAS_DIR", str(tmp_path / "cache"))
+    gui = gui_pygame.PygameGUI()
+    gui.game.start_game()
+    return gui
+
+
+def test_idle_frames_push_nothing(gui):
+    with patch("pygame.display.update") as update:
+        assert gui.update_display() == [gui.screen.get_rect()]
+        assert gui.update_display() == []
+        assert gui.update_display() == []
+    assert update.call_count == 1
+
+
+def test_only_changed_regions_are_redrawn(gui):
+    gui.update_display()
+    gui.game.pot += 40
+    assert gui.update_display() == [gui_pygame.TABLE_RECT]
+
+    gui.game.chips["Bot2"] -= 40
+    gui.game.message = "Bot2 raises to $60."
+    assert sorted(map(tuple, gui.update_display())) == sorted(
+        [tuple(gui_pygame.MESSAGE_RECT), tuple(gui_pygame.SEAT_RECTS["Bot2"])]
+    )
+
+    gui.needs_full_redraw = True
+    assert gui.update_display() == [gui.screen.get_rect()]
+
+
+def test_text_surfaces_are_cached(gui):
+    first = gui.render_text(gui.font, "POT: $30", gui_pygame.GOLD)
+    assert gui.render_text(gui.font, "POT: $30", gui_pygame.GOLD) is first
+    assert gui.render_text(gui.font, "POT: $30", gui_pygame.WHITE) is not first
+
+
+def test_clicks_map_to_buttons(gui):
+    for rect, action in gui.button_layout():
+        assert gui.action_at(rect.center) == action
+    assert gui.action_at((0, 0)) is None
+
+
+def test_incremental_frames_match_a_full_redraw(gui):
+    gui.update_display()
+    gui.game.betting_round_complete = True
+    gui.game.play_round()
+    gui.game.chips["Bot1"] -= 20
+    del gui.game.hands["Bot2"]
+    gui.update_display()
+    incremental = pygame.image.tostring(gui.screen, "RGB")
+
+    gui.needs_full_redraw = True
+    gui.update_display()
+    assert pygame.image.tostring(gui.screen, "RGB") == incremental
+
+
+def test_card_atlas_is_built_once_and_served_as_subsurfaces(tmp_path, monkeypatch):
+    monkeypatch.setattr(gui_pygame, "ATLAS_DIR", str(tmp_path / "cache"))
+    first = gui_pygame.PygameGUI()
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+    with patch("pygame.image.save") as save, patch.object(gui_pygame.PygameGUI, "_build_card_atlas") as build:
+        second = gui_pygame.PygameGUI()
+    save.assert_not_called()
+    build.assert_not_called()
+
+    atlas = second.card_back.get_parent()
+    assert all(image.get_parent() is atlas for image in second.card_images.values())
+    assert len(second.card_images) == 52
+    assert second.card_images["AS"].get_size() == (gui_pygame.CARD_WIDTH, gui_pygame.CARD_HEIGHT)
+    assert pygame.image.tostring(second.card_images["TH"], "RGBA") == pygame.image.tostring(
+        first.card_images["TH"], "RGBA"
+    )
+
+
+def test_atlas_path_follows_the_card_images(tmp_path):
+    assets = tmp_path / "cards"
+    assets.mkdir()
+    empty = gui_pygame.card_atlas_path(str(assets), "cache")
+    pygame.image.save(pygame.Surface((4, 6)), str(assets / "AS.png"))
+    # The key comes from the files' metadata; the images are only read to build the atlas
+    with patch("builtins.open", side_effect=AssertionError("card image read")):
+        saved = gui_pygame.card_atlas_path(str(assets), "cache")
+    assert saved != empty
+
+    stat = os.stat(assets / "AS.png")
+    os.utime(assets / "AS.png", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert gui_pygame.card_atlas_path(str(assets), "cache") not in (empty, saved)
+
+
+def test_frames_keep_running_while_bots_think(tmp_path, monkeypatch):
+    monkeypatch.setattr(gui_pygame, "ATLAS_DIR", str(tmp_path / "cache"))
+
+    def slow_bot(game, player):
+        time.sleep(0.15)
+        return "call"
+
+    gui = gui_pygame.PygameGUI(bot_policies={"Bot1": slow_bot, "Bot2": slow_bot})
+    gui.worker.start()
+    gui.worker.submit("start")
+    gui.apply_updates(wait=True)
+
+    gui.handle_user_action("call")
+    assert gui.button_layout() == []
+    frames = 0
+    while gui.busy:
+        gui.apply_updates()
+        gui.update_display()
+        frames += 1
+        time.sleep(0.01)
+    gui.worker.stop(timeout=10)
+
+    assert frames >= 10
+    assert gui.game.snapshot() == gui.worker.game.snapshot()
+    assert gui.button_layout()
@@ -0,0 +1,97 @@
+# Tests for the lookup-table hand evaluator
+import numpy as np
+import pytest
+from hand_evaluator import HandEvaluator
+from hand_tables import build_tables, decode_value, encode_value, straight_high
+
+
+def evaluate(cards):
+    return HandEvaluator.evaluate(HandEvaluator.encode_cards(cards))
+
+
+@pytest.mark.parametrize(
+    "hole, board, rank, description, high_card_values",
+    [
+        (["AS", "KS"], ["QS", "JS", "TS", "2D", "3C"], 9, "Royal Flush", [14]),
+        (["AH", "2H"], ["3H", "4H", "5H", "KD", "KC"], 8, "Straight Flush", [5]),
+        (["9C", "9D"], ["9H", "9S", "2C", "3D", "KH"], 7, "Four of a Kind", [9]),
+        (["7C", "7D"], ["7H", "KS", "KC", "KD", "2H"], 6, "Full House", [13, 7]),
+        (["7S", "KS"], ["2S", "9S", "JS", "5H", "7D"], 5, "Flush", [13, 11, 9, 7, 2]),
+        (["AC", "2D"], ["3H", "4S", "5C", "9D", "KH"], 4, "Straight", [5]),
+        (["8C", "9D"], ["TH", "JS", "QC", "QD", "2H"], 4, "Straight", [12]),
+        (["5C", "5D"], ["5H", "KS", "2C", "8D", "9H"], 3, "Three of a Kind", [5]),
+        (["5C", "5D"], ["KH", "KS", "2C", "2D", "9H"], 2, "Two Pair", [13, 5]),
+        (["AS", "AH"], ["JC", "QD", "8H", "5S", "7D"], 1, "One Pair", [14]),
+        (["AS", "3H"], ["JC", "QD", "8H", "5S", "7D"], 0, "High Card", [14, 12, 11, 8, 7]),
+    ],
+)
+def test_legacy_view(hole, board, rank, description, high_card_values):
+    result = HandEvaluator.evaluate_best_hand(hole, board)
+    assert result == {"rank": rank, "description": description, "high_card_values": high_card_values}
+
+
+def test_values_are_ordered_by_strength():
+    assert evaluate(["AS", "AH", "2C", "3D", "4H"]) > evaluate(["KS", "KH", "AC", "QD", "JH"])
+    assert evaluate(["AS", "AH", "KC", "3D", "4H"]) > evaluate(["AD", "AC", "QC", "JD", "9H"])
+    assert evaluate(["2C", "3D", "4H", "5S", "6C"]) > evaluate(["AC", "2D", "3H", "4S", "5C"])
+    assert evaluate(["2C", "3C", "4C", "5C", "7C"]) > evaluate(["TC", "JD", "QH", "KS", "AC"])
+
+
+def test_best_five_of_seven_ignores_extra_cards():
+    five = evaluate(["AS", "AH", "KC", "QD", "JH"])
+    seven = evaluate(["AS", "AH", "KC", "QD", "JH", "2C", "3D"])
+    assert five == seven
+
+
+def test_two_trips_make_a_full_house():
+    assert HandEvaluator.evaluate_best_hand(["AC", "AD"], ["AH", "KS", "KC", "KD", "2H"])["rank"] == 6
+
+
+def test_six_card_hands():
+    assert evaluate(["AS", "KS", "QS", "JS", "TS", "9S"]) == encode_value(8, [14])
+
+
+def test_value_round_trip():
+    assert decode_value(encode_value(1, [14, 13, 12, 11])) == (1, [14, 13, 12, 11])
+
+
+def test_straight_high_handles_wheel():
+    wheel = (1 << 12) | 0b1111
+    assert straight_high(wheel) == 5
+    assert straight_high(0b11110) == 0
+
+
+def test_tables_cover_all_rank_multisets():
+    flush_values, multiset_values = build_tables()
+    assert len(flush_values) == 8192
+    # Rank multisets of 1-7 cards with at most four of a rank
+    assert len(multiset_values) == 76154
+
+
+def test_evaluate_batch_matches_scalar_evaluation():
+    rng = np.random.default_rng(7)
+    cards = np.argsort(rng.random((2000, 52)), axis=1)[:, :7]
+    batch = HandEvaluator.evaluate_batch(cards[:, :2], cards[:, 2:])
+    assert batch.shape == (2000,)
+    assert batch.tolist() == [HandEvaluator.evaluate(hand) for hand in cards.tolist()]
+
+
+def test_evaluate_batch_with_partial_board():
+    hole = np.array([HandEvaluator.encode_cards(["AS", "KS"]), HandEvaluator.encode_cards(["2C", "7D"])])
+    flop = np.array([HandEvaluator.encode_cards(["QS", "JS", "TS"])] * 2)
+    strengths = HandEvaluator.evaluate_batch(hole, flop)
+    assert strengths[0] > strengths[1]
+    assert HandEvaluator.describe(int(strengths[0]))["description"] == "Royal Flush"
+
+
+def test_accepts_every_shared_card_format():
+    from cards import Card
+
+    strings = HandEvaluator.evaluate_best_hand(["TS", "JS"], ["QS", "KS", "AS"])
+    mixed = HandEvaluator.evaluate_best_hand(["10S", Card.parse("JS")], ["QS", "KS", 51])
+    assert strings == mixed
+
+
+def test_rank_showdown_groups_ties():
+    tiers = HandEvaluator.rank_showdown({"a": 5, "b": 9, "c": 9, "d": 1})
+    assert [sorted(tier) for tier in tiers] == [["b", "c"], ["a"], ["d"]]
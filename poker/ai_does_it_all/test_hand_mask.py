@@ -0,0 +1,50 @@
+# Tests for the bitmask hand representation
+import random
+
+import pytest
+from hand_evaluator import HandEvaluator
+from hand_mask import HandMask
+
+
+def test_value_matches_evaluator():
+    rng = random.Random(8)
+    for _ in range(500):
+        cards = rng.sample(range(52), 7)
+        assert HandMask(cards).value() == HandEvaluator.evaluate(cards)
+
+
+def test_incremental_add_and_remove():
+    hand = HandMask(["AS", "KS"])
+    hand.add("QS")
+    hand.add("JS")
+    hand.add("2D")
+    assert hand.flush_suit() == -1
+    hand.add("TS")
+    assert hand.flush_suit() == 3
+    assert hand.straight_flush_high() == 14
+    hand.remove("TS")
+    assert hand.straight_flush_high() == 0
+    assert hand == HandMask(["2D", "JS", "QS", "KS", "AS"])
+    assert len(hand) == 5
+
+
+def test_wheel_straight():
+    hand = HandMask(["AC", "2D", "3H", "4S", "5C", "KD"])
+    assert hand.straight_high() == 5
+    assert hand.flush_suit() == -1
+
+
+def test_copy_is_independent():
+    hand = HandMask(["AC", "AD"])
+    clone = hand.copy()
+    clone.add("AH")
+    assert "AH" in clone
+    assert "AH" not in hand
+
+
+def test_duplicate_and_missing_cards_raise():
+    hand = HandMask(["AC"])
+    with pytest.raises(ValueError):
+        hand.add("AC")
+    with pytest.raises(ValueError):
+        hand.remove("2C")
@@ -0,0 +1,76 @@
+# Tests for the anytime MCTS bot policy
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from cards import CARD_STRINGS
+from game_events import ActionTaken
+from game_logic import TexasHoldEmGame
+from mcts import MCTSPolicy, _search_shard
+
+
+def river_spot(bot_cards, board):
+    others = [card for card in CARD_STRINGS if card not in bot_cards and card not in board]
+    # Bot1 is dealt cards 2-3 of the deck and the board comes from cards 8-12
+    deck = others[:2] + list(bot_cards) + others[2:6] + list(board)
+    game = TexasHoldEmGame(messages_enabled=False)
+    game.start_new_hand(deck=deck)
+    for _ in range(3):
+        game.betting_round_complete = True
+        game.play_round()
+    return game
+
+
+def test_search_leaves_the_game_untouched():
+    game = river_spot(["7C", "2D"], ["AS", "KD", "9H", "5C", "3S"])
+    events = []
+    game.subscribe(events.append, ActionTaken)
+    before = game.snapshot()
+
+    action = MCTSPolicy(budget=None, seed=1, max_iterations=200)(game, "Bot1")
+
+    assert action in ("check", "raise")
+    assert game.snapshot() == before
+    assert events == []
+
+
+def test_nut_hand_raises_and_stats_are_reported():
+    game = river_spot(["AH", "AC"], ["AS", "AD", "KH", "7C", "2D"])
+    policy = MCTSPolicy(budget=None, seed=5, max_iterations=1500)
+
+    assert policy(game, "Bot1") == "raise"
+    actions = policy.last_actions
+    assert actions["raise"].mean > actions["check"].mean > 0
+    stats = policy.last_stats
+    assert stats.iterations == 1500
+    assert stats.tree_size > len(actions)
+    assert stats.searches_per_second > 0
+
+
+def test_budget_bounds_the_decision_time():
+    game = river_spot(["7C", "2D"], ["AS", "KD", "9H", "5C", "3S"])
+    policy = MCTSPolicy(budget=0.02, seed=2)
+    policy(game, "Bot1")
+    assert policy.last_stats.iterations >= 1
+    assert policy.last_stats.elapsed < 0.2
+
+
+def test_policy_needs_a_budget_or_iteration_cap():
+    with pytest.raises(ValueError):
+        MCTSPolicy(budget=None)
+
+
+def test_search_is_reproducible_from_its_seed():
+    game = river_spot(["QH", "JH"], ["TH", "9H", "2C", "4D", "KS"])
+    snapshot = game.snapshot()
+    first = _search_shard(snapshot, "Bot1", 0, seed=9, max_iterations=300)
+    second = _search_shard(snapshot, "Bot1", 0, seed=9, max_iterations=300)
+    assert first == second
+
+
+def test_root_parallel_search_sums_worker_trees():
+    game = river_spot(["QH", "JH"], ["TH", "9H", "2C", "4D", "KS"])
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        policy = MCTSPolicy(budget=None, workers=2, seed=4, executor=executor, max_iterations=100)
+        policy(game, "Bot1")
+    assert policy.last_stats.iterations == 200
+    assert sum(result.visits for result in policy.last_actions.values()) == 200
@@ -0,0 +1,40 @@
+# Tests for the preflop equity table
+import pytest
+from preflop import HAND_CLASSES, MAX_OPPONENTS, hand_class, load_table, preflop_equity, write_table
+
+
+def test_169_starting_hand_classes():
+    assert len(HAND_CLASSES) == 169
+    assert len(set(HAND_CLASSES)) == 169
+    assert sum(1 for name in HAND_CLASSES if len(name) == 2) == 13
+
+
+def test_hand_class_ignores_card_order_and_specific_suits():
+    assert hand_class(["AS", "KS"]) == hand_class(["KH", "AH"]) == HAND_CLASSES.index("AKs")
+    assert hand_class(["AS", "KD"]) == HAND_CLASSES.index("AKo")
+    assert hand_class(["7C", "7D"]) == HAND_CLASSES.index("77")
+
+
+def test_shipped_table_is_sensible():
+    assert preflop_equity(["AS", "AH"], 1) == pytest.approx(0.85, abs=0.01)
+    assert preflop_equity(["AS", "AH"], 1) > preflop_equity(["AS", "AH"], 9)
+    assert preflop_equity(["7C", "2D"], 2) < preflop_equity(["AS", "KS"], 2)
+
+
+def test_table_round_trip(tmp_path):
+    path = str(tmp_path / "table.bin")
+    values = [i / 10000 for i in range(169 * MAX_OPPONENTS)]
+    write_table(values, path)
+    assert list(load_table(path)) == pytest.approx(values)
+    # Written through a temporary file, so an interrupted build never leaves a partial table
+    assert [entry.name for entry in tmp_path.iterdir()] == ["table.bin"]
+    assert load_table(str(tmp_path / "missing.bin")) is None
+
+
+def test_truncated_table_is_ignored(tmp_path):
+    path = tmp_path / "table.bin"
+    write_table([0.5] * (169 * MAX_OPPONENTS), str(path))
+    data = path.read_bytes()
+    for size in (0, 5, len(data) - 4):
+        path.write_bytes(data[:size])
+        assert load_table(str(path)) is None
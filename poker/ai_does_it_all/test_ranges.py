@@ -0,0 +1,134 @@
+# Tests for the range-vs-range equity matrix
+import numpy as np
+import pytest
+from equity import exact_equity
+from hand_evaluator import HandEvaluator
+from ranges import (
+    COMBOS,
+    NUM_COMBOS,
+    blocked_combos,
+    combo_index,
+    equity_matrix,
+    normalize_range,
+    parse_range,
+    range_combos,
+    range_vs_range,
+)
+
+
+def test_combo_indexing():
+    assert len(COMBOS) == NUM_COMBOS
+    assert combo_index(["2C", "2D"]) == 0
+    assert combo_index(["AS", "AH"]) == combo_index(["AH", "AS"]) == NUM_COMBOS - 1
+    assert blocked_combos(["AS"]).sum() == 51
+
+
+@pytest.mark.parametrize(
+    "board",
+    [["AS", "KD", "7C", "2H", "9S"], ["AS", "KD", "7C", "2H"], ["QS", "JS", "4S"]],
+)
+def test_rows_match_exact_equity(board):
+    matrix = equity_matrix(board)
+    for hole in (["QH", "JH"], ["7D", "7H"], ["AD", "2S"] if "AD" not in board else ["AC", "2S"]):
+        if blocked_combos(board)[combo_index(hole)]:
+            continue
+        i = combo_index(hole)
+        row = matrix.equity[i][matrix.valid[i]]
+        assert row.mean() == pytest.approx(exact_equity(hole, board).equity, abs=1e-5)
+
+
+def test_matrix_is_zero_sum_and_respects_blockers():
+    board = ["AS", "KD", "7C", "2H"]
+    matrix = equity_matrix(board, dead_cards=["3C"])
+    assert np.allclose(matrix.equity + matrix.equity.T, matrix.valid)
+    assert not matrix.valid[combo_index(["AS", "QH"])].any()
+    assert not matrix.valid[combo_index(["3C", "QH"])].any()
+    # Two combos sharing a card can't face each other
+    assert not matrix.valid[combo_index(["QH", "JH"]), combo_index(["QH", "TD"])]
+    assert matrix.equity[~matrix.valid].max() == 0.0
+
+
+def test_dead_cards_change_the_runouts():
+    board = ["AS", "KD", "7C", "2H"]
+    live = equity_matrix(board)
+    dead = equity_matrix(board, dead_cards=["TC", "TS"])
+    i, j = combo_index(["QH", "JH"]), combo_index(["7D", "7H"])
+    assert dead.equity[i, j] < live.equity[i, j]
+
+
+def test_range_vs_range_is_a_weighted_matrix_product():
+    board = ["AS", "KD", "7C", "2H", "9S"]
+    hero = np.zeros(NUM_COMBOS)
+    hero[combo_index(["QH", "JH"])] = 1.0
+    everyone = np.ones(NUM_COMBOS)
+    assert range_vs_range(hero, everyone, board) == pytest.approx(exact_equity(["QH", "JH"], board).equity, abs=1e-5)
+    # A range against itself is a coin flip
+    assert range_vs_range(everyone, everyone, board) == pytest.approx(0.5, abs=1e-5)
+    # Nothing left to play against
+    assert range_vs_range(hero, hero, board) == 0.0
+
+
+def test_board_validation():
+    with pytest.raises(ValueError):
+        equity_matrix(["AS", "KD"])
+    with pytest.raises(ValueError):
+        equity_matrix(["AS", "KD", "7C"], dead_cards=["AS"])
+
+
+@pytest.mark.parametrize(
+    "text, count",
+    [
+        ("TT+", 30),
+        ("TT-77", 24),
+        ("AKs", 4),
+        ("KQo", 12),
+        ("AK", 16),
+        ("ATs+", 16),
+        ("A5s-A2s", 16),
+        ("76s-54s", 12),
+        ("AsKs", 1),
+        ("random", 1326),
+        ("TT+, AKs, KQo, 76s-54s", 58),
+    ],
+)
+def test_parse_range_combo_counts(text, count):
+    assert int((parse_range(text) > 0).sum()) == count
+
+
+def test_normalized_spellings_share_one_expansion():
+    assert normalize_range(" tt+ , ka s,77-TT, asks:0.50 ") == "TT+,AKs,TT-77,AsKs:0.5"
+    assert parse_range("AKs, TT+") is parse_range("AKs,TT+")
+    assert parse_range("ak s,tt+") is parse_range("AKs, TT+")
+    with pytest.raises(ValueError):
+        parse_range("AKs")[0] = 1.0
+
+
+def test_weights_and_overrides():
+    weights = parse_range("QQ+, AA:0.25, AKs:0.5")
+    assert weights[combo_index(["AS", "AH"])] == 0.25
+    assert weights[combo_index(["QS", "QH"])] == 1.0
+    assert weights[combo_index(["AS", "KS"])] == 0.5
+    assert weights[combo_index(["AS", "KH"])] == 0.0
+
+
+def test_board_and_dead_cards_block_combos():
+    weights = parse_range("AA, KK", board=["AS", "7C", "2D"], dead_cards=["KH"])
+    assert int((weights > 0).sum()) == 6
+    combos = range_combos(weights)
+    assert ("AD", "AH") in combos
+    assert not any("AS" in combo or "KH" in combo for combo in combos)
+
+
+@pytest.mark.parametrize("text", ["AKx", "AAs", "AK-Q", "T9s-84s", "AKs:2"])
+def test_invalid_ranges(text):
+    with pytest.raises(ValueError):
+        parse_range(text)
+
+
+def test_hand_evaluator_equity_vs_range():
+    board = ["AS", "KD", "7C", "2H", "3S"]
+    assert HandEvaluator.equity_vs_range(["QH", "QD"], "AA, KK", board) == 0.0
+    assert HandEvaluator.equity_vs_range(["QH", "QD"], "QQ", board) == pytest.approx(0.5)
+    assert HandEvaluator.equity_vs_range(["QH", "QD"], "random", board) == pytest.approx(
+        exact_equity(["QH", "QD"], board).equity, abs=1e-5
+    )
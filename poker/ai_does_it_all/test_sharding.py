@@ -0,0 +1,26 @@
+# Tests for the seeded shard helpers
+from concurrent.futures import ThreadPoolExecutor
+
+from sharding import round_sizes, run_shards, shard_pool, shard_seed
+
+
+def test_round_sizes_give_each_worker_a_shard():
+    assert round_sizes(10, 3, workers=2) == [3, 3]
+    assert round_sizes(4, 3, workers=2) == [3, 1]
+    assert round_sizes(4, 3, workers=0) == [3]
+    assert round_sizes(0, 3, workers=2) == []
+
+
+def test_shard_seeds_are_distinct_per_run_and_shard():
+    seeds = {shard_seed(seed, index) for seed in range(3) for index in range(100)}
+    assert len(seeds) == 300
+
+
+def test_run_shards_keeps_shard_order():
+    args = [(index, shard_seed(7, index)) for index in range(5)]
+    in_process = run_shards(pow, args)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert run_shards(pow, args, executor) == in_process
+    with shard_pool(1) as pool:
+        assert pool is None
+        assert run_shards(pow, args, pool) == in_process
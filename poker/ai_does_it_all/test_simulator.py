@@ -0,0 +1,34 @@
+# Tests for headless self-play
+import pytest
+from game_logic import TexasHoldEmGame
+from simulator import SelfPlaySimulator, always_call, always_raise, make_threshold_policy
+
+
+def test_run_reports_every_seat_and_stage():
+    report = SelfPlaySimulator({"Bot1": always_call, "Bot2": make_threshold_policy()}, seed=3).run(200)
+    assert report.hands == 200
+    assert report.hands_per_second > 0
+    assert set(report.seat_results) == {"User", "Bot1", "Bot2"}
+    for result in report.seat_results.values():
+        assert result.ci_low <= result.mean <= result.ci_high
+    assert report.stage_seconds["pre-flop"] > 0
+    assert "hands/s" in report.summary()
+
+
+def test_chips_are_conserved_between_calling_stations():
+    report = SelfPlaySimulator({"Bot1": always_call, "Bot2": always_call}, seed=4).run(300)
+    assert sum(result.mean for result in report.seat_results.values()) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_same_seed_gives_same_results():
+    policies = {"User": always_raise, "Bot1": always_call, "Bot2": make_threshold_policy()}
+    first = SelfPlaySimulator(policies, seed=5).run(100)
+    second = SelfPlaySimulator(policies, seed=5).run(100)
+    assert first.seat_results == second.seat_results
+
+
+def test_user_action_source_replaces_input():
+    game = TexasHoldEmGame(user_action_source=lambda game: "fold", messages_enabled=False)
+    game.start_new_hand()
+    assert game.get_user_action() == "fold"
+    assert game.message == "Welcome to Texas Hold'Em!"
@@ -0,0 +1,182 @@
+# Compact integer cards shared by the poker engines
+#
+# A card is an integer 0-51: rank_index * 4 + suit_index, with rank_index 0-12 for 2..A
+# and suit_index 0-3 for clubs, diamonds, hearts, spades. Sets of cards are 52-bit masks
+# with bit `card` set.
+import random
+
+RANKS = "23456789TJQKA"
+SUITS = "CDHS"
+SUIT_NAMES = ["Clubs", "Diamonds", "Hearts", "Spades"]
+
+
+class Card(int):
+    """An integer card with cached display strings.
+
+    The 52 instances are created once; use Card.parse or the from_* helpers to get them.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return CARD_STRINGS[self]
+
+    def __repr__(self):
+        return CARD_REPRS[self]
+
+    @property
+    def rank(self):
+        """Rank index 0-12 (2..A)."""
+        return self >> 2
+
+    @property
+    def suit(self):
+        """Suit index 0-3 (C, D, H, S)."""
+        return self & 3
+
+    @property
+    def value(self):
+        """Card value 2-14 as used by the hand evaluators."""
+        return (self >> 2) + 2
+
+    @property
+    def bit(self):
+        """This card's bit in a 52-bit card mask."""
+        return 1 << self
+
+    @staticmethod
+    def parse(card):
+        """Convert "AS", "10S", "TS", an int or a Card to the shared Card instance."""
+        return CARD_LOOKUP[card]
+
+    @staticmethod
+    def from_gemini(card):
+        """Convert a gemini Card(suit="Hearts", rank="T") to the shared Card instance."""
+        return GEMINI_LOOKUP[card.suit, card.rank]
+
+    def to_legacy(self):
+        """Two-character string used by ai_does_it_all ("TS")."""
+        return CARD_STRINGS[self]
+
+    def to_test_driven(self):
+        """String used by test_driven_approach ("10S")."""
+        return TEST_DRIVEN_STRINGS[self]
+
+
+CARD_STRINGS = [f"{RANKS[c >> 2]}{SUITS[c & 3]}" for c in range(52)]
+CARD_REPRS = [f"Card('{name}')" for name in CARD_STRINGS]
+TEST_DRIVEN_STRINGS = [name.replace("T", "10", 1) if name[0] == "T" else name for name in CARD_STRINGS]
+
+DECK = tuple(Card(c) for c in range(52))
+
+# One dict answers every supported format; ints and Cards hash alike
+CARD_LOOKUP = {}
+for _card in DECK:
+    CARD_LOOKUP[int(_card)] = _card
+    CARD_LOOKUP[CARD_STRINGS[_card]] = _card
+    CARD_LOOKUP[TEST_DRIVEN_STRINGS[_card]] = _card
+
+GEMINI_LOOKUP = {}
+for _card in DECK:
+    for _rank in {RANKS[_card >> 2], TEST_DRIVEN_STRINGS[_card][:-1]}:
+        GEMINI_LOOKUP[SUIT_NAMES[_card & 3], _rank] = _card
+del _card, _rank
+
+
+def parse_cards(cards):
+    """Convert an iterable of cards in any supported format to shared Card instances."""
+    return [CARD_LOOKUP[card] for card in cards]
+
+
+def cards_to_mask(cards):
+    """Build a 52-bit mask from integer cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+
+def mask_to_cards(mask):
+    """List the Card instances set in a 52-bit mask, lowest first."""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(DECK[low.bit_length() - 1])
+        mask ^= low
+    return cards
+
+
+class ArrayDeck:
+    """A reusable deck that deals by partial Fisher-Yates.
+
+    The 52 Card instances live in one list that is never rebuilt. Each deal swaps a
+    random undealt card into the next dealt position, so only the cards actually needed
+    are drawn. reset() copies the cards back into their initial order, so a deal depends
+    only on the random stream; rewind() is just a counter reset for Monte Carlo loops.
+
+    Args:
+        seed (int): Seed for a private random.Random stream.
+        rng: Any object with a random() method (e.g. the `random` module) to use instead.
+        dead_cards (iterable): Cards to keep out of every deal until the next reset.
+    """
+
+    __slots__ = ("cards", "dealt", "live", "_random")
+
+    def __init__(self, seed=None, rng=None, dead_cards=()):
+        self.cards = list(DECK)
+        self._random = (rng or random.Random(seed)).random
+        self.reset(dead_cards)
+
+    def seed(self, seed):
+        """Restart the deck's private RNG stream from `seed` and restore the initial card order."""
+        self._random = random.Random(seed).random
+        self.reset()
+
+    def reset(self, dead_cards=()):
+        """Return every card to the deck in its initial order, parking dead cards past the live region."""
+        cards = self.cards
+        cards[:] = DECK
+        live = 52
+        for card in dead_cards:
+            index = cards.index(CARD_LOOKUP[card])
+            if index >= live:
+                raise ValueError(f"Dead card {card} listed twice.")
+            live -= 1
+            cards[index], cards[live] = cards[live], cards[index]
+        self.live = live
+        self.dealt = 0
+
+    def rewind(self):
+        """Return the dealt cards to the deck, keeping the same dead cards parked."""
+        self.dealt = 0
+
+    def remaining(self):
+        """Number of live cards not yet dealt."""
+        return self.live - self.dealt
+
+    def deal_one(self):
+        """Deal a single card."""
+        i = self.dealt
+        if i >= self.live:
+            raise ValueError("No cards left to deal.")
+        j = i + int(self._random() * (self.live - i))
+        cards = self.cards
+        cards[i], cards[j] = cards[j], cards[i]
+        self.dealt = i + 1
+        return cards[i]
+
+    def deal(self, count):
+        """Deal `count` cards and return them as a list."""
+        start = self.dealt
+        end = start + count
+        if end > self.live:
+            raise ValueError("Not enough cards left to deal.")
+        cards = self.cards
+        rand = self._random
+        span = self.live - start
+        for i in range(start, end):
+            j = i + int(rand() * span)
+            cards[i], cards[j] = cards[j], cards[i]
+            span -= 1
+        self.dealt = end
+        return cards[start:end]
@@ -0,0 +1,46 @@
+# Hand stages, stage transitions and game events for Texas Hold'em, shared by the
+# ai_does_it_all engine and the hand history format
+from collections import namedtuple
+from enum import IntEnum
+
+
+class Stage(IntEnum):
+    """Stages of a hand, in the order they are played."""
+
+    PRE_FLOP = 0
+    FLOP = 1
+    TURN = 2
+    RIVER = 3
+    COMPLETE = 4
+
+    @property
+    def label(self):
+        """The stage's name as shown by the UIs and recorded in hand histories ("pre-flop")."""
+        return STAGE_LABELS[self]
+
+
+STAGE_LABELS = ("pre-flop", "flop", "turn", "river", "complete")
+STAGES_BY_LABEL = {label: Stage(i) for i, label in enumerate(STAGE_LABELS)}
+
+# Transition table: once a stage's betting is over the hand moves to the next stage and
+# deals the board cards at these positions of TexasHoldEmGame's 13-card deck (the hole
+# cards come from the front)
+TRANSITIONS = {
+    Stage.PRE_FLOP: (Stage.FLOP, slice(8, 11)),
+    Stage.FLOP: (Stage.TURN, slice(11, 12)),
+    Stage.TURN: (Stage.RIVER, slice(12, 13)),
+    Stage.RIVER: (Stage.COMPLETE, None),
+}
+
+# Events sent to TexasHoldEmGame.subscribe() callbacks. Each carries what a recorder needs
+# without reading the game: HandStarted has the stacks (`chips`, by player) and hole cards
+# before the blinds, and ActionTaken the chips moved (`amount`) and the player's bet on the
+# street afterwards (`total`).
+HandStarted = namedtuple("HandStarted", ["dealer", "players", "seed", "blinds", "chips", "hands"])
+ActionTaken = namedtuple("ActionTaken", ["player", "action", "amount", "stage", "total"])
+StreetDealt = namedtuple("StreetDealt", ["stage", "cards", "board"])
+# Sent when a hand ends; `hands` holds the cards of every player still in (only the winner's
+# when everyone else folded) and `chips` the stacks after the pot is paid
+Showdown = namedtuple("Showdown", ["winners", "pot", "hands", "chips"])
+
+EVENT_TYPES = (HandStarted, ActionTaken, StreetDealt, Showdown)
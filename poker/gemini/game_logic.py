@@ -1,5 +1,8 @@
 import random
 
+# Shared integer card encoding lives in poker/cards.py
+from cards import Card as IntCard
+
 class Card:
     def __init__(self, suit, rank):
         self.suit = suit
@@ -27,6 +30,10 @@ class Card:
         else:
             return 0  # Invalid rank
 
+    def to_int(self):
+        """Returns the shared integer card (0-51) for this card."""
+        return IntCard.from_gemini(self)
+
 
 class Deck:
     def __init__(self):
@@ -81,6 +88,90 @@ class Player:
         return actual_bet
 
 
+class SidePotLedger:
+    """Records chip contributions per player per street and settles layered side pots."""
+
+    def __init__(self):
+        self.contributions = {} # player -> list of amounts contributed on each street
+        self.seat_order = [] # players in the order they first contributed
+
+    def reset(self):
+        """Clears all contributions for a new hand."""
+        self.contributions = {}
+        self.seat_order = []
+
+    def record(self, player, amount, street=0):
+        """Records chips a player put into the pot.
+
+        Args:
+            player (Player): The contributing player.
+            amount (int): Chips added to the pot.
+            street (int): 0 for pre-flop, 1 flop, 2 turn, 3 river.
+        """
+        if amount <= 0:
+            return
+        streets = self.contributions.get(player)
+        if streets is None:
+            streets = self.contributions[player] = [0, 0, 0, 0]
+            self.seat_order.append(player)
+        streets[street] += amount
+
+    def total(self, player):
+        """Returns the total chips a player has contributed this hand."""
+        return sum(self.contributions.get(player, ()))
+
+    def build_pots(self):
+        """Splits the contributions into a main pot and side pots.
+
+        Returns:
+            list: (amount, eligible_players) tuples, main pot first. Folded players'
+                  chips are included but they are never eligible.
+        """
+        return [(amount, eligible) for amount, eligible, _ in self._layers()]
+
+    def _layers(self):
+        """Builds pots in one pass over contributors sorted by total contribution."""
+        totals = sorted(((self.total(p), p) for p in self.seat_order), key=lambda item: item[0])
+        pots = []
+        previous_level = 0
+        remaining = len(totals)
+        for i, (level, player) in enumerate(totals):
+            if level > previous_level:
+                # Everyone at or above this level pays the slice between the two levels
+                amount = (level - previous_level) * remaining
+                eligible = [p for _, p in totals[i:] if not p.folded]
+                if eligible:
+                    pots.append((amount, eligible, level))
+                elif pots:
+                    # Nobody live reached this level; the chips go to the layer below
+                    below_amount, below_eligible, below_level = pots[-1]
+                    pots[-1] = (below_amount + amount, below_eligible, below_level)
+                previous_level = level
+            remaining -= 1
+        return pots
+
+    def settle(self, hand_strengths):
+        """Awards every pot to its best eligible hand(s).
+
+        Args:
+            hand_strengths (dict): Player -> comparable hand strength (higher wins) for
+                                   every player still in the hand.
+
+        Returns:
+            dict: Player -> chips won. Split pots are shared evenly; odd chips go to the
+                  winners who contributed first.
+        """
+        seat_index = {p: i for i, p in enumerate(self.seat_order)}
+        winnings = {}
+        for amount, eligible, _ in self._layers():
+            best = max(hand_strengths[p] for p in eligible)
+            winners = sorted((p for p in eligible if hand_strengths[p] == best), key=seat_index.__getitem__)
+            share, odd_chips = divmod(amount, len(winners))
+            for i, winner in enumerate(winners):
+                winnings[winner] = winnings.get(winner, 0) + share + (1 if i < odd_chips else 0)
+        return winnings
+
+
 class GameState:
     """Manages the state of a Texas Hold'em game."""
 
@@ -104,6 +195,8 @@ class GameState:
         self.dealer_button_pos = -1 # Start before the first player, will rotate to 0 on first hand
         self.current_player_index = -1 # Will be set when a betting round starts
         self.current_bet_level = 0 # The highest bet amount players need to match in the current round
+        self.ledger = SidePotLedger() # Per-player, per-street contributions for side pots
+        self.street = 0 # 0 pre-flop, 1 flop, 2 turn, 3 river
 
     def rotate_button(self):
         """Moves the dealer button to the next active player."""
@@ -111,16 +204,71 @@ class GameState:
         self.dealer_button_pos = (self.dealer_button_pos + 1) % len(self.players)
         print(f"Dealer button moved to Player {self.players[self.dealer_button_pos].name}")
 
-    def add_to_pot(self, amount):
-        """Adds chips to the main pot.
+    def add_to_pot(self, amount, player=None):
+        """Adds chips to the pot.
 
         Args:
             amount (int): The amount to add to the pot.
+            player (Player): The contributing player, recorded in the side-pot ledger.
         """
         if amount > 0:
             self.pot += amount
+            if player is not None:
+                self.ledger.record(player, amount, self.street)
             print(f"Added {amount} to pot. Pot is now {self.pot}")
 
+    def settle_pots(self, hand_strengths):
+        """Pays out the main pot and all side pots at showdown.
+
+        Args:
+            hand_strengths (dict): Player -> comparable hand strength (higher wins) for
+                                   every player who has not folded.
+
+        Returns:
+            dict: Player -> chips won.
+        """
+        winnings = self.ledger.settle(hand_strengths)
+        for player, amount in winnings.items():
+            player.chips += amount
+            print(f"{player.name} wins {amount}")
+        self.pot = 0
+        self.street = 0
+        self.ledger.reset()
+        return winnings
+
+    def end_hand(self, hand_strengths=None):
+        """Pays out the hand and clears the table for the next one.
+
+        Args:
+            hand_strengths (dict): Player -> comparable hand strength (higher wins) for
+                                   every player who has not folded. Not needed when all
+                                   but one player folded; that player takes the whole pot.
+
+        Returns:
+            dict: Player -> chips won.
+        """
+        live = [p for p in self.players if not p.folded]
+        if len(live) == 1:
+            winner = live[0]
+            winnings = {winner: self.pot}
+            winner.chips += self.pot
+            print(f"{winner.name} wins {self.pot} (all others folded)")
+            self.pot = 0
+            self.street = 0
+            self.ledger.reset()
+        else:
+            winnings = self.settle_pots(hand_strengths)
+
+        for player in self.players:
+            player.clear_hand()
+            player.bet = 0
+            player.folded = False
+            player.all_in = False
+        self.community_cards = []
+        self.current_bet_level = 0
+        self.deck = Deck()
+        return winnings
+
     def post_blinds(self):
         """Posts the small and big blinds."""
         num_players = len(self.players)
@@ -134,11 +282,11 @@ class GameState:
 
         print(f"{self.players[sb_pos].name} posts small blind ({self.small_blind_amount})")
         sb_bet = self.players[sb_pos].place_bet(self.small_blind_amount)
-        self.add_to_pot(sb_bet)
+        self.add_to_pot(sb_bet, self.players[sb_pos])
 
         print(f"{self.players[bb_pos].name} posts big blind ({self.big_blind_amount})")
         bb_bet = self.players[bb_pos].place_bet(self.big_blind_amount)
-        self.add_to_pot(bb_bet)
+        self.add_to_pot(bb_bet, self.players[bb_pos])
 
         # The big blind sets the initial bet level for the pre-flop round
         self.current_bet_level = self.big_blind_amount
@@ -169,6 +317,7 @@ class GameState:
             flop_cards = [self.deck.deal() for _ in range(3)]
             if all(c is not None for c in flop_cards): # Ensure all 3 cards were dealt
                 self.community_cards.extend(flop_cards)
+                self.street = 1
                 print(f"Flop dealt: {[str(c) for c in flop_cards]}")
                 print(f"Current community cards: {[str(c) for c in self.community_cards]}")
                 return True
@@ -188,6 +337,7 @@ class GameState:
             turn_card = self.deck.deal()
             if turn_card:
                 self.community_cards.append(turn_card)
+                self.street = 2
                 print(f"Turn dealt: {turn_card}")
                 print(f"Current community cards: {[str(c) for c in self.community_cards]}")
                 return True
@@ -300,7 +450,7 @@ class GameState:
             elif action == "call":
                 if amount_to_call > 0:
                     bet_placed = current_player_obj.place_bet(amount_to_call)
-                    self.add_to_pot(bet_placed)
+                    self.add_to_pot(bet_placed, current_player_obj)
                     print(f"{current_player_obj.name} calls {bet_placed}{' (All-in)' if current_player_obj.all_in else ''}.")
                 elif amount_to_call == 0 : # Calling 0 is like checking
                      print(f"{current_player_obj.name} effectively checks (already met bet).")
@@ -327,7 +477,7 @@ class GameState:
 
                 if valid_aggressive_action:
                     bet_placed = current_player_obj.place_bet(amount_player_adds)
-                    self.add_to_pot(bet_placed)
+                    self.add_to_pot(bet_placed, current_player_obj)
                     print(f"{current_player_obj.name} {'bets' if is_opening_bet else 'raises to'} {current_player_obj.bet}{' (All-in)' if current_player_obj.all_in else ''}.")
                     
                     self.current_bet_level = current_player_obj.bet # New level to match
@@ -449,6 +599,7 @@ class GameState:
             river_card = self.deck.deal()
             if river_card:
                 self.community_cards.append(river_card)
+                self.street = 3
                 print(f"River dealt: {river_card}")
                 print(f"Current community cards: {[str(c) for c in self.community_cards]}")
                 return True
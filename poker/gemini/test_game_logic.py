@@ -10,7 +10,7 @@ sys.path.insert(0, parent_dir) # Or use the specific path to game_logic.py's dir
 
 # Now import the classes
 try:
-    from gemini.game_logic import Card, Deck, Player, GameState
+    from gemini.game_logic import Card, Deck, Player, GameState, SidePotLedger
 except ImportError:
     print("Error: Could not import Card, Deck, Player from gemini.game_logic.")
     print(f"Current sys.path: {sys.path}")
@@ -450,6 +450,95 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(self.player2.bet, 50) # Bob's bet for this street
         self.assertEqual(self.player3.bet, 50) # Charlie's bet for this street
 
+    def test_three_stack_all_in_pays_main_and_side_pots(self):
+        # Alice (button) covers everyone, Bob (SB) has 100 and Charlie (BB) has 300
+        self.player2.chips = 100
+        self.player3.chips = 300
+        self.game_state.rotate_button()
+        self.game_state.post_blinds()
+        self._set_mock_actions([
+            ("Alice", ("raise", 1000)), # Alice shoves
+            ("Bob", ("call", 100)),     # Bob calls all-in for 100
+            ("Charlie", ("call", 300)), # Charlie calls all-in for 300
+        ])
+        self.game_state.start_betting_round(is_preflop=True)
+        self.assertTrue(self.player2.all_in and self.player3.all_in)
+        self.assertEqual(self.game_state.pot, 1400)
+
+        # Bob has the best hand, Charlie the second best: Bob takes the 300 main pot,
+        # Charlie the 400 side pot, and Alice gets back the 700 nobody could match
+        winnings = self.game_state.end_hand({self.player1: 1, self.player2: 3, self.player3: 2})
+        self.assertEqual(winnings, {self.player2: 300, self.player3: 400, self.player1: 700})
+        self.assertEqual([p.chips for p in self.players], [700, 300, 400])
+        self.assertEqual(self.game_state.pot, 0)
+        self.assertEqual(self.game_state.ledger.build_pots(), [])
+        self.assertFalse(any(p.all_in or p.folded or p.bet for p in self.players))
+
+    def test_fold_out_gives_the_pot_to_the_last_player(self):
+        self.game_state.rotate_button()
+        self.game_state.post_blinds()
+        self._set_mock_actions([("Alice", ("fold", 0)), ("Bob", ("fold", 10))])
+        self.game_state.start_betting_round(is_preflop=True)
+        self.assertEqual(self.game_state.end_hand(), {self.player3: 30})
+        self.assertEqual([p.chips for p in self.players], [1000, 990, 1010])
+
+
+class TestSidePotLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.short = Player("Short", 0)
+        self.medium = Player("Medium", 0)
+        self.big = Player("Big", 0)
+        self.ledger = SidePotLedger()
+
+    def test_layered_pots(self):
+        # Short is all-in for 50, Medium for 120, Big covers with 200
+        self.ledger.record(self.short, 50)
+        self.ledger.record(self.medium, 20)
+        self.ledger.record(self.medium, 100, street=1)
+        self.ledger.record(self.big, 200, street=1)
+        pots = self.ledger.build_pots()
+        self.assertEqual([amount for amount, _ in pots], [150, 140, 80])
+        self.assertEqual(pots[0][1], [self.short, self.medium, self.big])
+        self.assertEqual(pots[1][1], [self.medium, self.big])
+        self.assertEqual(pots[2][1], [self.big])
+
+    def test_short_stack_wins_only_the_main_pot(self):
+        self.ledger.record(self.short, 50)
+        self.ledger.record(self.medium, 120)
+        self.ledger.record(self.big, 200)
+        winnings = self.ledger.settle({self.short: 3, self.medium: 2, self.big: 1})
+        self.assertEqual(winnings, {self.short: 150, self.medium: 140, self.big: 80})
+
+    def test_folded_chips_stay_in_pot_but_folded_player_cannot_win(self):
+        self.ledger.record(self.short, 100)
+        self.ledger.record(self.medium, 100)
+        self.ledger.record(self.big, 100)
+        self.medium.folded = True
+        winnings = self.ledger.settle({self.short: 1, self.big: 1})
+        self.assertEqual(winnings, {self.short: 150, self.big: 150})
+
+    def test_odd_chip_goes_to_first_contributor(self):
+        self.ledger.record(self.short, 51)
+        self.ledger.record(self.medium, 50)
+        self.medium.folded = True
+        self.ledger.record(self.big, 51)
+        winnings = self.ledger.settle({self.short: 7, self.big: 7})
+        self.assertEqual(winnings, {self.short: 76, self.big: 76})
+
+    def test_game_state_records_contributions_and_settles(self):
+        game_state = GameState([self.short, self.medium, self.big])
+        for player in game_state.players:
+            player.chips = 100
+        self.short.chips = 30
+        game_state.add_to_pot(self.short.place_bet(30), self.short)
+        game_state.add_to_pot(self.medium.place_bet(100), self.medium)
+        game_state.add_to_pot(self.big.place_bet(100), self.big)
+        winnings = game_state.settle_pots({self.short: 5, self.medium: 4, self.big: 1})
+        self.assertEqual(winnings, {self.short: 90, self.medium: 140})
+        self.assertEqual(self.short.chips + self.medium.chips + self.big.chips, 230)
+        self.assertEqual(game_state.pot, 0)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,392 @@
+# Compact binary hand histories for the poker engines
+#
+# A history file is a small header followed by length-prefixed hand records, appended
+# one per hand. Cards are stored as the shared integers from cards.py, so one file can be
+# replayed into either engine.
+#
+# File header:  "<4sH"  magic b"PKHH", format version
+# Hand record:  "<I"    byte length of the rest of the record
+#               "<QBBBBiiH" seed, has_seed, seats, dealer seat, board cards, small blind,
+#                           big blind, actions
+#               per seat: name length (B), UTF-8 name, "<iiBB" starting chips, ending
+#                         chips, hole cards (NO_CARD when unknown)
+#               board: one byte per card
+#               per action: "<BBBii" seat, street, action code, chips put in, the
+#                           seat's total bet on the street afterwards
+import mmap
+import struct
+from array import array
+from collections import deque, namedtuple
+
+from cards import CARD_LOOKUP, CARD_STRINGS
+from game_events import ActionTaken, HandStarted, Showdown, StreetDealt
+
+MAGIC = b"PKHH"
+FORMAT_VERSION = 1
+
+FILE_HEADER = struct.Struct("<4sH")
+RECORD_LENGTH = struct.Struct("<I")
+HAND_HEADER = struct.Struct("<QBBBBiiH")
+SEAT = struct.Struct("<iiBB")
+ACTION = struct.Struct("<BBBii")
+
+NO_CARD = 255
+
+# Action codes in file order; blinds are recorded so the chip flow is complete
+ACTIONS = ("fold", "check", "call", "raise", "bet", "small_blind", "big_blind")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+BLIND_ACTIONS = ("small_blind", "big_blind")
+
+STREETS = ("pre-flop", "flop", "turn", "river")
+STREET_CODES = {street: code for code, street in enumerate(STREETS)}
+
+SeatRecord = namedtuple("SeatRecord", ["name", "starting_chips", "ending_chips", "hole_cards"])
+ActionRecord = namedtuple("ActionRecord", ["seat", "street", "action", "amount", "total"])
+HandRecord = namedtuple("HandRecord", ["seed", "dealer", "small_blind", "big_blind", "seats", "board", "actions"])
+
+
+def encode_hand(record):
+    """Serialize a HandRecord to bytes, including its length prefix."""
+    seed = record.seed
+    parts = [
+        HAND_HEADER.pack(
+            seed or 0,
+            seed is not None,
+            len(record.seats),
+            record.dealer,
+            len(record.board),
+            record.small_blind,
+            record.big_blind,
+            len(record.actions),
+        )
+    ]
+    for seat in record.seats:
+        name = seat.name.encode("utf-8")
+        hole = list(seat.hole_cards) + [NO_CARD] * (2 - len(seat.hole_cards))
+        parts.append(bytes((len(name),)))
+        parts.append(name)
+        parts.append(SEAT.pack(seat.starting_chips, seat.ending_chips, hole[0], hole[1]))
+    parts.append(bytes(record.board))
+    for action in record.actions:
+        parts.append(ACTION.pack(action.seat, action.street, ACTION_CODES[action.action], action.amount, action.total))
+    body = b"".join(parts)
+    return RECORD_LENGTH.pack(len(body)) + body
+
+
+def decode_hand(buffer, offset=0):
+    """Parse the hand record whose length prefix starts at `offset` in `buffer`."""
+    offset += RECORD_LENGTH.size
+    seed, has_seed, num_seats, dealer, num_board, small_blind, big_blind, num_actions = HAND_HEADER.unpack_from(
+        buffer, offset
+    )
+    offset += HAND_HEADER.size
+
+    seats = []
+    for _ in range(num_seats):
+        name_length = buffer[offset]
+        offset += 1
+        name = bytes(buffer[offset : offset + name_length]).decode("utf-8")
+        offset += name_length
+        starting_chips, ending_chips, first, second = SEAT.unpack_from(buffer, offset)
+        offset += SEAT.size
+        hole_cards = tuple(card for card in (first, second) if card != NO_CARD)
+        seats.append(SeatRecord(name, starting_chips, ending_chips, hole_cards))
+
+    board = tuple(buffer[offset : offset + num_board])
+    offset += num_board
+
+    actions = []
+    for _ in range(num_actions):
+        seat, street, code, amount, total = ACTION.unpack_from(buffer, offset)
+        offset += ACTION.size
+        actions.append(ActionRecord(seat, street, ACTIONS[code], amount, total))
+
+    return HandRecord(seed if has_seed else None, dealer, small_blind, big_blind, seats, board, actions)
+
+
+class HandHistoryWriter:
+    """Appends hand records to a history file through a large write buffer.
+
+    The writer is also a TexasHoldEmGame event subscriber: after game.subscribe(writer)
+    every completed hand is recorded.
+
+    Args:
+        path (str): History file; created with a header if missing, appended to otherwise.
+        buffer_size (int): Bytes buffered before each write to disk.
+    """
+
+    def __init__(self, path, buffer_size=1 << 20):
+        self.path = path
+        self._file = open(path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self.hands_written = 0
+        self._seats = None
+        self._hand = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_hand(self, record):
+        """Append one HandRecord."""
+        self._file.write(encode_hand(record))
+        self.hands_written += 1
+
+    def flush(self):
+        """Push buffered records to disk."""
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the file."""
+        if not self._file.closed:
+            self._file.close()
+
+    # TexasHoldEmGame events
+
+    def __call__(self, event):
+        if isinstance(event, ActionTaken):
+            self.on_action(event)
+        elif isinstance(event, StreetDealt):
+            self._hand["board"].extend(CARD_LOOKUP[card] for card in event.cards)
+        elif isinstance(event, HandStarted):
+            self.on_hand_start(event)
+        elif isinstance(event, Showdown):
+            self.on_hand_end(event)
+
+    def on_hand_start(self, event):
+        """Capture seats, stacks and hole cards from before the blinds are posted."""
+        self._seats = {player: seat for seat, player in enumerate(event.players)}
+        self._hand = {
+            "seed": event.seed,
+            "dealer": self._seats[event.dealer],
+            "blinds": event.blinds,
+            "players": event.players,
+            "chips": [event.chips[player] for player in event.players],
+            "holes": [tuple(CARD_LOOKUP[card] for card in event.hands.get(player, ())) for player in event.players],
+            "board": [],
+            "actions": [],
+        }
+
+    def on_action(self, event):
+        """Record an action with the chips it put in."""
+        seat = self._seats[event.player]
+        street = STREET_CODES.get(event.stage.label, 0)
+        self._hand["actions"].append(ActionRecord(seat, street, event.action, event.amount, event.total))
+
+    def on_hand_end(self, event):
+        """Write the finished hand."""
+        hand = self._hand
+        if hand is None:
+            return
+        seats = [
+            SeatRecord(player, chips, event.chips[player], hole)
+            for player, chips, hole in zip(hand["players"], hand["chips"], hand["holes"])
+        ]
+        small_blind, big_blind = hand["blinds"]
+        self.write_hand(
+            HandRecord(hand["seed"], hand["dealer"], small_blind, big_blind, seats, hand["board"], hand["actions"])
+        )
+        self._hand = None
+
+
+class HandHistoryReader:
+    """Random access to the hands in a history file through a read-only memory map.
+
+    Opening the file scans only the record length prefixes to index where each hand
+    starts; a hand is parsed when it is accessed. A truncated final record (for example
+    from a crash mid-write) is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < FILE_HEADER.size:
+            raise ValueError(f"{path} is not a hand history file.")
+        magic, version = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a hand history file.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported hand history version {version}.")
+        self._offsets = self._index()
+
+    def _index(self):
+        """Offsets of every complete record."""
+        offsets = array("q")
+        data = self._map
+        end = len(data)
+        offset = FILE_HEADER.size
+        unpack_length = RECORD_LENGTH.unpack_from
+        prefix = RECORD_LENGTH.size
+        while offset + prefix <= end:
+            (length,) = unpack_length(data, offset)
+            if offset + prefix + length > end:
+                break
+            offsets.append(offset)
+            offset += prefix + length
+        return offsets
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        return decode_hand(self._map, self._offsets[index])
+
+    def __iter__(self):
+        for offset in self._offsets:
+            yield decode_hand(self._map, offset)
+
+    def close(self):
+        """Release the memory map."""
+        self._map.close()
+
+
+def _scripted_actions(record):
+    """Each seat's recorded decisions in order as (street, action, total), blinds excluded."""
+    scripted = [deque() for _ in record.seats]
+    for action in record.actions:
+        if action.action not in BLIND_ACTIONS:
+            scripted[action.seat].append((action.street, action.action, action.total))
+    return scripted
+
+
+def replay_deck(record):
+    """Rebuild the 13-card TexasHoldEmGame deal for a hand as card strings.
+
+    Hole cards go to positions 2*seat and the board to positions 8-12; positions the
+    hand never used are filled with the lowest unused cards.
+    """
+    deck = [None] * 13
+    for seat, seat_record in enumerate(record.seats):
+        for i, card in enumerate(seat_record.hole_cards):
+            deck[seat * 2 + i] = card
+    for i, card in enumerate(record.board):
+        deck[8 + i] = card
+    spare = iter(sorted(set(range(52)) - set(deck)))
+    return [CARD_STRINGS[card if card is not None else next(spare)] for card in deck]
+
+
+def replay_texas_holdem(record, game):
+    """Replay a recorded hand into a TexasHoldEmGame, without any UI.
+
+    The game's seats, stacks, blinds and dealer are set from the record, the recorded
+    cards are dealt in place of a shuffle and every seat plays back its recorded actions.
+    The game's own action sources are restored afterwards.
+
+    Returns:
+        The game, with the hand complete.
+    """
+    if len(record.seats) > 4:
+        raise ValueError("TexasHoldEmGame deals at most four seats.")
+    names = [seat.name for seat in record.seats]
+    scripted = dict(zip(names, _scripted_actions(record)))
+    pending = [0] * len(STREETS)
+    for queue in scripted.values():
+        for street, _, _ in queue:
+            pending[street] += 1
+
+    def play_back(game, player):
+        street, action, _ = scripted[player].popleft()
+        pending[street] -= 1
+        return action
+
+    saved_sources = game.user_action_source, game.bot_policies
+    game.user_action_source = lambda game: play_back(game, "User")
+    game.bot_policies = dict.fromkeys(names, play_back)
+    try:
+        game.players = names
+        game.chips = {seat.name: seat.starting_chips for seat in record.seats}
+        game.blinds = {"small": record.small_blind, "big": record.big_blind}
+        game.dealer_position = (record.dealer - 1) % len(names)
+        game.start_new_hand(deck=replay_deck(record), seed=record.seed)
+
+        while not game.hand_complete:
+            street = STREET_CODES.get(game.current_stage)
+            if not game.betting_round_complete and street is not None and pending[street]:
+                game.collect_bets()
+            else:
+                # The recorded street is exhausted, so the round closed here originally
+                game.betting_round_complete = True
+                game.play_round()
+    finally:
+        game.user_action_source, game.bot_policies = saved_sources
+    return game
+
+
+def replay_gemini(record, game_state):
+    """Replay a recorded hand into a fresh gemini GameState, without any UI.
+
+    `game_state` must have one Player per recorded seat, in seat order, and a full deck.
+    Stacks, hole cards, blinds and dealer are set from the record and the deck is stacked
+    so the burns and streets deal the recorded board. Gemini orders the betting from the
+    button, so each player plays back their own recorded decisions for the street in
+    turn; a check facing a bet becomes a call, a raise keeps its recorded total, and a
+    player with no recorded decision left checks or calls.
+
+    Returns:
+        The GameState after the last recorded street's betting, ready for settle_pots.
+    """
+    players = game_state.players
+    if len(players) != len(record.seats):
+        raise ValueError("The GameState needs one player per recorded seat.")
+    cards = {card.to_int(): card for card in game_state.deck.cards}
+    if len(cards) != 52:
+        raise ValueError("Replay needs a GameState with a full deck.")
+
+    for player, seat in zip(players, record.seats):
+        player.chips = seat.starting_chips
+        player.hand = [cards[card] for card in seat.hole_cards]
+        player.bet = 0
+        player.folded = False
+        player.all_in = False
+    game_state.small_blind_amount = record.small_blind
+    game_state.big_blind_amount = record.big_blind
+    game_state.dealer_button_pos = (record.dealer - 1) % len(players)
+
+    # Deck.deal pops from the end: burn, flop, burn, turn, burn, river
+    used = {card for seat in record.seats for card in seat.hole_cards} | set(record.board)
+    spare = [card for card in range(52) if card not in used]
+    board = list(record.board)
+    deal_order = []
+    for street_cards in (board[:3], board[3:4], board[4:5]):
+        if street_cards:
+            deal_order.append(spare.pop())
+            deal_order.extend(street_cards)
+    game_state.deck.cards = [cards[card] for card in spare + deal_order[::-1]]
+
+    scripted = dict(zip(players, _scripted_actions(record)))
+
+    def play_back(player, amount_to_call, current_bet_level):
+        queue = scripted[player]
+        while queue and queue[0][0] < game_state.street:
+            queue.popleft()
+        if queue and queue[0][0] == game_state.street:
+            _, action, total = queue.popleft()
+            if action == "fold":
+                return "fold", player.bet
+            if action in ("raise", "bet") and total > current_bet_level:
+                return ("bet" if current_bet_level == 0 else "raise"), total
+        if amount_to_call > 0:
+            return "call", current_bet_level
+        return "check", player.bet
+
+    game_state.simulate_player_action = play_back
+    game_state.rotate_button()
+    game_state.post_blinds()
+    game_state.start_betting_round(is_preflop=True)
+    for street, deal in enumerate((game_state.deal_flop, game_state.deal_turn, game_state.deal_river), 1):
+        if len(board) < street + 2 or sum(1 for player in players if not player.folded) <= 1:
+            break
+        deal()
+        game_state.reset_player_bets_for_new_round()
+        game_state.start_betting_round()
+    return game_state
@@ -0,0 +1,79 @@
+# Tests for the shared integer card type
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from cards import DECK, ArrayDeck, Card, cards_to_mask, mask_to_cards, parse_cards
+from gemini.game_logic import Card as GeminiCard
+
+
+def test_deck_has_52_distinct_ints():
+    assert len(DECK) == 52
+    assert list(DECK) == list(range(52))
+    assert all(isinstance(card, int) for card in DECK)
+
+
+def test_display_strings():
+    ace_of_spades = Card.parse("AS")
+    assert ace_of_spades == 51
+    assert str(ace_of_spades) == "AS"
+    assert repr(ace_of_spades) == "Card('AS')"
+    assert ace_of_spades.rank == 12
+    assert ace_of_spades.suit == 3
+    assert ace_of_spades.value == 14
+
+
+def test_legacy_formats_map_to_the_same_instance():
+    ten = Card.parse("TH")
+    assert Card.parse("10H") is ten
+    assert Card.parse(int(ten)) is ten
+    assert Card.from_gemini(GeminiCard("Hearts", "T")) is ten
+    assert Card.from_gemini(GeminiCard("Hearts", "10")) is ten
+    assert GeminiCard("Hearts", "T").to_int() is ten
+    assert ten.to_test_driven() == "10H"
+    assert ten.to_legacy() == "TH"
+
+
+def test_cards_have_no_instance_dict():
+    assert not hasattr(Card.parse("2C"), "__dict__")
+
+
+def test_mask_round_trip():
+    cards = parse_cards(["2C", "KD", "AS"])
+    mask = cards_to_mask(cards)
+    assert bin(mask).count("1") == 3
+    assert mask_to_cards(mask) == sorted(cards)
+
+
+def test_array_deck_deals_distinct_cards_and_resets_in_place():
+    deck = ArrayDeck(seed=1)
+    storage = deck.cards
+    dealt = deck.deal(52)
+    assert sorted(dealt) == list(range(52))
+    with pytest.raises(ValueError):
+        deck.deal_one()
+    deck.reset()
+    assert deck.remaining() == 52
+    assert deck.cards is storage
+    assert storage == list(range(52))
+
+
+def test_array_deck_is_reproducible_from_a_seed():
+    assert ArrayDeck(seed=9).deal(10) == ArrayDeck(seed=9).deal(10)
+    deck = ArrayDeck(seed=9)
+    first = deck.deal(10)
+    deck.seed(9)
+    assert deck.deal(10) == first
+
+
+def test_array_deck_excludes_dead_cards():
+    dead = parse_cards(["AS", "KS", "10H"])
+    deck = ArrayDeck(seed=2, dead_cards=dead)
+    assert deck.remaining() == 49
+    assert not set(deck.deal(49)) & set(dead)
+    deck.rewind()
+    assert deck.remaining() == 49
+    with pytest.raises(ValueError):
+        deck.reset(["AS", "AS"])
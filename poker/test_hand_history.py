@@ -0,0 +1,117 @@
+# Tests for the binary hand-history format
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from gemini.game_logic import GameState, Player
+from hand_history import (
+    ActionRecord,
+    HandHistoryReader,
+    HandHistoryWriter,
+    HandRecord,
+    SeatRecord,
+    decode_hand,
+    encode_hand,
+    replay_deck,
+    replay_gemini,
+)
+
+
+def sample_hand(seed=7):
+    seats = [
+        SeatRecord("A", 1000, 980, (0, 1)),
+        SeatRecord("B", 1000, 1080, (2, 3)),
+        SeatRecord("C", 1000, 940, (4, 5)),
+    ]
+    actions = [
+        ActionRecord(2, 0, "small_blind", 10, 10),
+        ActionRecord(0, 0, "big_blind", 20, 20),
+        ActionRecord(1, 0, "raise", 40, 40),
+        ActionRecord(2, 0, "call", 30, 40),
+        ActionRecord(0, 0, "fold", 0, 20),
+        ActionRecord(1, 1, "check", 0, 0),
+        ActionRecord(2, 1, "check", 0, 0),
+        ActionRecord(1, 2, "raise", 20, 20),
+        ActionRecord(2, 2, "call", 20, 20),
+    ]
+    return HandRecord(seed, 1, 10, 20, seats, (10, 11, 12, 13, 14), actions)
+
+
+def test_encode_round_trip():
+    hand = sample_hand()
+    data = encode_hand(hand)
+    decoded = decode_hand(data)
+    assert decoded.seed == 7
+    assert decoded.seats == hand.seats
+    assert decoded.board == hand.board
+    assert decoded.actions == hand.actions
+
+
+def test_missing_seed_and_hole_cards_round_trip():
+    hand = sample_hand(seed=None)._replace(seats=[SeatRecord("A", 5, 0, ()), SeatRecord("B", 5, 10, (51,))])
+    decoded = decode_hand(encode_hand(hand))
+    assert decoded.seed is None
+    assert decoded.seats[0].hole_cards == ()
+    assert decoded.seats[1].hole_cards == (51,)
+
+
+def test_reader_indexes_appended_hands(tmp_path):
+    path = str(tmp_path / "hands.bin")
+    with HandHistoryWriter(path) as writer:
+        for seed in range(100):
+            writer.write_hand(sample_hand(seed))
+    # Reopening appends without a second header
+    with HandHistoryWriter(path) as writer:
+        writer.write_hand(sample_hand(100))
+
+    with HandHistoryReader(path) as reader:
+        assert len(reader) == 101
+        assert reader[42].seed == 42
+        assert reader[-1].seed == 100
+        assert [hand.seed for hand in reader] == list(range(101))
+
+
+def test_reader_ignores_truncated_tail(tmp_path):
+    path = str(tmp_path / "hands.bin")
+    with HandHistoryWriter(path) as writer:
+        writer.write_hand(sample_hand(1))
+        writer.write_hand(sample_hand(2))
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    with HandHistoryReader(path) as reader:
+        assert len(reader) == 1
+        assert reader[0].seed == 1
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a history")
+    with pytest.raises(ValueError):
+        HandHistoryReader(str(path))
+
+
+def test_replay_deck_places_recorded_cards():
+    deck = replay_deck(sample_hand())
+    assert len(deck) == 13
+    assert deck[:6] == ["2C", "2D", "2H", "2S", "3C", "3D"]
+    assert deck[8:] == ["4H", "4S", "5C", "5D", "5H"]
+    assert len(set(deck)) == 13
+
+
+def test_replay_into_gemini():
+    game_state = GameState([Player("A"), Player("B"), Player("C")])
+    with contextlib.redirect_stdout(io.StringIO()):
+        replay_gemini(sample_hand(), game_state)
+
+    a, b, c = game_state.players
+    assert game_state.dealer_button_pos == 1
+    assert [card.to_int() for card in game_state.community_cards] == [10, 11, 12, 13, 14]
+    assert [card.to_int() for card in b.hand] == [2, 3]
+    assert a.folded and not b.folded and not c.folded
+    assert (a.chips, b.chips, c.chips) == (980, 940, 940)
+    assert game_state.pot == 140